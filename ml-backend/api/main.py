@@ -1,13 +1,30 @@
-from fastapi import FastAPI, HTTPException
+import time
+_import_start = time.perf_counter()
+
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from huggingface_hub import hf_hub_download
 from mangum import Mangum  # serverless adapter
-import joblib
-import numpy as np
+import asyncio
+import csv
+import io
 import json
+import os
+import sys
+import threading
+from pathlib import Path
 from typing import List, Dict
 
+# Heavy modules (numpy, joblib, sklearn, the model) are imported on first use
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.batching import MicroBatcher
+from app.executor import ExecutorSaturated, InferenceExecutor
+from app.prediction_cache import PredictionCache
+from app.profiling import StartupProfiler
+
+profiler = StartupProfiler()
+
 app = FastAPI(title="ExoHunt API", version="2.0-ADVANCED")
 
 # CORS setup
@@ -20,30 +37,167 @@ app.add_middleware(
 )
 
 # Hugging Face model repo
-REPO_ID = "XcodeAddy/exoplanet-model-advanced"  # Replace with your repo ID
+REPO_ID = os.getenv("EXOHUNT_MODEL_REPO", "XcodeAddy/exoplanet-model-advanced")  # Replace with your repo ID
+
+# Local artifact cache checked before the hub (train_advanced.py writes models/trained)
+MODEL_DIR = os.getenv("EXOHUNT_MODEL_DIR", str(Path(__file__).resolve().parent.parent / "models" / "trained"))
+
+# Optional local directory used instead of the hub on a cache miss
+ARTIFACT_SOURCE = os.getenv("EXOHUNT_ARTIFACT_SOURCE")
+
+# Serve artifacts from a source without manifest.json (pinned locally on first download)
+ALLOW_UNVERIFIED_ARTIFACTS = os.getenv("EXOHUNT_ALLOW_UNVERIFIED_ARTIFACTS", "0") == "1"
+
+# Largest number of candidates accepted by /predict/batch in one request
+MAX_BATCH_SIZE = int(os.getenv("EXOHUNT_MAX_BATCH_SIZE", "5000"))
+
+# Rows per chunk when streaming scores for an uploaded catalog file
+FILE_CHUNK_SIZE = int(os.getenv("EXOHUNT_FILE_CHUNK_SIZE", "2000"))
+
+# Serve through the flattened NumPy tree engine instead of sklearn (app/compiled.py)
+USE_COMPILED_ENGINE = os.getenv("EXOHUNT_COMPILED_ENGINE", "0") == "1"
+
+# Prediction cache: max entries (0 disables), entry lifetime, significant digits in keys
+CACHE_SIZE = int(os.getenv("EXOHUNT_CACHE_SIZE", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("EXOHUNT_CACHE_TTL", "3600"))
+CACHE_DIGITS = int(os.getenv("EXOHUNT_CACHE_DIGITS", "6"))
+
+# Micro-batching of concurrent /predict calls: max rows per ensemble call, max queueing delay
+BATCH_MAX_SIZE = int(os.getenv("EXOHUNT_BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.getenv("EXOHUNT_BATCH_MAX_WAIT_MS", "2"))
+
+# Inference executor: "thread" (shared model) or "process" (model loaded per worker),
+# worker count, and how many scoring tasks may wait before requests get a 503
+EXECUTOR_KIND = os.getenv("EXOHUNT_EXECUTOR", "thread")
+INFERENCE_WORKERS = int(os.getenv("EXOHUNT_INFERENCE_WORKERS", "2"))
+EXECUTOR_MAX_QUEUE = int(os.getenv("EXOHUNT_EXECUTOR_QUEUE", "64"))
+
+# Load the model in the startup event instead of on the first request (long-running servers)
+EAGER_LOAD = os.getenv("EXOHUNT_EAGER_LOAD", "0") == "1"
+
+# Earth around the Sun in BASE_FEATURES order; scored once by each process-mode worker at startup
+WARMUP_ROW = [365.25, 13.0, 84.0, 1.0, 255.0, 1.0, 5778.0, 4.44, 1.0]
 
 # Globals
+in_worker = False
 model = None
 scaler = None
 metadata = None
+predictor = None
+ready = False
+warm = False
+startup_seconds = None
+store_report = None
+model_version = None
+_load_lock = threading.Lock()
+prediction_cache = PredictionCache(CACHE_SIZE, CACHE_TTL_SECONDS, CACHE_DIGITS)
 
-@app.on_event("startup")
-async def load_model():
-    """Download & load model from Hugging Face Hub"""
-    global model, scaler, metadata
+def build_model_store():
+    from app.model_store import HubFetcher, LocalFetcher, ModelStore
+    fetcher = LocalFetcher(ARTIFACT_SOURCE) if ARTIFACT_SOURCE else HubFetcher(REPO_ID)
+    return ModelStore(MODEL_DIR, fetcher, allow_unverified=ALLOW_UNVERIFIED_ARTIFACTS)
+
+def serves_in_workers() -> bool:
+    """Process mode, outside the workers: the ensemble is loaded by the inference workers only"""
+    return EXECUTOR_KIND == "process" and not in_worker
+
+def load_model():
+    """
+    Resolve verified artifacts (local cache first, then hub) and load the model.
+
+    In process mode the API process only verifies the artifacts and reads
+    metadata; readiness and warm-up are reported by the workers' initializers.
+    """
+    global model, scaler, metadata, predictor, ready, warm, startup_seconds, store_report, model_version
+    ready = False
+    warm = False
+    predictor = None
+    store_report = None
+    model_version = None
+    prediction_cache.reset(None)
+    start = time.perf_counter()
     try:
-        model_path = hf_hub_download(repo_id=REPO_ID, filename="exoplanet_model_advanced.pkl")
-        scaler_path = hf_hub_download(repo_id=REPO_ID, filename="scaler_advanced.pkl")
-        metadata_path = hf_hub_download(repo_id=REPO_ID, filename="model_metadata_advanced.json")
+        with profiler.phase("imports"):
+            from app.model_store import METADATA_FILE, MODEL_FILE, SCALER_FILE
+            if not serves_in_workers():
+                import joblib
+                from app.compiled import compile_verified
+                import app.features  # noqa: F401  (numpy + feature kernel)
+                from app.inference import EnsemblePredictor
 
-        model = joblib.load(model_path)
-        scaler = joblib.load(scaler_path)
+        with profiler.phase("artifact_fetch"):
+            store = build_model_store()
+            paths = store.resolve()
+            store_report = store.last_report
+            model_version = store.manifest[MODEL_FILE][:12]
 
-        with open(metadata_path, "r") as f:
-            metadata = json.load(f)
+        if serves_in_workers():
+            with open(paths[METADATA_FILE], "r") as f:
+                metadata = json.load(f)
+            # Workers load from the verified cache populated above
+            with profiler.phase("worker_startup"):
+                statuses = inference.broadcast(worker_status)
+            if not all(status["ready"] for status in statuses):
+                raise RuntimeError("Inference workers failed to load the model")
+            warm = all(status["warm"] for status in statuses)
+            slowest = max(statuses, key=lambda status: status["startup_profile"]["total_seconds"])
+            for name, seconds in slowest["startup_profile"]["phases"].items():
+                profiler.record(f"worker_{name}", seconds)
+            prediction_cache.reset(model_version)
+            ready = True
+            return
+
+        with profiler.phase("unpickle"):
+            model = joblib.load(paths[MODEL_FILE])
+            scaler = joblib.load(paths[SCALER_FILE])
+
+            with open(paths[METADATA_FILE], "r") as f:
+                metadata = json.load(f)
+
+        predictor = EnsemblePredictor.from_metadata(model, scaler, metadata)
+        if USE_COMPILED_ENGINE:
+            with profiler.phase("compile"):
+                try:
+                    model = compile_verified(model, len(metadata['feature_names']), threshold=predictor.threshold)
+                    predictor.model = model
+                    print("Serving with compiled inference engine")
+                except (NotImplementedError, ValueError) as e:
+                    print(f"Compiled engine unavailable, using sklearn: {e}")
+
+        # Scores from any previous model must never be served again
+        prediction_cache.reset(model_version)
+        ready = True
 
     except Exception as e:
         print(f"Failed to load model: {e}")
+    finally:
+        startup_seconds = round(time.perf_counter() - start, 3)
+        print(f"Model startup took {startup_seconds:.2f}s (ready={ready}, artifacts={store_report})")
+
+def ensure_model_loaded() -> bool:
+    """Load the model once per container; later calls return immediately"""
+    if ready:
+        return True
+    with _load_lock:
+        if not ready:
+            load_model()
+    return ready
+
+def run_prediction(X):
+    """Score a feature matrix, timing the container's first (cold) prediction"""
+    global warm
+    if warm:
+        return predictor.predict(X)
+    with profiler.phase("first_predict"):
+        result = predictor.predict(X)
+    warm = True
+    profiler.log()
+    return result
+
+@app.on_event("startup")
+async def startup():
+    if EAGER_LOAD:
+        ensure_model_loaded()
 
 # Pydantic models
 class PlanetInput(BaseModel):
@@ -58,64 +212,194 @@ class PredictionResponse(BaseModel):
     classification: str
     model_metrics: Dict
 
+class BatchPredictionRequest(BaseModel):
+    planets: List[PlanetInput]
+
+class BatchPredictionItem(BaseModel):
+    is_exoplanet: bool
+    confidence: float
+    probability_exoplanet: float
+    probability_non_exoplanet: float
+    classification: str
+
+class BatchPredictionResponse(BaseModel):
+    count: int
+    predictions: List[BatchPredictionItem]
+    model_metrics: Dict
+
 # Feature engineering
-def engineer_features(data: PlanetInput) -> np.ndarray:
-    features = {
-        'period': data.period, 'duration': data.duration, 'depth': data.depth,
-        'prad': data.prad, 'teq': data.teq, 'insol': data.insol,
-        'steff': data.steff, 'slogg': data.slogg, 'srad': data.srad
-    }
+def planet_values(planet: PlanetInput) -> List[float]:
+    from app.features import BASE_FEATURES
+    return [getattr(planet, name) for name in BASE_FEATURES]
+
+def classify(prob_exo: float) -> str:
+    return (
+        "🌟 Highly Likely Exoplanet" if prob_exo >= 0.9 else
+        "✨ Probable Exoplanet" if prob_exo >= 0.7 else
+        "🔍 Possible Exoplanet" if prob_exo >= 0.5 else
+        "❓ Unlikely Exoplanet" if prob_exo >= 0.3 else
+        "❌ Not an Exoplanet"
+    )
+
+# Scoring
+def predict_rows(rows: List[List[float]]) -> List[tuple]:
+    """(is_exoplanet, prob_non, prob_exo) per row of 9 base values; runs in the inference executor"""
+    import numpy as np
+    from app.features import compute_features
+
+    if not ensure_model_loaded():
+        raise RuntimeError("Model not loaded")
+    X = compute_features(np.asarray(rows, dtype=np.float64), metadata['feature_names'])
+    labels, probabilities = run_prediction(X)
+    return [
+        (bool(label), prob_non, prob_exo)
+        for label, (prob_non, prob_exo) in zip(labels.tolist(), probabilities.tolist())
+    ]
 
-    # Derived features
-    features['transit_depth_ratio'] = data.depth / (data.prad**2 + 1e-10)
-    features['duration_period_ratio'] = data.duration / (data.period + 1e-10)
-    features['stellar_density'] = 10**data.slogg / (data.srad**2 + 1e-10)
-    features['stellar_luminosity'] = (data.srad**2) * (data.steff**4)
-    features['planet_density'] = (data.prad**3) / (data.period**2 + 1e-10)
-    features['equilibrium_temp_ratio'] = data.teq / (data.steff + 1e-10)
-    features['irradiation_ratio'] = data.insol / (data.teq + 1e-10)
-    features['semi_major_axis'] = ((data.period / 365.25)**2 * data.srad)**(1/3)
-    features['orbital_velocity'] = (2 * np.pi * features['semi_major_axis']) / (data.period + 1e-10)
-    features['habitable_zone_distance'] = features['semi_major_axis'] / (np.sqrt(data.insol) + 1e-10)
-    features['surface_gravity'] = data.slogg * (data.prad**2)
-    features['log_period'] = np.log10(data.period + 1)
-    features['log_insol'] = np.log10(data.insol + 1)
-    features['log_depth'] = np.log10(data.depth + 1)
-    features['sqrt_prad'] = np.sqrt(data.prad)
-    features['prad_teq_interaction'] = data.prad * data.teq
-    features['period_depth_interaction'] = data.period * data.depth
-    features['insol_steff_interaction'] = data.insol * data.steff
-    features['period_squared'] = data.period**2
-    features['prad_squared'] = data.prad**2
-    features['depth_squared'] = data.depth**2
-
-    feature_order = metadata['feature_names']
-    feature_array = np.array([features[name] for name in feature_order])
-    return feature_array.reshape(1, -1)
+def init_inference_worker():
+    """Process-pool initializer: load the model once per worker process and warm it up"""
+    global in_worker
+    in_worker = True
+    if ensure_model_loaded():
+        # The cold first prediction is paid here, not by a client request
+        try:
+            predict_rows([WARMUP_ROW])
+        except Exception as e:
+            print(f"Warm-up prediction failed: {e}")
+
+def worker_status() -> Dict:
+    """Runs in an inference worker: its load and warm-up state and startup profile"""
+    return {"ready": ready, "warm": warm, "startup_profile": profiler.report()}
+
+inference = InferenceExecutor(
+    EXECUTOR_KIND,
+    max_workers=INFERENCE_WORKERS,
+    max_queue=EXECUTOR_MAX_QUEUE,
+    initializer=init_inference_worker if EXECUTOR_KIND == "process" else None
+)
+
+async def score_planets(planets: List[PlanetInput]) -> List[tuple]:
+    """(is_exoplanet, prob_non, prob_exo) per candidate, serving repeats from the cache"""
+    rows = [planet_values(p) for p in planets]
+    keys = [prediction_cache.key(row) for row in rows]
+    results = [prediction_cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        # One feature matrix and one ensemble pass for every cache miss, off the event loop;
+        # callers hold their own executor slots (inference.admit)
+        scored = await inference.execute(predict_rows, [rows[i] for i in missing])
+        for i, result in zip(missing, scored):
+            results[i] = result
+            prediction_cache.put(keys[i], result)
+    return results
+
+async def require_model():
+    # The first load runs in a thread so health checks keep answering meanwhile
+    if not ready and not await asyncio.to_thread(ensure_model_loaded):
+        raise HTTPException(status_code=503, detail="Model not loaded")
+
+def overloaded(e: ExecutorSaturated) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+async def run_with_backpressure(fn, *args):
+    """Bulk work waits for executor capacity instead of being shed"""
+    while True:
+        try:
+            return await inference.run(fn, *args)
+        except ExecutorSaturated:
+            await asyncio.sleep(0.05)
+
+FILE_OUTPUT_FIELDS = ["row", "object_id", "is_exoplanet", "probability_exoplanet", "classification"]
+
+async def stream_file_scores(upload: UploadFile, fmt: str, layout: str, columns: List[str],
+                             chunk_size: int, output: str):
+    """Score an uploaded catalog chunk by chunk, yielding NDJSON lines or CSV text"""
+    import numpy as np
+    from app.catalog import ID_COLUMNS, base_matrix, iter_chunks
+
+    id_col = ID_COLUMNS.get(layout) if ID_COLUMNS.get(layout) in columns else None
+    chunks = iter_chunks(upload.file, fmt, chunk_size, columns)
+    row_offset = 0
+
+    if output == "csv":
+        yield ",".join(FILE_OUTPUT_FIELDS) + "\n"
+
+    while True:
+        # Parsing reads from the spooled upload, keep it off the event loop
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            break
+
+        base = base_matrix(chunk, layout)
+        valid = np.isfinite(base).all(axis=1)
+        scored = iter(await run_with_backpressure(predict_rows, base[valid]) if valid.any() else [])
+        ids = chunk[id_col].tolist() if id_col else [None] * len(chunk)
+
+        records = []
+        for i, (is_valid, object_id) in enumerate(zip(valid.tolist(), ids)):
+            record = {"row": row_offset + i, "object_id": object_id,
+                      "is_exoplanet": None, "probability_exoplanet": None, "classification": None}
+            if is_valid:
+                prediction, _, prob_exo = next(scored)
+                record.update(is_exoplanet=prediction, probability_exoplanet=prob_exo,
+                              classification=classify(prob_exo))
+            records.append(record)
+        row_offset += len(chunk)
+
+        if output == "csv":
+            buffer = io.StringIO()
+            csv.DictWriter(buffer, FILE_OUTPUT_FIELDS).writerows(records)
+            yield buffer.getvalue()
+        else:
+            yield "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+batcher = MicroBatcher(
+    score_planets,
+    max_batch_size=BATCH_MAX_SIZE,
+    max_wait_ms=BATCH_MAX_WAIT_MS
+)
 
 # Routes
 @app.get("/")
 async def root():
-    return {"message": "ExoHunt ML backend running!", "model_loaded": model is not None}
+    return {
+        "message": "ExoHunt ML backend running!",
+        "model_loaded": ready,
+        "ready": ready,
+        "warm": warm,
+        "startup_seconds": startup_seconds,
+        "startup_profile": profiler.report(),
+        "artifacts": store_report
+    }
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "model_version": model_version,
+        "prediction_cache": prediction_cache.stats(),
+        "micro_batching": batcher.stats(),
+        "executor": inference.stats()
+    }
+
+@app.get("/ready")
+async def readiness():
+    # Readiness probes double as a warm-up trigger for lazily loaded containers
+    if not ready and not await asyncio.to_thread(ensure_model_loaded):
+        raise HTTPException(status_code=503, detail="Model artifacts not verified")
+    return {"ready": True}
 
 @app.post("/predict", response_model=PredictionResponse)
 async def predict_exoplanet(planet: PlanetInput):
-    if model is None or scaler is None:
-        raise HTTPException(status_code=503, detail="Model not loaded")
-    X = engineer_features(planet)
-    X_scaled = scaler.transform(X)
-    prediction = model.predict(X_scaled)[0]
-    probabilities = model.predict_proba(X_scaled)[0]
-    prob_non = float(probabilities[0])
-    prob_exo = float(probabilities[1])
+    await require_model()
+    # Coalesced with concurrent requests and scored off the event loop; the request
+    # holds an executor slot while it waits for its batch, so backlogs are shed
+    try:
+        with inference.admit():
+            prediction, prob_non, prob_exo = await batcher.submit(planet)
+    except ExecutorSaturated as e:
+        raise overloaded(e)
     confidence = max(prob_non, prob_exo)
-    classification = (
-        "🌟 Highly Likely Exoplanet" if prob_exo >= 0.9 else
-        "✨ Probable Exoplanet" if prob_exo >= 0.7 else
-        "🔍 Possible Exoplanet" if prob_exo >= 0.5 else
-        "❓ Unlikely Exoplanet" if prob_exo >= 0.3 else
-        "❌ Not an Exoplanet"
-    )
+    classification = classify(prob_exo)
     return PredictionResponse(
         is_exoplanet=bool(prediction),
         confidence=confidence,
@@ -125,5 +409,67 @@ async def predict_exoplanet(planet: PlanetInput):
         model_metrics=metadata['metrics']
     )
 
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_batch(request: BatchPredictionRequest):
+    await require_model()
+    if len(request.planets) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(request.planets)} exceeds limit of {MAX_BATCH_SIZE} candidates"
+        )
+    if not request.planets:
+        return BatchPredictionResponse(count=0, predictions=[], model_metrics=metadata['metrics'])
+
+    # One feature matrix, one scaler pass and one ensemble pass for the uncached rows
+    try:
+        with inference.admit():
+            scored = await score_planets(request.planets)
+    except ExecutorSaturated as e:
+        raise overloaded(e)
+
+    items = []
+    for prediction, prob_non, prob_exo in scored:
+        items.append(BatchPredictionItem(
+            is_exoplanet=prediction,
+            confidence=max(prob_non, prob_exo),
+            probability_exoplanet=prob_exo,
+            probability_non_exoplanet=prob_non,
+            classification=classify(prob_exo)
+        ))
+
+    return BatchPredictionResponse(
+        count=len(items),
+        predictions=items,
+        model_metrics=metadata['metrics']
+    )
+
+@app.post("/predict/file")
+async def predict_file(
+    file: UploadFile = File(...),
+    output: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    chunk_size: int = Query(FILE_CHUNK_SIZE, ge=1, le=100000)
+):
+    """Stream scores for an uploaded CSV / Parquet catalog (unified, Kepler, K2 or TESS columns)"""
+    await require_model()
+    from app.catalog import detect_layout, is_parquet, layout_columns, read_header
+
+    fmt = "parquet" if is_parquet(file.filename or "") else "csv"
+    try:
+        header = await asyncio.to_thread(read_header, file.file, fmt)
+        layout = detect_layout(header)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not read {fmt} upload: {e}")
+
+    media_type = "text/csv" if output == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_file_scores(file, fmt, layout, layout_columns(layout, header), chunk_size, output),
+        media_type=media_type,
+        headers={"X-Catalog-Layout": layout}
+    )
+
 # Wrap FastAPI for serverless
-handler = Mangum(app)
\ No newline at end of file
+handler = Mangum(app)
+
+profiler.record("module_import", time.perf_counter() - _import_start)
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+ExoHunt micro-batching
+- Concurrent single predictions wait up to `max_wait_ms` (or until
+  `max_batch_size` items) and are scored as one vectorized call
+- Batches are handed to an async scoring function (which runs the
+  ensemble in the bounded inference executor), so the event loop stays free
+- Every awaiting request receives its own row back
+"""
+
+import asyncio
+
+
+class MicroBatcher:
+    """Request coalescer in front of an async list-in, list-out scoring function"""
+
+    def __init__(self, score_fn, max_batch_size=32, max_wait_ms=2.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self._loop = None
+        self._queue = None
+        self._worker = None
+        self._dispatching = set()
+
+    def _bind(self):
+        # (Re)create loop-bound state; test clients and workers may run several loops
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect())
+
+    async def submit(self, item):
+        """Queue one item and wait for its scored result"""
+        self._bind()
+        future = self._loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Keep collecting the next batch while this one is scored; the loop only
+            # holds tasks weakly, so keep a reference until the dispatch finishes
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, batch):
+        items = [item for item, _ in batch]
+        try:
+            results = await self.score_fn(items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+    def stats(self):
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+        }
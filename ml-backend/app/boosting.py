@@ -0,0 +1,90 @@
+"""
+ExoHunt boosting helpers
+- Early stopping for XGBoost / LightGBM / CatBoost on an internal stratified
+  validation split, returning the number of rounds actually kept
+- Warm start: continue boosting from a previous run's fitted model
+  (xgb_model / init_model) instead of starting from zero
+- Row fingerprints, so a warm start is only allowed when the new training
+  data is the old training data plus new rows
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+DEFAULT_PATIENCE = 50
+
+
+def booster_kind(model):
+    """'xgboost', 'lightgbm', 'catboost' or None for anything else"""
+    module = type(model).__module__.split('.')[0]
+    return module if module in ('xgboost', 'lightgbm', 'catboost') else None
+
+
+def get_rounds(model):
+    """Configured boosting round budget"""
+    if booster_kind(model) == 'catboost':
+        return model.get_params().get('iterations') or 1000
+    return model.get_params()['n_estimators']
+
+
+def set_rounds(model, rounds):
+    """Set the boosting round budget (e.g. to a tuned early-stopping result)"""
+    if booster_kind(model) == 'catboost':
+        # CatBoost refuses set_params once fitted; use_best_model already shrank it to `rounds` trees
+        if not model.is_fitted():
+            model.set_params(iterations=int(rounds))
+    else:
+        model.set_params(n_estimators=int(rounds))
+    return model
+
+
+def early_stop_fit(model, X, y, patience=DEFAULT_PATIENCE, validation_fraction=0.1,
+                   random_state=42, init_model=None):
+    """
+    Fit a boosted `model` with early stopping; returns the rounds kept.
+
+    Boosting stops once the validation loss has not improved for `patience`
+    rounds, and the fitted model predicts with the best iteration. With
+    `init_model` (a fitted model of the same kind) boosting continues from its
+    trees; the returned count then includes them. Other models are fitted
+    normally and None is returned.
+    """
+    kind = booster_kind(model)
+    if kind is None:
+        model.fit(X, y)
+        return None
+
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X, y, test_size=validation_fraction, random_state=random_state, stratify=y
+    )
+
+    if kind == 'xgboost':
+        model.set_params(early_stopping_rounds=patience)
+        model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False,
+                  xgb_model=init_model.get_booster() if init_model is not None else None)
+        # Keep the estimator refittable without an eval_set (clone, CV, stacking)
+        model.set_params(early_stopping_rounds=None)
+        return int(model.best_iteration) + 1
+
+    if kind == 'lightgbm':
+        import lightgbm
+        model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)],
+                  callbacks=[lightgbm.early_stopping(patience, verbose=False)],
+                  init_model=init_model.booster_ if init_model is not None else None)
+        return int(model.best_iteration_ or model.booster_.current_iteration())
+
+    model.fit(X_fit, y_fit, eval_set=(X_val, y_val), early_stopping_rounds=patience,
+              use_best_model=True, init_model=init_model, verbose=False)
+    return int(model.tree_count_)
+
+
+def row_hashes(X, y):
+    """uint64 fingerprint of every (features, label) row"""
+    rows = pd.DataFrame(np.column_stack([np.asarray(X, dtype=np.float64), np.asarray(y, dtype=np.float64)]))
+    return pd.util.hash_pandas_object(rows, index=False).to_numpy()
+
+
+def only_rows_added(previous, current):
+    """True if every previously seen row fingerprint is still present"""
+    return bool(np.isin(previous, current).all())
@@ -0,0 +1,123 @@
+"""
+ExoHunt catalog readers
+- Kepler / K2 / TESS column maps shared by preprocessing and bulk scoring
+- Layout detection for unified, Kepler, K2 and TESS style files
+- Chunked CSV / Parquet readers that only load the columns they need
+"""
+
+import numpy as np
+import pandas as pd
+
+from app.features import BASE_FEATURES
+
+# Archive column names for each mission (used by download_data.unify_datasets)
+SOURCE_COLUMN_MAPS = {
+    # Kepler column names
+    'kepler': {
+        'period': 'koi_period',
+        'duration': 'koi_duration',
+        'depth': 'koi_depth',
+        'prad': 'koi_prad',
+        'teq': 'koi_teq',
+        'insol': 'koi_insol',
+        'steff': 'koi_steff',
+        'slogg': 'koi_slogg',
+        'srad': 'koi_srad',
+        'disposition': 'koi_disposition'
+    },
+    # K2 column names (similar to Kepler)
+    'k2': {
+        'period': 'pl_orbper',  # Orbital period
+        'duration': 'pl_trandur',  # Transit duration
+        'depth': 'pl_trandep',  # Transit depth
+        'prad': 'pl_rade',  # Planet radius
+        'teq': 'pl_eqt',  # Equilibrium temp
+        'insol': 'pl_insol',  # Insolation
+        'steff': 'st_teff',  # Stellar temp
+        'slogg': 'st_logg',  # Stellar gravity
+        'srad': 'st_rad',  # Stellar radius
+        'disposition': 'pl_def_refname'  # Disposition
+    },
+    # TESS column names
+    'tess': {
+        'period': 'pl_orbper',
+        'duration': 'pl_trandurh',  # TOI table reports duration in hours
+        'depth': 'pl_trandep',
+        'prad': 'pl_rade',
+        'teq': 'pl_eqt',
+        'insol': 'pl_insol',
+        'steff': 'st_teff',
+        'slogg': 'st_logg',
+        'srad': 'st_rad',
+        'disposition': 'tfopwg_disp'
+    }
+}
+
+# Files already in the unified (processed) layout
+UNIFIED_COLUMN_MAP = {feat: feat for feat in BASE_FEATURES}
+
+# Stable per-object identifiers, carried through to scoring output
+ID_COLUMNS = {
+    'kepler': 'kepoi_name',
+    'k2': 'pl_name',
+    'tess': 'toi',
+    'unified': 'object_id',
+}
+
+LAYOUTS = {'unified': UNIFIED_COLUMN_MAP, **SOURCE_COLUMN_MAPS}
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+
+def detect_layout(columns):
+    """Return the first layout whose nine base columns are all present"""
+    available = set(columns)
+    for name in ('unified', 'kepler', 'tess', 'k2'):
+        if all(LAYOUTS[name][feat] in available for feat in BASE_FEATURES):
+            return name
+    raise ValueError(
+        "Unrecognised catalog layout: expected the nine base features in unified, "
+        "Kepler (koi_*), K2 or TESS (pl_*/st_*) column names"
+    )
+
+
+def layout_columns(layout, available):
+    """Columns to load for `layout`: base features plus the ID column if present"""
+    columns = [LAYOUTS[layout][feat] for feat in BASE_FEATURES]
+    id_col = ID_COLUMNS.get(layout)
+    if id_col in set(available) and id_col not in columns:
+        columns.append(id_col)
+    return columns
+
+
+def base_matrix(chunk, layout):
+    """(n, 9) float64 array of base features for a chunk in `layout` column names"""
+    return np.column_stack([
+        pd.to_numeric(chunk[LAYOUTS[layout][feat]], errors='coerce').to_numpy(dtype=np.float64)
+        for feat in BASE_FEATURES
+    ])
+
+
+def is_parquet(filename):
+    return str(filename).lower().endswith(PARQUET_SUFFIXES)
+
+
+def read_header(source, fmt):
+    """Column names of a CSV / Parquet file or seekable file object"""
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(source).schema_arrow.names
+    columns = pd.read_csv(source, nrows=0, comment='#').columns.tolist()
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return columns
+
+
+def iter_chunks(source, fmt, chunk_size, columns=None):
+    """Yield DataFrames of at most `chunk_size` rows, loading only `columns`"""
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size, usecols=columns, comment='#', low_memory=False)
@@ -0,0 +1,462 @@
+"""
+ExoHunt compiled inference engine
+- Exports the stacking ensemble's base learners and meta-model into flat
+  NumPy tree arrays (node feature, threshold, children, leaf values)
+- Evaluates every tree level-by-level with vectorized NumPy, no sklearn
+  validation or joblib dispatch on the hot path
+- Supports RandomForest / ExtraTrees / GradientBoosting (sklearn),
+  XGBoost, LightGBM and CatBoost; anything else raises NotImplementedError
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.inference import DEFAULT_THRESHOLD
+
+# Upper bound on rows x trees evaluated at once, keeps temporaries small
+MAX_CELLS_PER_CHUNK = 1_000_000
+
+# Larger batches go back to the (multi-threaded) sklearn ensemble
+DEFAULT_MAX_ROWS = 256
+
+# Largest probability difference accepted when verifying a compiled model
+PARITY_TOLERANCE = 1e-6
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class TreeArrays:
+    """A set of binary trees flattened into shared node arrays"""
+
+    def __init__(self, trees, strict_less=False, float32_inputs=True):
+        # trees: list of dicts with feature, threshold, left, right, value, nan_left
+        offsets = np.cumsum([0] + [len(t['feature']) for t in trees])
+        self.roots = offsets[:-1].astype(np.intp)
+        self.feature = np.concatenate([t['feature'] for t in trees]).astype(np.intp)
+        self.threshold = np.concatenate([t['threshold'] for t in trees]).astype(np.float64)
+        self.value = np.concatenate([t['value'] for t in trees]).astype(np.float64)
+        self.nan_left = np.concatenate([t['nan_left'] for t in trees]).astype(bool)
+
+        left, right = [], []
+        for offset, t in zip(offsets, trees):
+            l = np.asarray(t['left'], dtype=np.intp)
+            r = np.asarray(t['right'], dtype=np.intp)
+            own = np.arange(len(l), dtype=np.intp)
+            leaf = l < 0
+            # Leaves point to themselves so traversal needs no leaf test
+            left.append(np.where(leaf, own, l) + offset)
+            right.append(np.where(leaf, own, r) + offset)
+        self.left = np.concatenate(left)
+        self.right = np.concatenate(right)
+        self.feature[self.left == np.arange(len(self.left))] = 0
+
+        self.depth = max(t['depth'] for t in trees)
+        self.strict_less = strict_less
+        self.float32_inputs = float32_inputs
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def leaf_values(self, X):
+        """Return (n_rows, n_trees) leaf values reached by each row"""
+        if self.float32_inputs:
+            # sklearn, XGBoost and CatBoost compare float32 feature values
+            X = X.astype(np.float32).astype(np.float64)
+        out = np.empty((X.shape[0], self.n_trees), dtype=np.float64)
+        step = max(1, MAX_CELLS_PER_CHUNK // self.n_trees)
+        for start in range(0, X.shape[0], step):
+            chunk = X[start:start + step]
+            node = np.broadcast_to(self.roots, (chunk.shape[0], self.n_trees)).copy()
+            for _ in range(self.depth):
+                x = np.take_along_axis(chunk, self.feature[node], axis=1)
+                thr = self.threshold[node]
+                go_left = (x < thr) if self.strict_less else (x <= thr)
+                go_left |= np.isnan(x) & self.nan_left[node]
+                node = np.where(go_left, self.left[node], self.right[node])
+            out[start:start + step] = self.value[node]
+        return out
+
+
+def _tree_depth(left, right):
+    left, right = np.asarray(left), np.asarray(right)
+    depth, frontier = 0, np.array([0])
+    while frontier.size:
+        depth += 1
+        children = np.concatenate([left[frontier], right[frontier]])
+        frontier = children[children >= 0]
+    return depth
+
+
+def _export_sklearn_tree(tree, value):
+    left = tree.children_left
+    right = tree.children_right
+    nan_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool))
+    return {
+        'feature': np.maximum(tree.feature, 0),
+        'threshold': tree.threshold,
+        'left': left,
+        'right': right,
+        'value': value,
+        'nan_left': np.asarray(nan_left, dtype=bool),
+        'depth': _tree_depth(left, right),
+    }
+
+
+class CompiledForest:
+    """RandomForest / ExtraTrees: mean of per-tree class-1 fractions"""
+
+    def __init__(self, model):
+        trees = []
+        for est in model.estimators_:
+            counts = est.tree_.value[:, 0, :]
+            fractions = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1e-300)
+            trees.append(_export_sklearn_tree(est.tree_, fractions[:, 1]))
+        self.trees = TreeArrays(trees)
+
+    def predict_proba1(self, X):
+        return self.trees.leaf_values(X).mean(axis=1)
+
+
+class CompiledGradientBoosting:
+    """sklearn GradientBoostingClassifier (binary log-loss)"""
+
+    def __init__(self, model):
+        if model.estimators_.shape[1] != 1:
+            raise NotImplementedError("Only binary GradientBoostingClassifier is supported")
+        init = model.init_
+        if init == 'zero':
+            self.init_raw = 0.0
+        elif type(init).__name__ == 'DummyClassifier' and init.strategy == 'prior':
+            p = float(init.class_prior_[1])
+            self.init_raw = float(np.log(p / (1 - p)))
+        else:
+            raise NotImplementedError(f"Unsupported GradientBoosting init: {init!r}")
+        self.learning_rate = float(model.learning_rate)
+        self.trees = TreeArrays([
+            _export_sklearn_tree(est.tree_, est.tree_.value[:, 0, 0])
+            for est in model.estimators_[:, 0]
+        ])
+
+    def predict_proba1(self, X):
+        raw = self.init_raw + self.learning_rate * self.trees.leaf_values(X).sum(axis=1)
+        return _sigmoid(raw)
+
+
+class CompiledXGBoost:
+    """XGBClassifier with a binary:logistic gbtree booster"""
+
+    def __init__(self, model):
+        booster = model.get_booster()
+        learner = json.loads(bytearray(booster.save_raw('json')))['learner']
+        if learner['objective']['name'] != 'binary:logistic':
+            raise NotImplementedError(f"Unsupported XGBoost objective: {learner['objective']['name']}")
+        gbm = learner['gradient_booster']
+        if gbm['name'] != 'gbtree':
+            raise NotImplementedError(f"Unsupported XGBoost booster: {gbm['name']}")
+
+        base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+        self.base_margin = float(np.log(base_score / (1 - base_score)))
+
+        trees = gbm['model']['trees']
+        # predict_proba only uses trees up to the early-stopping iteration
+        try:
+            best_iteration = model.best_iteration
+        except AttributeError:
+            best_iteration = None
+        if best_iteration is not None:
+            indptr = gbm['model'].get('iteration_indptr')
+            trees = trees[:indptr[best_iteration + 1]] if indptr else trees[:best_iteration + 1]
+
+        exported = []
+        for t in trees:
+            if any(t.get('split_type', [])):
+                raise NotImplementedError("Categorical XGBoost splits are not supported")
+            left = np.asarray(t['left_children'])
+            right = np.asarray(t['right_children'])
+            exported.append({
+                'feature': np.asarray(t['split_indices']),
+                'threshold': np.asarray(t['split_conditions'], dtype=np.float32),
+                'left': left,
+                'right': right,
+                # Leaf weights are stored in split_conditions
+                'value': np.asarray(t['split_conditions'], dtype=np.float32),
+                'nan_left': np.asarray(t['default_left'], dtype=bool),
+                'depth': _tree_depth(left, right),
+            })
+        self.trees = TreeArrays(exported, strict_less=True)
+
+    def predict_proba1(self, X):
+        return _sigmoid(self.base_margin + self.trees.leaf_values(X).sum(axis=1))
+
+
+class CompiledLightGBM:
+    """LGBMClassifier with a binary objective"""
+
+    def __init__(self, model):
+        dump = model.booster_.dump_model()
+        objective = dump['objective'].split()
+        if objective[0] != 'binary':
+            raise NotImplementedError(f"Unsupported LightGBM objective: {dump['objective']}")
+        self.sigmoid = 1.0
+        for part in objective[1:]:
+            if part.startswith('sigmoid:'):
+                self.sigmoid = float(part.split(':')[1])
+        self.average_output = bool(dump.get('average_output', False))
+        self.trees = TreeArrays([self._export(t['tree_structure']) for t in dump['tree_info']],
+                                float32_inputs=False)
+
+    @staticmethod
+    def _export(root):
+        feature, threshold, left, right, value, nan_left = [], [], [], [], [], []
+
+        def visit(node):
+            idx = len(feature)
+            feature.append(0); threshold.append(0.0); left.append(-1); right.append(-1)
+            value.append(0.0); nan_left.append(False)
+            if 'leaf_value' in node:
+                value[idx] = node['leaf_value']
+                return idx
+            if node['decision_type'] != '<=':
+                raise NotImplementedError("Categorical LightGBM splits are not supported")
+            feature[idx] = node['split_feature']
+            threshold[idx] = node['threshold']
+            missing = node.get('missing_type', 'None')
+            if missing == 'NaN':
+                nan_left[idx] = node['default_left']
+            elif missing == 'None':
+                # LightGBM maps NaN to 0.0 before comparing
+                nan_left[idx] = 0.0 <= node['threshold']
+            else:
+                raise NotImplementedError(f"Unsupported LightGBM missing type: {missing}")
+            left[idx] = visit(node['left_child'])
+            right[idx] = visit(node['right_child'])
+            return idx
+
+        visit(root)
+        left, right = np.asarray(left), np.asarray(right)
+        return {
+            'feature': np.asarray(feature), 'threshold': np.asarray(threshold),
+            'left': left, 'right': right, 'value': np.asarray(value),
+            'nan_left': np.asarray(nan_left), 'depth': _tree_depth(left, right),
+        }
+
+    def predict_proba1(self, X):
+        leaves = self.trees.leaf_values(X)
+        raw = leaves.mean(axis=1) if self.average_output else leaves.sum(axis=1)
+        return _sigmoid(self.sigmoid * raw)
+
+
+class CompiledCatBoost:
+    """CatBoostClassifier (Logloss) with oblivious trees on float features"""
+
+    def __init__(self, model):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.json')
+            model.save_model(path, format='json')
+            with open(path) as f:
+                dump = json.load(f)
+
+        loss = dump['model_info'].get('params', {}).get('loss_function', {}).get('type', 'Logloss')
+        if loss not in ('Logloss', 'CrossEntropy'):
+            raise NotImplementedError(f"Unsupported CatBoost loss: {loss}")
+        flat_index = {
+            f['feature_index']: f['flat_feature_index']
+            for f in dump['features_info'].get('float_features', [])
+        }
+
+        trees = dump['oblivious_trees']
+        depth = max(len(t['splits']) for t in trees)
+        # Padding splits use +inf borders, so their leaf-index bit is always 0
+        self.split_feature = np.zeros((len(trees), depth), dtype=np.intp)
+        self.split_border = np.full((len(trees), depth), np.inf)
+        self.leaf_values = np.zeros((len(trees), 2**depth))
+        for i, t in enumerate(trees):
+            for d, split in enumerate(t['splits']):
+                if split['split_type'] != 'FloatFeature':
+                    raise NotImplementedError(f"Unsupported CatBoost split: {split['split_type']}")
+                self.split_feature[i, d] = flat_index[split['float_feature_index']]
+                self.split_border[i, d] = split['border']
+            self.leaf_values[i, :len(t['leaf_values'])] = t['leaf_values']
+
+        scale, bias = dump.get('scale_and_bias', [1.0, [0.0]])
+        self.scale = float(scale)
+        self.bias = float(bias[0] if isinstance(bias, list) else bias)
+        self.powers = (1 << np.arange(depth)).astype(np.intp)
+        self.tree_index = np.arange(len(trees))
+
+    def predict_proba1(self, X):
+        X = X.astype(np.float32).astype(np.float64)
+        out = np.empty(X.shape[0])
+        step = max(1, MAX_CELLS_PER_CHUNK // self.split_feature.size)
+        for start in range(0, X.shape[0], step):
+            chunk = X[start:start + step]
+            bits = chunk[:, self.split_feature] > self.split_border
+            leaf = (bits * self.powers).sum(axis=2)
+            out[start:start + step] = self.leaf_values[self.tree_index, leaf].sum(axis=1)
+        return _sigmoid(self.scale * out + self.bias)
+
+
+_COMPILERS = {
+    'RandomForestClassifier': CompiledForest,
+    'ExtraTreesClassifier': CompiledForest,
+    'GradientBoostingClassifier': CompiledGradientBoosting,
+    'XGBClassifier': CompiledXGBoost,
+    'LGBMClassifier': CompiledLightGBM,
+    'CatBoostClassifier': CompiledCatBoost,
+}
+
+
+def compile_estimator(model):
+    """Compile one supported binary classifier"""
+    name = type(model).__name__
+    if name not in _COMPILERS:
+        raise NotImplementedError(f"No compiled engine for {name}")
+    return _COMPILERS[name](model)
+
+
+class CompiledStacking:
+    """Drop-in predict_proba replacement for a fitted binary StackingClassifier"""
+
+    def __init__(self, model, max_rows=DEFAULT_MAX_ROWS, threshold=DEFAULT_THRESHOLD):
+        if len(model.classes_) != 2:
+            raise NotImplementedError("Only binary stacking ensembles are supported")
+        for method in model.stack_method_:
+            if method != 'predict_proba':
+                raise NotImplementedError(f"Unsupported stack method: {method}")
+        self.model = model
+        self.max_rows = max_rows
+        self.threshold = threshold
+        self.classes_ = model.classes_
+        self.passthrough = bool(getattr(model, 'passthrough', False))
+        self.base_models = [compile_estimator(est) for est in model.estimators_ if est != 'drop']
+        self.meta_model = compile_estimator(model.final_estimator_)
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if self.max_rows is not None and X.shape[0] > self.max_rows:
+            return self.model.predict_proba(X)
+        # Binary stacking feeds only the positive-class column of each learner
+        meta = np.column_stack([m.predict_proba1(X) for m in self.base_models])
+        if self.passthrough:
+            meta = np.hstack([meta, X])
+        p = self.meta_model.predict_proba1(meta)
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        # Same decision rule as EnsemblePredictor: positive at or above the threshold
+        return self.classes_[(self.predict_proba(X)[:, 1] >= self.threshold).astype(int)]
+
+
+class CompiledClassifier:
+    """Drop-in predict_proba replacement for a single supported estimator"""
+
+    def __init__(self, model, max_rows=DEFAULT_MAX_ROWS, threshold=DEFAULT_THRESHOLD):
+        self.model = model
+        self.max_rows = max_rows
+        self.threshold = threshold
+        self.classes_ = model.classes_
+        self.engine = compile_estimator(model)
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if self.max_rows is not None and X.shape[0] > self.max_rows:
+            return self.model.predict_proba(X)
+        p = self.engine.predict_proba1(np.asarray(X, dtype=np.float64))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] >= self.threshold).astype(int)]
+
+
+def compile_model(model, max_rows=DEFAULT_MAX_ROWS, threshold=DEFAULT_THRESHOLD):
+    """
+    Compile a StackingClassifier or a single supported estimator.
+
+    Batches above `max_rows` are delegated to the original model, where
+    sklearn's threaded tree traversal beats level-wise NumPy evaluation.
+    `predict` labels rows with probability >= `threshold` as positive.
+    """
+    if type(model).__name__ == 'StackingClassifier':
+        return CompiledStacking(model, max_rows, threshold)
+    return CompiledClassifier(model, max_rows, threshold)
+
+
+def max_parity_error(model, compiled, X):
+    """Largest absolute probability difference between sklearn and compiled engine"""
+    # Evaluate in max_rows slices so the compiled path (not the fallback) is compared
+    step = compiled.max_rows or len(X)
+    p_compiled = np.vstack([compiled.predict_proba(X[i:i + step]) for i in range(0, len(X), step)])
+    return float(np.max(np.abs(model.predict_proba(X)[:, 1] - p_compiled[:, 1])))
+
+
+def compile_verified(model, n_features, tolerance=PARITY_TOLERANCE, max_rows=DEFAULT_MAX_ROWS,
+                     threshold=DEFAULT_THRESHOLD):
+    """
+    Compile `model` and check it against sklearn on random scaled-space rows.
+
+    Raises NotImplementedError for unsupported estimators and ValueError
+    when probabilities differ by more than `tolerance`.
+    """
+    compiled = compile_model(model, max_rows, threshold)
+    X_probe = np.random.default_rng(0).standard_normal((64, n_features))
+    error = max_parity_error(model, compiled, X_probe)
+    if error > tolerance:
+        raise ValueError(f"Compiled engine differs from sklearn by {error:.2e} (tolerance {tolerance:.0e})")
+    return compiled
+
+
+def benchmark(model, compiled, X, repeats=100):
+    """Mean latency in milliseconds per predict_proba call for both engines"""
+    timings = {}
+    for name, engine in (('sklearn', model), ('compiled', compiled)):
+        engine.predict_proba(X)  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            engine.predict_proba(X)
+        timings[name] = (time.perf_counter() - start) / repeats * 1000
+    return timings
+
+
+def main():
+    """Benchmark the compiled engine against a saved advanced model"""
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Benchmark the compiled ExoHunt inference engine")
+    parser.add_argument('--model-dir', default='models/trained')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 100, 1000])
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    model_dir = Path(args.model_dir)
+    model = joblib.load(model_dir / 'exoplanet_model_advanced.pkl')
+    with open(model_dir / 'model_metadata_advanced.json') as f:
+        n_features = len(json.load(f)['feature_names'])
+
+    print("\n⚙️  Compiling ensemble...")
+    start = time.perf_counter()
+    # No row limit here so large batches measure the compiled path too
+    compiled = compile_model(model, max_rows=None)
+    print(f"   ✅ Compiled in {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(42)
+    X = rng.standard_normal((max(args.rows), n_features))
+    print(f"   Max |Δp| vs sklearn: {max_parity_error(model, compiled, X):.2e}")
+
+    print("\n⏱️  Latency per call (ms):")
+    for rows in args.rows:
+        t = benchmark(model, compiled, X[:rows], repeats=args.repeats)
+        print(f"   {rows:>6} rows | sklearn: {t['sklearn']:>9.3f} | compiled: {t['compiled']:>9.3f} "
+              f"| speedup: {t['sklearn'] / t['compiled']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
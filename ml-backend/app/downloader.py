@@ -0,0 +1,146 @@
+"""
+ExoHunt dataset downloader
+- Fetches every archive source concurrently (one thread and session each)
+- Streams response bodies to a `.part` file in chunks; an interrupted
+  download resumes with a Range + If-Range request on the next run when the
+  server gave it a validator, and starts over otherwise
+- Revalidates with ETag / Last-Modified (If-None-Match / If-Modified-Since),
+  stored in a `.meta.json` sidecar next to each file
+- Reports a SHA-256 content hash and whether the file actually changed,
+  so callers can skip reprocessing unchanged sources
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from app.model_store import sha256_file
+
+CHUNK_SIZE = 1 << 20
+
+
+def meta_path(path):
+    path = Path(path)
+    return path.with_name(path.name + '.meta.json')
+
+
+def part_path(path):
+    path = Path(path)
+    return path.with_name(path.name + '.part')
+
+
+def load_meta(path):
+    try:
+        with open(meta_path(path)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_meta(path, meta):
+    tmp = meta_path(path).with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, meta_path(path))
+
+
+def _validators(response):
+    return {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+
+
+def fetch(url, path, session=None, timeout=60, verify=True, chunk_size=CHUNK_SIZE):
+    """
+    Download `url` to `path`, revalidating or resuming where possible.
+
+    Returns {'url', 'path', 'status', 'changed', 'sha256', 'bytes', 'seconds'}
+    where status is 'downloaded', 'resumed' or 'not_modified'.
+    """
+    start = time.perf_counter()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part = part_path(path)
+    session = session or requests.Session()
+
+    meta = load_meta(path)
+    if meta.get('url') != url:
+        meta = {'url': url}
+    pending = meta.get('pending') or {}
+    validator = pending.get('etag') or pending.get('last_modified')
+
+    headers = {}
+    # Resume only if the server can confirm it still has the version we started on;
+    # without a validator a bare Range could splice two versions into one file
+    offset = part.stat().st_size if part.exists() and validator else 0
+    if offset:
+        headers['Range'] = f'bytes={offset}-'
+        headers['If-Range'] = validator
+    elif path.exists() and meta.get('sha256'):
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout, verify=verify) as response:
+        if response.status_code == 304:
+            return {
+                'url': url, 'path': path, 'status': 'not_modified', 'changed': False,
+                'sha256': meta['sha256'], 'bytes': path.stat().st_size,
+                'seconds': round(time.perf_counter() - start, 3),
+            }
+        if response.status_code == 416 and offset:
+            # The partial is already complete (or longer than the file): start over
+            part.unlink()
+            meta.pop('pending', None)
+            save_meta(path, meta)
+            return fetch(url, path, session=session, timeout=timeout, verify=verify, chunk_size=chunk_size)
+        response.raise_for_status()
+
+        resumed = response.status_code == 206 and offset > 0
+        if not resumed:
+            offset = 0
+            meta['pending'] = _validators(response)
+            save_meta(path, meta)
+
+        with open(part, 'ab' if resumed else 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+
+        validators = meta.pop('pending', None) or _validators(response)
+
+    digest = sha256_file(part)
+    changed = digest != meta.get('sha256') or not path.exists()
+    os.replace(part, path)
+    meta.update(validators, sha256=digest)
+    save_meta(path, meta)
+
+    return {
+        'url': url, 'path': path, 'status': 'resumed' if resumed else 'downloaded', 'changed': changed,
+        'sha256': digest, 'bytes': path.stat().st_size,
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def fetch_all(sources, timeout=60, verify=True, max_workers=None):
+    """
+    Fetch {name: (url, path)} concurrently.
+
+    Returns {name: result}; a failed source has status 'failed' and an 'error'
+    instead of raising, so one bad endpoint does not sink the others.
+    """
+    def run(url, path):
+        with requests.Session() as session:
+            try:
+                return fetch(url, path, session=session, timeout=timeout, verify=verify)
+            except Exception as e:
+                return {'url': url, 'path': Path(path), 'status': 'failed', 'changed': False, 'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(sources) or 1) as pool:
+        futures = {name: pool.submit(run, url, path) for name, (url, path) in sources.items()}
+        return {name: future.result() for name, future in futures.items()}
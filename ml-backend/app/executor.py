@@ -0,0 +1,132 @@
+"""
+ExoHunt inference executor
+- Runs CPU-heavy scoring off the asyncio event loop
+- Thread pool (shared model) or process pool (model preloaded per worker
+  through an initializer; `broadcast` reports back from every worker)
+- Bounded: once every worker is busy and `max_queue` requests are waiting,
+  new requests are rejected immediately so the API can shed load with a 503
+- Admission counts requests, not pool tasks: a request holds its slot while
+  it waits in a micro-batch, so one coalesced batch cannot hide a backlog
+"""
+
+import asyncio
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the inference queue is full"""
+
+
+class InferenceExecutor:
+    """Bounded thread/process pool with queue-depth metrics"""
+
+    def __init__(self, kind='thread', max_workers=2, max_queue=64, initializer=None, initargs=()):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.initializer = initializer
+        self.initargs = initargs
+        self.pending = 0
+        self.peak_pending = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._pool = None
+
+    def _get_pool(self):
+        # Created on first use so importing the API never spawns workers
+        if self._pool is None:
+            if self.kind == 'process':
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=self.initializer,
+                    initargs=self.initargs
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='exohunt-inference',
+                    initializer=self.initializer,
+                    initargs=self.initargs
+                )
+        return self._pool
+
+    @property
+    def queue_depth(self):
+        return max(0, self.pending - self.max_workers)
+
+    def saturated(self):
+        return self.pending >= self.max_workers + self.max_queue
+
+    @contextmanager
+    def admit(self):
+        """
+        Hold one request slot for the duration of the block.
+
+        Raises ExecutorSaturated (and counts the rejection) if no more requests can wait.
+        """
+        if self.saturated():
+            self.rejected += 1
+            raise ExecutorSaturated(
+                f"Inference queue full ({self.queue_depth} waiting, {self.max_workers} workers busy)"
+            )
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+    async def execute(self, fn, *args):
+        """Run fn(*args) in the pool for requests that were already admitted (e.g. a micro-batch)"""
+        loop = asyncio.get_running_loop()
+        self.running += 1
+        try:
+            result = await loop.run_in_executor(self._get_pool(), fn, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+        self.completed += 1
+        return result
+
+    async def run(self, fn, *args):
+        """Admit one request and run fn(*args) in the pool; raises ExecutorSaturated past the bound"""
+        with self.admit():
+            return await self.execute(fn, *args)
+
+    def broadcast(self, fn):
+        """
+        Run fn() once per worker slot and return the results (blocking).
+
+        Starts the pool; in process mode each result comes from a worker whose
+        initializer has already finished.
+        """
+        pool = self._get_pool()
+        futures = [pool.submit(fn) for _ in range(self.max_workers)]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self):
+        return {
+            'kind': self.kind,
+            'workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'in_flight': min(self.running, self.max_workers),
+            'queue_depth': self.queue_depth,
+            'peak_pending': self.peak_pending,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+        }
@@ -0,0 +1,95 @@
+"""
+ExoHunt feature-matrix cache
+- Persists the engineered X / y as `.npy` files keyed on the dataset's
+  SHA-256, FEATURE_VERSION, the feature column list and dtype
+- Later training, CV and tuning runs open them with mmap_mode='r' (no CSV
+  parsing, no feature recomputation, no copy)
+- `share()` spills a working array (e.g. the scaled training split) to a
+  memmap; joblib hands np.memmap arrays to worker processes by file
+  reference instead of pickling a copy per worker
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from app.features import FEATURE_VERSION
+from app.model_store import sha256_file
+
+DEFAULT_CACHE_DIR = Path(os.getenv("EXOHUNT_FEATURE_CACHE", "data/cache/features"))
+
+
+class FeatureCache:
+    """Content-addressed store of memory-mapped feature matrices"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, dtype=np.float64):
+        self.cache_dir = Path(cache_dir)
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, dataset_path, feature_names, **extra):
+        """Cache key for features computed from `dataset_path`"""
+        spec = {
+            'dataset_sha256': sha256_file(dataset_path),
+            'feature_version': FEATURE_VERSION,
+            'feature_names': list(feature_names),
+            'dtype': self.dtype.name,
+            **extra,
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
+    def _paths(self, key):
+        entry = self.cache_dir / key
+        return entry / 'X.npy', entry / 'y.npy', entry / 'meta.json'
+
+    def load(self, key):
+        """(X, y, feature_names) as read-only memmaps, or None on a miss"""
+        X_path, y_path, meta_path = self._paths(key)
+        if not meta_path.exists():
+            self.misses += 1
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        self.hits += 1
+        return np.load(X_path, mmap_mode='r'), np.load(y_path, mmap_mode='r'), meta['feature_names']
+
+    def save(self, key, X, y, feature_names):
+        """Write X / y for `key` and return them reopened as memmaps"""
+        X_path, y_path, meta_path = self._paths(key)
+        X_path.parent.mkdir(parents=True, exist_ok=True)
+        _save_npy(X_path, np.ascontiguousarray(X, dtype=self.dtype))
+        _save_npy(y_path, np.ascontiguousarray(y))
+        # meta.json is written last; its presence marks a complete entry
+        with open(meta_path.with_suffix('.tmp'), 'w') as f:
+            json.dump({'feature_names': list(feature_names), 'shape': list(np.shape(X)),
+                       'dtype': self.dtype.name, 'feature_version': FEATURE_VERSION}, f, indent=2)
+        os.replace(meta_path.with_suffix('.tmp'), meta_path)
+        return self.load(key)
+
+    def get_or_build(self, dataset_path, feature_names, build_fn, **extra):
+        """
+        Return (X, y, feature_names, hit), building via build_fn() -> (X, y) on a miss.
+        """
+        key = self.key(dataset_path, feature_names, **extra)
+        cached = self.load(key)
+        if cached is not None:
+            return (*cached, True)
+        X, y = build_fn()
+        return (*self.save(key, X, y, feature_names), False)
+
+    def share(self, name, array):
+        """Spill `array` to a scratch memmap so parallel workers read it in place"""
+        path = self.cache_dir / 'scratch' / f'{name}.npy'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _save_npy(path, np.ascontiguousarray(array))
+        return np.load(path, mmap_mode='r')
+
+
+def _save_npy(path, array):
+    tmp = path.with_name(path.stem + '.tmp.npy')
+    np.save(tmp, array)
+    os.replace(tmp, path)
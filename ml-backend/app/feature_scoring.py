@@ -0,0 +1,86 @@
+"""
+ExoHunt feature scoring
+- Mutual information of every feature with the label, estimated on a
+  stratified subsample (kNN-based MI cost grows with the row count)
+- Features are scored in parallel (one job per feature, threads from the
+  parallelism plan)
+- Scores are cached as JSON keyed on the scored data's hash, FEATURE_VERSION,
+  the feature list and the estimator settings, so unchanged data is never
+  rescored; the top-k selection is then a lookup
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.feature_selection import mutual_info_classif
+from sklearn.model_selection import train_test_split
+
+from app.features import FEATURE_VERSION
+from app.parallelism import ParallelPlan, loky_pool, pinned
+
+DEFAULT_CACHE_DIR = Path(os.getenv("EXOHUNT_FEATURE_SCORE_CACHE", "data/cache/feature_scores"))
+DEFAULT_SAMPLE_SIZE = 20000
+
+
+def data_key(X, y, feature_names, **settings):
+    """Cache key: content hash of X / y plus FEATURE_VERSION, feature list and settings"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.int64).tobytes())
+    spec = {'feature_version': FEATURE_VERSION, 'feature_names': list(feature_names), **settings}
+    digest.update(json.dumps(spec, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def stratified_sample(X, y, sample_size, random_state=42):
+    """At most `sample_size` rows with the class ratio of y"""
+    if len(y) <= sample_size:
+        return X, y
+    X_sample, _, y_sample, _ = train_test_split(
+        X, y, train_size=sample_size, random_state=random_state, stratify=y
+    )
+    return X_sample, y_sample
+
+
+def mutual_information(X, y, feature_names, sample_size=DEFAULT_SAMPLE_SIZE, n_neighbors=3,
+                       cache_dir=DEFAULT_CACHE_DIR, plan=None):
+    """{feature: MI score} for every column, from the cache when the data is unchanged"""
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    key = data_key(X, y, feature_names, sample_size=sample_size, n_neighbors=n_neighbors)
+    path = Path(cache_dir) / f'{key}.json'
+    if path.exists():
+        with open(path) as f:
+            scores = json.load(f)['scores']
+        print(f"   ♻️  Cached MI scores ({key})")
+        return scores
+
+    plan = plan or ParallelPlan()
+    jobs, threads = plan.split('MI feature scoring', X.shape[1])
+    X_sample, y_sample = stratified_sample(X, y, sample_size)
+    start = time.perf_counter()
+    with pinned(threads), loky_pool(jobs, threads):
+        mi = mutual_info_classif(X_sample, y_sample, n_neighbors=n_neighbors, random_state=42, n_jobs=jobs)
+    scores = dict(zip(feature_names, map(float, mi)))
+    print(f"   ✅ Scored {len(scores)} features on {len(y_sample)} of {len(y)} rows "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump({'scores': scores, 'rows': len(y), 'sample_rows': len(y_sample),
+                   'feature_version': FEATURE_VERSION}, f, indent=2)
+    os.replace(tmp, path)
+    return scores
+
+
+def select_top_k(scores, feature_names, k):
+    """Names of the `k` highest-scoring features (capped at the column count), in column order"""
+    k = min(k, len(feature_names))
+    ranked = sorted(feature_names, key=lambda name: scores[name], reverse=True)[:k]
+    keep = set(ranked)
+    return [name for name in feature_names if name in keep]
@@ -0,0 +1,99 @@
+"""
+ExoHunt shared feature engineering
+- One NumPy kernel for serving, training and preprocessing
+- Input: (n, 9) float array of base transit/stellar parameters
+- Output: preallocated (n, k) float array in the requested feature order
+"""
+
+import numpy as np
+
+# Bump whenever a formula below changes so cached feature matrices are rebuilt
+FEATURE_VERSION = 1
+
+# Column order of the (n, 9) input array
+BASE_FEATURES = [
+    'period', 'duration', 'depth', 'prad',
+    'teq', 'insol', 'steff', 'slogg', 'srad'
+]
+
+EPS = 1e-10
+
+
+def _semi_major_axis(b):
+    return ((b['period'] / 365.25)**2 * b['srad'])**(1/3)
+
+
+# Physics-based derived features, in training column order
+DERIVED_FEATURES = {
+    # Transit geometry
+    'transit_depth_ratio': lambda b: b['depth'] / (b['prad']**2 + EPS),
+    'duration_period_ratio': lambda b: b['duration'] / (b['period'] + EPS),
+
+    # Stellar characteristics
+    'stellar_density': lambda b: 10**b['slogg'] / (b['srad']**2 + EPS),
+    'stellar_luminosity': lambda b: (b['srad']**2) * (b['steff']**4),
+
+    # Planet characteristics
+    'planet_density': lambda b: (b['prad']**3) / (b['period']**2 + EPS),
+    'equilibrium_temp_ratio': lambda b: b['teq'] / (b['steff'] + EPS),
+    'irradiation_ratio': lambda b: b['insol'] / (b['teq'] + EPS),
+
+    # Orbital mechanics
+    'semi_major_axis': _semi_major_axis,
+    'orbital_velocity': lambda b: (2 * np.pi * _semi_major_axis(b)) / (b['period'] + EPS),
+
+    # Habitability indicators
+    'habitable_zone_distance': lambda b: _semi_major_axis(b) / (np.sqrt(b['insol']) + EPS),
+    'surface_gravity': lambda b: b['slogg'] * (b['prad']**2),
+
+    # Statistical transformations
+    'log_period': lambda b: np.log10(b['period'] + 1),
+    'log_insol': lambda b: np.log10(b['insol'] + 1),
+    'log_depth': lambda b: np.log10(b['depth'] + 1),
+    'sqrt_prad': lambda b: np.sqrt(b['prad']),
+
+    # Interaction features
+    'prad_teq_interaction': lambda b: b['prad'] * b['teq'],
+    'period_depth_interaction': lambda b: b['period'] * b['depth'],
+    'insol_steff_interaction': lambda b: b['insol'] * b['steff'],
+
+    # Polynomial features
+    'period_squared': lambda b: b['period']**2,
+    'prad_squared': lambda b: b['prad']**2,
+    'depth_squared': lambda b: b['depth']**2,
+}
+
+# Full engineered feature set (9 base + 21 derived)
+FEATURE_NAMES = BASE_FEATURES + list(DERIVED_FEATURES)
+
+
+def compute_features(base, feature_names=None, out=None):
+    """
+    Engineer features for an (n, 9) array of base parameters.
+
+    Columns are written in `feature_names` order (default: FEATURE_NAMES),
+    which is how `metadata['feature_names']` selects and orders them for
+    the model. Pass `out` to reuse a preallocated (n, k) array.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    if base.ndim != 2 or base.shape[1] != len(BASE_FEATURES):
+        raise ValueError(f"Expected an (n, {len(BASE_FEATURES)}) array, got shape {base.shape}")
+
+    names = FEATURE_NAMES if feature_names is None else list(feature_names)
+    if out is None:
+        out = np.empty((base.shape[0], len(names)), dtype=np.float64)
+    elif out.shape != (base.shape[0], len(names)):
+        raise ValueError(f"Output array has shape {out.shape}, expected {(base.shape[0], len(names))}")
+
+    columns = {name: base[:, i] for i, name in enumerate(BASE_FEATURES)}
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for j, name in enumerate(names):
+            if name in columns:
+                out[:, j] = columns[name]
+            elif name in DERIVED_FEATURES:
+                out[:, j] = DERIVED_FEATURES[name](columns)
+            else:
+                raise KeyError(f"Unknown feature: {name}")
+
+    return out
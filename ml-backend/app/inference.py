@@ -0,0 +1,33 @@
+"""
+ExoHunt inference wrapper
+- Scales features and runs the ensemble's probability pass exactly once
+- Derives the binary label from a decision threshold stored in metadata
+"""
+
+DEFAULT_THRESHOLD = 0.5
+
+
+class EnsemblePredictor:
+    """Single-pass scorer shared by every serving path"""
+
+    def __init__(self, model, scaler, threshold=DEFAULT_THRESHOLD):
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError(f"Decision threshold must be in [0, 1], got {threshold}")
+        self.model = model
+        self.scaler = scaler
+        self.threshold = float(threshold)
+
+    @classmethod
+    def from_metadata(cls, model, scaler, metadata):
+        """Build a predictor using `metadata['decision_threshold']` (default 0.5)"""
+        return cls(model, scaler, metadata.get('decision_threshold', DEFAULT_THRESHOLD))
+
+    def predict_proba(self, X):
+        """Return (n, 2) class probabilities for an unscaled feature matrix"""
+        return self.model.predict_proba(self.scaler.transform(X))
+
+    def predict(self, X):
+        """Return (is_exoplanet labels, (n, 2) probabilities) from one ensemble pass"""
+        probabilities = self.predict_proba(X)
+        labels = probabilities[:, 1] >= self.threshold
+        return labels, probabilities
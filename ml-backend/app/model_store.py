@@ -0,0 +1,165 @@
+"""
+ExoHunt model artifact store
+- Resolves model artifacts from a local cache directory first
+- Verifies every artifact against a manifest of SHA-256 hashes
+- Falls back to the Hugging Face Hub (or a local stand-in directory)
+  only for missing or corrupt files
+- The remote manifest.json (written by train_advanced.py) must be
+  published with the artifacts; without it nothing is fetched unless
+  unverified artifacts are explicitly allowed, in which case they are
+  pinned by a locally written manifest on first download
+"""
+
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+
+MODEL_FILE = 'exoplanet_model_advanced.pkl'
+SCALER_FILE = 'scaler_advanced.pkl'
+METADATA_FILE = 'model_metadata_advanced.json'
+ARTIFACTS = [MODEL_FILE, SCALER_FILE, METADATA_FILE]
+
+MANIFEST_FILE = 'manifest.json'
+
+
+class ArtifactVerificationError(Exception):
+    """Raised when an artifact is missing from the manifest or fails its checksum"""
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_manifest(directory, filenames=ARTIFACTS):
+    """Hash `filenames` inside `directory` and write manifest.json next to them"""
+    directory = Path(directory)
+    manifest = {
+        'algorithm': 'sha256',
+        'files': {name: sha256_file(directory / name) for name in filenames},
+    }
+    with open(directory / MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class HubFetcher:
+    """Download artifacts from a Hugging Face Hub model repo"""
+
+    def __init__(self, repo_id):
+        self.repo_id = repo_id
+
+    def __call__(self, filename):
+        from huggingface_hub import hf_hub_download
+        from huggingface_hub.utils import EntryNotFoundError
+        try:
+            return Path(hf_hub_download(repo_id=self.repo_id, filename=filename))
+        except EntryNotFoundError as e:
+            raise FileNotFoundError(f"{filename} not found in {self.repo_id}") from e
+
+    def __repr__(self):
+        return f"HubFetcher({self.repo_id!r})"
+
+
+class LocalFetcher:
+    """File-based stand-in for the hub, e.g. a shared volume or test fixture"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def __call__(self, filename):
+        path = self.directory / filename
+        if not path.exists():
+            raise FileNotFoundError(f"{filename} not found in {self.directory}")
+        return path
+
+    def __repr__(self):
+        return f"LocalFetcher({str(self.directory)!r})"
+
+
+class ModelStore:
+    """Local-first, checksum-verified artifact resolution"""
+
+    def __init__(self, cache_dir, fetcher, filenames=ARTIFACTS, allow_unverified=False):
+        self.cache_dir = Path(cache_dir)
+        self.fetcher = fetcher
+        self.filenames = list(filenames)
+        self.allow_unverified = allow_unverified
+        self.manifest = None
+        self.last_report = None
+
+    def _load_manifest(self, path):
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest.get('algorithm', 'sha256') != 'sha256':
+            raise ArtifactVerificationError(f"Unsupported manifest algorithm: {manifest['algorithm']}")
+        return manifest['files']
+
+    def _is_valid(self, name, expected):
+        path = self.cache_dir / name
+        return name in expected and path.exists() and sha256_file(path) == expected[name]
+
+    def _fetch_unverified(self, names):
+        """Trust-on-first-use: copy `names` in and pin every artifact in a local manifest"""
+        print(f"⚠️  No {MANIFEST_FILE} in {self.fetcher!r}; fetching {names} unverified")
+        for name in names:
+            fetched = self.fetcher(name)
+            if Path(fetched).resolve() != (self.cache_dir / name).resolve():
+                shutil.copyfile(fetched, self.cache_dir / name)
+        return write_manifest(self.cache_dir, self.filenames)['files']
+
+    def resolve(self):
+        """
+        Return {filename: verified local path}.
+
+        Raises ArtifactVerificationError if an artifact cannot be verified, including
+        when the fetcher has no manifest and unverified artifacts are not allowed.
+        """
+        start = time.perf_counter()
+        manifest_path = self.cache_dir / MANIFEST_FILE
+        expected = self._load_manifest(manifest_path) if manifest_path.exists() else {}
+
+        missing = [name for name in self.filenames if not self._is_valid(name, expected)]
+        verified = True
+        if missing:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                remote_manifest = self.fetcher(MANIFEST_FILE)
+            except FileNotFoundError as e:
+                if not self.allow_unverified:
+                    raise ArtifactVerificationError(
+                        f"{e}; upload the {MANIFEST_FILE} train_advanced.py writes next to the artifacts"
+                    ) from e
+                expected = self._fetch_unverified(missing)
+                verified = False
+            else:
+                # Cache miss: the remote manifest is the source of truth for what we fetch
+                expected = self._load_manifest(remote_manifest)
+                missing = [name for name in self.filenames if not self._is_valid(name, expected)]
+
+                for name in missing:
+                    if name not in expected:
+                        raise ArtifactVerificationError(f"{name} is not listed in the manifest")
+                    fetched = self.fetcher(name)
+                    if sha256_file(fetched) != expected[name]:
+                        raise ArtifactVerificationError(f"Checksum mismatch for {name} from {self.fetcher!r}")
+                    if Path(fetched).resolve() != (self.cache_dir / name).resolve():
+                        shutil.copyfile(fetched, self.cache_dir / name)
+
+                if Path(remote_manifest).resolve() != manifest_path.resolve():
+                    shutil.copyfile(remote_manifest, manifest_path)
+
+        self.manifest = expected
+        self.last_report = {
+            'cache_hits': len(self.filenames) - len(missing),
+            'cache_misses': len(missing),
+            'verified': verified,
+            'seconds': round(time.perf_counter() - start, 3),
+        }
+        return {name: self.cache_dir / name for name in self.filenames}
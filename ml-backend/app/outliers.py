@@ -0,0 +1,52 @@
+"""
+ExoHunt outlier filtering
+- IQR-style bounds from the 1st / 99th percentiles (Q1 - 1.5 IQR, Q3 + 1.5 IQR)
+- 'independent' mode: every column's bounds come from one vectorized
+  quantile call on the full frame and one combined mask is applied, so the
+  result does not depend on column order
+- 'sequential' mode: the original behaviour, where each column's bounds are
+  computed on the rows kept by the previous columns (mask-based, no copies)
+- Reports how many rows each column rejected
+"""
+
+import numpy as np
+
+MODES = ('independent', 'sequential')
+
+
+def iqr_bounds(values, lower_q=0.01, upper_q=0.99, k=1.5):
+    """(lower, upper) bound arrays for each column of a 2-D array (NaNs ignored)"""
+    q1, q3 = np.nanquantile(values, [lower_q, upper_q], axis=0)
+    iqr = q3 - q1
+    return q1 - k * iqr, q3 + k * iqr
+
+
+def filter_outliers(df, columns, lower_q=0.01, upper_q=0.99, k=1.5, mode='independent'):
+    """
+    Drop rows outside the IQR bounds of any of `columns`.
+
+    Returns (filtered frame, {column: rows rejected}). In independent mode a row
+    counts against every column it violates; in sequential mode only against the
+    first column that removed it. Rows with NaN in a checked column are rejected.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown outlier mode: {mode} (expected one of {MODES})")
+
+    values = df[columns].to_numpy(dtype=np.float64)
+
+    with np.errstate(invalid='ignore'):
+        if mode == 'independent':
+            lower, upper = iqr_bounds(values, lower_q, upper_q, k)
+            inside = (values >= lower) & (values <= upper)
+            keep = inside.all(axis=1)
+            rejected = dict(zip(columns, (~inside).sum(axis=0).tolist()))
+        else:
+            keep = np.ones(len(values), dtype=bool)
+            rejected = {}
+            for j, col in enumerate(columns):
+                lower, upper = iqr_bounds(values[keep, j], lower_q, upper_q, k)
+                inside = (values[:, j] >= lower) & (values[:, j] <= upper)
+                rejected[col] = int((keep & ~inside).sum())
+                keep &= inside
+
+    return df[keep], rejected
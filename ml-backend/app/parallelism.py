@@ -0,0 +1,76 @@
+"""
+ExoHunt parallelism plan
+- One `--cores` budget per training run, handed out per nesting level:
+  each stage runs `outer` jobs at once (models, folds, trials, stack
+  learners) and every job gets `cores // outer` threads
+- Learners get that thread count explicitly (n_jobs / thread_count)
+  instead of n_jobs=-1 at every level
+- BLAS / OpenMP pools are pinned to the same count in this process, and
+  explicit loky pools (`loky_pool`) pin them in their worker processes;
+  learners keep their own joblib backend (e.g. sklearn forests use threads)
+- Every split is logged, so the effective plan shows up in the training log
+"""
+
+import os
+from contextlib import contextmanager, nullcontext
+
+from joblib import parallel_config
+from threadpoolctl import threadpool_limits
+
+from app.scheduler import set_threads
+
+
+def default_cores():
+    """Cores this process may use (affinity-aware where the platform supports it)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class ParallelPlan:
+    """Splits one core budget between concurrent jobs and the threads each job uses"""
+
+    def __init__(self, cores=None):
+        self.cores = max(1, cores or default_cores())
+        self.stages = []
+
+    def split(self, stage, tasks, outer=None):
+        """
+        (outer, inner) for `tasks` independent jobs: at most `outer` run at once
+        (default: as many as the budget allows) and each gets `inner` threads.
+        """
+        outer = max(1, min(outer or tasks, tasks, self.cores))
+        inner = max(1, self.cores // outer)
+        self.stages.append((stage, outer, inner))
+        print(f"   🧵 {stage}: {outer} job(s) x {inner} thread(s) of {self.cores} cores")
+        return outer, inner
+
+    def single(self, stage):
+        """Budget for a stage that runs one job (all cores as its threads)"""
+        return self.split(stage, 1)[1]
+
+    def apply(self, model, threads):
+        """Point `model`'s own parallelism at `threads`; returns the model"""
+        set_threads(model, threads)
+        return model
+
+    def summary(self):
+        return [{'stage': stage, 'jobs': outer, 'threads': inner} for stage, outer, inner in self.stages]
+
+
+@contextmanager
+def pinned(threads):
+    """Pin this process's BLAS / OpenMP pools to `threads`"""
+    with threadpool_limits(threads):
+        yield
+
+
+def loky_pool(jobs, threads):
+    """
+    Context for one explicit Parallel(n_jobs=jobs) call: its loky workers get
+    `threads` BLAS / OpenMP threads each. With jobs == 1 everything runs in this
+    process, so nothing is forced and learners keep their own backend.
+    """
+    if jobs <= 1:
+        return nullcontext()
+    return parallel_config(backend='loky', inner_max_num_threads=threads)
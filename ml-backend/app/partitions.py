@@ -0,0 +1,93 @@
+"""
+ExoHunt per-source dataset partitions
+- Each mission's processed rows (with derived features) are stored as one
+  Parquet partition tagged with the raw file's content hash, the archive
+  column map and the FEATURE_VERSION that produced them
+- An unchanged source is reused as-is, without parsing its raw file
+- A changed source is merged by stable object ID: unchanged rows keep their
+  stored features, changed and new rows are recomputed, new IDs are
+  appended and withdrawn IDs are dropped
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from app.features import FEATURE_VERSION
+from app.storage import parquet_path, read_metadata, read_table, write_table
+
+PARTITION_DIR = Path('data/processed/partitions')
+
+
+def partition_path(source, directory=PARTITION_DIR):
+    return parquet_path(Path(directory) / source.lower())
+
+
+def stable_ids(source, ids):
+    """`source:id`, with `#n` appended to repeated IDs (e.g. several K2 parameter sets per planet)"""
+    ids = pd.Series(ids, dtype=str).reset_index(drop=True)
+    repeat = ids.groupby(ids).cumcount()
+    suffix = repeat.map(lambda n: f'#{n}' if n else '')
+    return (source + ':' + ids + suffix).to_numpy()
+
+
+def load_partition(path, sha256=None, column_map=None):
+    """
+    Stored partition, or None; with `sha256` / `column_map`, only if it was built
+    from that content with that archive column mapping.
+    """
+    path = parquet_path(path)
+    if not path.exists():
+        return None
+    meta = read_metadata(path)
+    if meta.get('feature_version') != FEATURE_VERSION:
+        return None
+    if sha256 is not None and meta.get('sha256') != sha256:
+        return None
+    if column_map is not None and meta.get('column_map') != column_map:
+        return None
+    return read_table(path)
+
+
+def save_partition(df, path, sha256, column_map=None):
+    metadata = {'sha256': sha256, 'feature_version': FEATURE_VERSION}
+    if column_map is not None:
+        metadata['column_map'] = column_map
+    return write_table(df, path, metadata=metadata)
+
+
+def merge_partition(old, new, value_columns, features_fn, id_column='object_id'):
+    """
+    Merge freshly processed rows `new` into the stored partition `old`.
+
+    Rows whose `value_columns` are unchanged keep their stored features;
+    `features_fn(frame)` is only called on changed and new rows.
+    Returns (merged frame, {'unchanged', 'updated', 'added', 'removed'}).
+    """
+    if old is None or old.empty:
+        merged = features_fn(new.reset_index(drop=True))
+        return merged, {'unchanged': 0, 'updated': 0, 'added': len(new), 'removed': 0}
+
+    old = old.set_index(id_column)
+    new = new.set_index(id_column)
+    for col in value_columns:
+        # Stored categoricals compare against the freshly parsed dtype
+        old[col] = old[col].astype(new[col].dtype)
+
+    kept_ids = old.index[old.index.isin(new.index)]
+    same = (old.loc[kept_ids, value_columns] == new.loc[kept_ids, value_columns]).all(axis=1).to_numpy()
+    added_ids = new.index[~new.index.isin(old.index)]
+    recompute_ids = kept_ids[~same].append(added_ids)
+
+    fresh = features_fn(new.loc[recompute_ids].reset_index()).set_index(id_column)
+    merged = pd.concat([old.loc[kept_ids[same]], fresh])
+    # Existing objects keep their position; new objects are appended
+    merged = merged.loc[kept_ids.append(added_ids)].reset_index()
+
+    stats = {
+        'unchanged': int(same.sum()),
+        'updated': int((~same).sum()),
+        'added': len(added_ids),
+        'removed': len(old) - len(kept_ids),
+    }
+    return merged, stats
@@ -0,0 +1,78 @@
+"""
+ExoHunt prediction cache
+- LRU + TTL cache of scored candidates
+- Keyed on the 9 base inputs rounded to a fixed number of significant
+  digits, plus the model version, so near-identical rows share an entry
+- Cleared on every model load so stale scores are never served
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, max_size=10000, ttl_seconds=3600, significant_digits=6):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.significant_digits = significant_digits
+        self.model_version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def key(self, values):
+        """Canonical key for one candidate's base feature values"""
+        digits = self.significant_digits
+        return (self.model_version,) + tuple(float(f"{float(v):.{digits}g}") for v in values)
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def reset(self, model_version):
+        """Drop every entry and start serving `model_version`"""
+        with self._lock:
+            self._entries.clear()
+            self.model_version = model_version
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'model_version': self.model_version,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,34 @@
+"""
+ExoHunt startup profiler
+- Records wall-clock time per cold-start phase (imports, artifact fetch,
+  unpickle, first predict, ...)
+- Standard library only, so it is safe to import before anything heavy
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Ordered per-phase timings for one container lifetime"""
+
+    def __init__(self):
+        self.phases = {}
+
+    def record(self, name, seconds):
+        self.phases[name] = round(self.phases.get(name, 0.0) + seconds, 4)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def report(self):
+        return {'phases': dict(self.phases), 'total_seconds': round(sum(self.phases.values()), 4)}
+
+    def log(self):
+        parts = ', '.join(f"{name}={seconds:.3f}s" for name, seconds in self.phases.items())
+        print(f"Startup profile: {parts} (total {self.report()['total_seconds']:.3f}s)")
@@ -0,0 +1,167 @@
+"""
+ExoHunt training scheduler
+- Runs independent training jobs concurrently, one process per job
+- Splits the core budget: at most `parallel` jobs run at once and each gets
+  `cores // parallel` threads, which the job applies to its learner so
+  n_jobs=-1 models do not oversubscribe the machine
+- Enforces a per-job wall-clock timeout by terminating the process
+- Workers are not daemonic, so jobs can start their own loky pools (CV
+  folds); workers still running when `run` exits are terminated
+- Memory-mapped .npy arguments are passed by file reference and reopened
+  read-only in the worker, instead of pickling a copy of their data per job
+"""
+
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+
+def is_catboost(model):
+    return type(model).__module__.startswith('catboost')
+
+
+def iter_learners(model):
+    """`model` and every learner of a stacking / voting ensemble, unfitted and fitted copies"""
+    yield model
+    nested = [est for _, est in getattr(model, 'estimators', None) or [] if hasattr(est, 'get_params')]
+    nested += [est for est in getattr(model, 'named_estimators_', {}).values() if hasattr(est, 'get_params')]
+    for name in ('final_estimator', 'final_estimator_'):
+        if hasattr(getattr(model, name, None), 'get_params'):
+            nested.append(getattr(model, name))
+    for learner in nested:
+        yield from iter_learners(learner)
+
+
+def set_threads(model, threads):
+    """Point a learner's own parallelism (n_jobs / thread_count) at `threads`; True if it has any"""
+    native = False
+    for learner in iter_learners(model):
+        if is_catboost(learner):
+            if learner.is_fitted():
+                # Fitted CatBoost models refuse set_params; __setstate__ is how CatBoost itself
+                # restores params onto a fitted (unpickled) model, and leaves the trees alone
+                learner.__setstate__({'thread_count': threads})
+            else:
+                learner.set_params(thread_count=threads)
+            native = True
+            continue
+        params = {name: threads for name in learner.get_params(deep=True) if name.endswith('n_jobs')}
+        if params:
+            learner.set_params(**params)
+            native = True
+    return native
+
+
+class SharedArray:
+    """File reference to a whole-file .npy memmap; reopened with mmap_mode='r' in the worker"""
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def open(self):
+        return np.load(self.filename, mmap_mode='r')
+
+
+def by_reference(value):
+    """SharedArray for a memmap opened from a whole .npy file (e.g. FeatureCache.share), else `value`"""
+    if isinstance(value, np.memmap) and isinstance(value.base, mmap.mmap) and str(value.filename).endswith('.npy'):
+        return SharedArray(value.filename)
+    return value
+
+
+def _run_job(conn, fn, args, threads):
+    from threadpoolctl import threadpool_limits
+
+    args = [arg.open() if isinstance(arg, SharedArray) else arg for arg in args]
+    if fn.__module__ == '__mp_main__':
+        # Script-level functions (train.py run as __main__) cannot be imported by the
+        # job's own loky workers; ship them by value instead
+        try:
+            import cloudpickle  # joblib >= 1.5 depends on it
+        except ImportError:
+            from joblib.externals import cloudpickle
+        cloudpickle.register_pickle_by_value(sys.modules['__mp_main__'])
+    # BLAS / OpenMP pools inside the job respect its share of the budget too
+    with threadpool_limits(threads):
+        try:
+            conn.send(('ok', fn(*args, threads)))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+        finally:
+            # Workers exit via os._exit (no atexit), so stop the job's loky pool here
+            from joblib.externals.loky import get_reusable_executor
+            get_reusable_executor().shutdown(wait=True)
+    conn.close()
+
+
+class JobScheduler:
+    """Process-per-job scheduler with a shared core budget and per-job timeouts"""
+
+    def __init__(self, cores=None, parallel=None, timeout=None, poll_interval=0.05):
+        self.cores = max(1, cores or os.cpu_count() or 1)
+        self.parallel = max(1, min(parallel or max(1, self.cores // 2), self.cores))
+        self.threads = max(1, self.cores // self.parallel)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._context = multiprocessing.get_context('spawn')
+
+    def run(self, jobs, on_done=None):
+        """
+        Run {name: (fn, args)}; each job is called as fn(*args, threads).
+
+        Returns {name: {'status': 'ok' | 'error' | 'timeout', 'result' | 'error', 'seconds'}}.
+        `on_done(name, outcome)` is called as each job finishes.
+        """
+        queue = list(jobs.items())
+        running = {}
+        outcomes = {}
+
+        def finish(name, outcome):
+            process, conn, started = running.pop(name)
+            outcome['seconds'] = round(time.perf_counter() - started, 3)
+            conn.close()
+            process.join(timeout=1)
+            outcomes[name] = outcome
+            if on_done:
+                on_done(name, outcome)
+
+        try:
+            while queue or running:
+                while queue and len(running) < self.parallel:
+                    name, (fn, args) = queue.pop(0)
+                    receiver, sender = self._context.Pipe(duplex=False)
+                    # Non-daemonic: joblib falls back to n_jobs=1 inside daemonic processes
+                    process = self._context.Process(
+                        target=_run_job, args=(sender, fn, [by_reference(arg) for arg in args], self.threads)
+                    )
+                    process.start()
+                    sender.close()
+                    running[name] = (process, receiver, time.perf_counter())
+
+                for name, (process, conn, started) in list(running.items()):
+                    if conn.poll():
+                        try:
+                            status, payload = conn.recv()
+                        except EOFError:
+                            status, payload = 'error', f"worker exited with code {process.exitcode}"
+                        key = 'result' if status == 'ok' else 'error'
+                        finish(name, {'status': status, key: payload})
+                    elif not process.is_alive():
+                        finish(name, {'status': 'error', 'error': f"worker exited with code {process.exitcode}"})
+                    elif self.timeout and time.perf_counter() - started > self.timeout:
+                        process.terminate()
+                        finish(name, {'status': 'timeout', 'error': f"exceeded {self.timeout:.0f}s"})
+
+                time.sleep(self.poll_interval)
+        finally:
+            # An interrupted run must not leave (non-daemonic) workers behind
+            for process, conn, _ in running.values():
+                process.terminate()
+                process.join(timeout=1)
+                conn.close()
+
+        return outcomes
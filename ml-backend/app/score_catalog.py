@@ -0,0 +1,200 @@
+"""
+ExoHunt offline catalog scorer
+- Scores unified_exoplanets.csv or any Kepler / K2 / TESS archive export
+  (CSV or Parquet) without going through the HTTP API
+- Chunks are read in the parent and scored by a process pool; every worker
+  loads the model, scaler and metadata once through its initializer
+- Writes CSV or Parquet and reports throughput in rows/s
+
+Usage:
+    python app/score_catalog.py data/processed/unified_exoplanets.csv -o scores.parquet
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.catalog import ID_COLUMNS, base_matrix, detect_layout, is_parquet, iter_chunks, layout_columns, read_header
+from app.model_store import MANIFEST_FILE, METADATA_FILE, MODEL_FILE, SCALER_FILE, LocalFetcher, ModelStore
+from app.parallelism import default_cores
+from app.scheduler import is_catboost, iter_learners, set_threads
+
+OUTPUT_COLUMNS = ['row', 'object_id', 'is_exoplanet', 'probability_exoplanet']
+
+# Per-worker state, populated by init_worker
+_predictor = None
+_feature_names = None
+
+
+def single_threaded(model):
+    """Pin every nested learner to 1 thread; parallelism comes from the process pool"""
+    if hasattr(model, 'get_params'):
+        set_threads(model, 1)
+        for learner in iter_learners(model):
+            if is_catboost(learner):
+                # CatBoost predicts on every core unless thread_count is passed per call
+                for method in ('predict', 'predict_proba'):
+                    setattr(learner, method, partial(getattr(type(learner), method), learner, thread_count=1))
+    return model
+
+
+def init_worker(model_dir):
+    """Process-pool initializer: load the model, scaler and metadata once per worker"""
+    global _predictor, _feature_names
+    import joblib
+    from threadpoolctl import threadpool_limits
+    from app.inference import EnsemblePredictor
+
+    threadpool_limits(1)
+    model_dir = Path(model_dir)
+    model = single_threaded(joblib.load(model_dir / MODEL_FILE))
+    scaler = joblib.load(model_dir / SCALER_FILE)
+    with open(model_dir / METADATA_FILE) as f:
+        metadata = json.load(f)
+
+    _predictor = EnsemblePredictor.from_metadata(model, scaler, metadata)
+    _feature_names = metadata['feature_names']
+
+
+def score_chunk(base):
+    """Score an (n, 9) base-feature chunk; rows with missing inputs get NaN"""
+    from app.features import compute_features
+
+    valid = np.isfinite(base).all(axis=1)
+    probabilities = np.full(len(base), np.nan)
+    labels = np.zeros(len(base), dtype=bool)
+    if valid.any():
+        chunk_labels, chunk_proba = _predictor.predict(compute_features(base[valid], _feature_names))
+        probabilities[valid] = chunk_proba[:, 1]
+        labels[valid] = chunk_labels
+    return labels, probabilities, valid
+
+
+def verify_artifacts(model_dir):
+    """Check artifacts against manifest.json when one is present"""
+    if not (Path(model_dir) / MANIFEST_FILE).exists():
+        print(f"⚠️  No {MANIFEST_FILE} in {model_dir}, loading artifacts unverified")
+        return None
+    store = ModelStore(model_dir, LocalFetcher(model_dir))
+    store.resolve()
+    return store.manifest[MODEL_FILE][:12]
+
+
+class ScoreWriter:
+    """Append scored chunks to a CSV or Parquet file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.parquet = is_parquet(self.path)
+        self._writer = None
+        self._started = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            frame.to_csv(self.path, mode='a' if self._started else 'w', header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def score_catalog(input_path, output_path, model_dir, workers=None, chunk_size=20000):
+    """Score `input_path` into `output_path`; returns a throughput summary"""
+    workers = workers or default_cores()
+    fmt = 'parquet' if is_parquet(input_path) else 'csv'
+    header = read_header(input_path, fmt)
+    layout = detect_layout(header)
+    columns = layout_columns(layout, header)
+    id_col = ID_COLUMNS[layout] if ID_COLUMNS[layout] in columns else None
+
+    model_version = verify_artifacts(model_dir)
+    print(f"🔭 Scoring {input_path} ({fmt}, {layout} layout) with {workers} workers")
+    if model_version:
+        print(f"   Model version: {model_version}")
+
+    writer = ScoreWriter(output_path)
+    rows = 0
+    scored = 0
+    start = time.perf_counter()
+
+    def drain(pending):
+        nonlocal rows, scored
+        row_offset, ids, future = pending.popleft()
+        labels, probabilities, valid = future.result()
+        writer.write(pd.DataFrame({
+            'row': np.arange(row_offset, row_offset + len(labels)),
+            'object_id': ids if ids is not None else pd.Series([None] * len(labels), dtype=object),
+            'is_exoplanet': pd.array(np.where(valid, labels, pd.NA), dtype='boolean'),
+            'probability_exoplanet': probabilities,
+        })[OUTPUT_COLUMNS])
+        rows += len(labels)
+        scored += int(valid.sum())
+        elapsed = time.perf_counter() - start
+        print(f"   {rows:>10,} rows | {rows / elapsed:>10,.0f} rows/s")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(str(model_dir),)) as pool:
+            # Bounded window keeps memory flat while every worker stays busy
+            pending = deque()
+            row_offset = 0
+            for chunk in iter_chunks(input_path, fmt, chunk_size, columns):
+                ids = chunk[id_col].astype(str).to_numpy() if id_col else None
+                pending.append((row_offset, ids, pool.submit(score_chunk, base_matrix(chunk, layout))))
+                row_offset += len(chunk)
+                if len(pending) >= 2 * workers:
+                    drain(pending)
+            while pending:
+                drain(pending)
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    summary = {
+        'rows': rows,
+        'scored': scored,
+        'skipped': rows - scored,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds, 1) if seconds else 0.0,
+        'model_version': model_version,
+    }
+    print(f"\n✅ Scored {scored:,} of {rows:,} rows in {seconds:.2f}s "
+          f"({summary['rows_per_second']:,.0f} rows/s) -> {output_path}")
+    if summary['skipped']:
+        print(f"   ⚠️  {summary['skipped']:,} rows had missing inputs and were left unscored")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score an exoplanet catalog offline with the advanced model")
+    parser.add_argument('input', help="CSV / Parquet file in unified, Kepler, K2 or TESS column layout")
+    parser.add_argument('-o', '--output', default='data/processed/scores.csv',
+                        help="Output file; a .parquet suffix writes Parquet")
+    parser.add_argument('--model-dir', default='models/trained')
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: every core this process may use)")
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    args = parser.parse_args()
+
+    score_catalog(args.input, args.output, args.model_dir, workers=args.workers, chunk_size=args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
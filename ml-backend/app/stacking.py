@@ -0,0 +1,196 @@
+"""
+ExoHunt cached stacking trainer
+- Fits each base learner once per fold of a fixed fold plan and caches its
+  out-of-fold positive-class probabilities (plus the full-data fit) on disk,
+  keyed on the training data, the fold plan and the learner's parameters
+- The meta-model is fitted on the cached out-of-fold matrix, so swapping it
+  (or re-running with unchanged data) does not refit any base learner
+- Outer CV scores the meta-model on the same fold plan over the cached
+  matrix instead of refitting the whole stack per outer fold
+- An optional resampler (e.g. SMOTE) is applied to each fold's training
+  rows only, once per fold, so validation rows are never synthetic
+- `fit()` returns a regular fitted StackingClassifier (estimators_,
+  final_estimator_, stack_method_, classes_), so serving and the compiled
+  engine treat it like any other stack
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import StackingClassifier
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import LabelEncoder
+from sklearn.utils import Bunch
+
+from app.parallelism import ParallelPlan, loky_pool, pinned
+
+DEFAULT_CACHE_DIR = Path(os.getenv("EXOHUNT_STACKING_CACHE", "data/cache/stacking"))
+
+# Parameters that change how fast a learner trains, not what it learns
+RUNTIME_PARAMS = ('n_jobs', 'thread_count', 'verbose', 'verbosity', 'silent')
+
+
+def fold_plan(y, n_splits=5, random_state=42):
+    """Shuffled stratified (train_idx, val_idx) folds, fixed by `random_state`"""
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return list(cv.split(np.zeros(len(y)), y))
+
+
+def plan_key(X, y, folds):
+    """Key of the training data plus the fold assignment"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.int64).tobytes())
+    for _, val_idx in folds:
+        digest.update(np.asarray(val_idx, dtype=np.int64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def learner_key(estimator):
+    """Key of a learner's class and hyperparameters (thread counts and verbosity excluded)"""
+    params = {
+        name: repr(value) for name, value in estimator.get_params(deep=False).items()
+        if not name.endswith(RUNTIME_PARAMS)
+    }
+    spec = {'class': type(estimator).__name__, 'params': params}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _fit_fold(estimator, X_fit, y_fit, X_val):
+    estimator.fit(X_fit, y_fit)
+    return estimator.predict_proba(X_val)[:, 1]
+
+
+def _fit_full(estimator, X, y):
+    return estimator.fit(X, y)
+
+
+class StackingTrainer:
+    """Stacking with base-learner out-of-fold predictions computed once per fold plan"""
+
+    def __init__(self, estimators, cache_dir=DEFAULT_CACHE_DIR, plan=None, sampler=None):
+        self.estimators = list(estimators)
+        self.cache_dir = Path(cache_dir)
+        self.plan = plan or ParallelPlan()
+        self.sampler = sampler
+        self.sampling = learner_key(sampler) if sampler is not None else 'none'
+        self.hits = 0
+        self.misses = 0
+        self.resample_seconds = 0.0
+        self._ready = set()
+
+    def _entry(self, plan, estimator):
+        return self.cache_dir / plan / self.sampling / learner_key(estimator)
+
+    def _fit_sets(self, X, y, folds):
+        """(X_fit, y_fit) for every fold's training rows and for the full split, resampled if configured"""
+        rows = [train_idx for train_idx, _ in folds] + [np.arange(len(y))]
+        if self.sampler is None:
+            return [(X[idx], y[idx]) for idx in rows]
+        
+        threads = self.plan.single(f'{type(self.sampler).__name__} resampling')
+        start = time.perf_counter()
+        with pinned(threads):
+            sets = [self.plan.apply(clone(self.sampler), threads).fit_resample(X[idx], y[idx]) for idx in rows]
+        seconds = time.perf_counter() - start
+        self.resample_seconds += seconds
+        print(f"   ⚖️  Resampled {len(folds)} training folds + full split in {seconds:.2f}s "
+              f"({len(y)} -> {len(sets[-1][1])} rows)")
+        return sets
+
+    def _prepare(self, X, y, folds):
+        """Fit whatever is not cached yet (all folds and full fits in one parallel pass)"""
+        plan = plan_key(X, y, folds)
+        if plan in self._ready:
+            return plan
+        missing = []
+        for name, estimator in self.estimators:
+            entry = self._entry(plan, estimator)
+            if (entry / 'oof.npy').exists() and (entry / 'full.pkl').exists():
+                self.hits += 1
+                print(f"   ♻️  {name}: cached out-of-fold predictions")
+            else:
+                self.misses += 1
+                missing.append((name, estimator, entry))
+
+        if missing:
+            start = time.perf_counter()
+            *fold_sets, full_set = self._fit_sets(X, y, folds)
+            outer, inner = self.plan.split('Stacking base-learner fits', len(missing) * (len(folds) + 1))
+            tasks = []
+            for _, estimator, _ in missing:
+                estimator = self.plan.apply(clone(estimator), inner)
+                tasks += [delayed(_fit_fold)(clone(estimator), X_fit, y_fit, X[val_idx])
+                          for (X_fit, y_fit), (_, val_idx) in zip(fold_sets, folds)]
+                tasks.append(delayed(_fit_full)(clone(estimator), *full_set))
+            with pinned(inner), loky_pool(outer, inner):
+                outputs = Parallel(n_jobs=outer)(tasks)
+
+            per_learner = len(folds) + 1
+            for i, (name, _, entry) in enumerate(missing):
+                fold_probas = outputs[i * per_learner:(i + 1) * per_learner - 1]
+                oof = np.empty(len(y), dtype=np.float64)
+                for (_, val_idx), proba in zip(folds, fold_probas):
+                    oof[val_idx] = proba
+                entry.mkdir(parents=True, exist_ok=True)
+                joblib.dump(outputs[(i + 1) * per_learner - 1], entry / 'full.pkl')
+                # oof.npy is written last; its presence (with full.pkl) marks a complete entry
+                np.save(entry / 'oof.npy', oof)
+                print(f"   ✅ {name}: {len(folds)} folds + full fit")
+            print(f"   Fitted {len(missing)} base learner(s) in {time.perf_counter() - start:.1f}s")
+        self._ready.add(plan)
+        return plan
+
+    def oof_matrix(self, X, y, folds):
+        """(n_samples, n_learners) out-of-fold positive-class probabilities"""
+        plan = self._prepare(X, y, folds)
+        return np.column_stack([
+            np.load(self._entry(plan, estimator) / 'oof.npy') for _, estimator in self.estimators
+        ])
+
+    def fitted_learners(self, X, y, folds):
+        """Base learners fitted on all of X"""
+        plan = self._prepare(X, y, folds)
+        return [joblib.load(self._entry(plan, estimator) / 'full.pkl') for _, estimator in self.estimators]
+
+    def fit(self, X, y, final_estimator, folds):
+        """Fitted StackingClassifier: cached base learners plus `final_estimator` fitted on the OOF matrix"""
+        y = np.asarray(y)
+        oof = self.oof_matrix(X, y, folds)
+        learners = self.fitted_learners(X, y, folds)
+
+        names = [name for name, _ in self.estimators]
+        stacking = StackingClassifier(
+            estimators=list(zip(names, learners)),
+            final_estimator=final_estimator,
+            cv='prefit'
+        )
+        # Set the fitted attributes StackingClassifier.fit would; its 'prefit' path would
+        # re-score every base learner on X just to build the matrix cached above
+        stacking._label_encoder = LabelEncoder().fit(y)
+        stacking.classes_ = stacking._label_encoder.classes_
+        stacking.estimators_ = learners
+        stacking.named_estimators_ = Bunch(**dict(zip(names, learners)))
+        stacking.stack_method_ = ['predict_proba'] * len(learners)
+        meta = self.plan.apply(clone(final_estimator), self.plan.single('Stacking meta-model'))
+        stacking.final_estimator_ = meta.fit(oof, stacking._label_encoder.transform(y))
+        return stacking
+
+    def cross_validate(self, X, y, final_estimator, folds, scoring=f1_score):
+        """Per-fold `scoring` of the meta-model over the cached OOF matrix, on the same fold plan"""
+        y = np.asarray(y)
+        oof = self.oof_matrix(X, y, folds)
+        scores = []
+        threads = self.plan.single('Stacking meta-model CV')
+        for train_idx, val_idx in folds:
+            meta = self.plan.apply(clone(final_estimator), threads).fit(oof[train_idx], y[train_idx])
+            scores.append(scoring(y[val_idx], meta.predict(oof[val_idx])))
+        return np.array(scores)
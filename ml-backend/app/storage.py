@@ -0,0 +1,124 @@
+"""
+ExoHunt dataset storage
+- Parquet (Arrow) is the primary on-disk format for raw and processed tables:
+  typed float columns, int8 labels and dictionary-encoded `source` /
+  `disposition` categoricals
+- Reads project columns, so trainers load only the features they use
+- CSV stays available as an export (and as a fallback for older data dirs)
+
+Usage:
+    python app/storage.py data/processed/unified_exoplanets.csv      # CSV -> Parquet
+    python app/storage.py data/processed/unified_exoplanets.parquet  # Parquet -> CSV
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = ['source', 'disposition', 'koi_disposition', 'tfopwg_disp']
+LABEL_COLUMN = 'is_exoplanet'
+METADATA_KEY = b'exohunt'
+
+
+def parquet_path(path):
+    return Path(path).with_suffix('.parquet')
+
+
+def csv_path(path):
+    return Path(path).with_suffix('.csv')
+
+
+def resolve(path):
+    """Prefer the Parquet copy of `path`, falling back to CSV"""
+    for candidate in (parquet_path(path), csv_path(path)):
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"Neither {parquet_path(path)} nor {csv_path(path)} exists")
+
+
+def typed(df, float_dtype='float64'):
+    """Cast a frame to the storage schema: float numerics, int8 label, categorical text labels"""
+    df = df.copy()
+    for col in df.columns:
+        if col == LABEL_COLUMN:
+            df[col] = df[col].astype(np.int8)
+        elif col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype('category')
+        elif pd.api.types.is_float_dtype(df[col]):
+            df[col] = df[col].astype(float_dtype)
+    return df
+
+
+def write_table(df, path, float_dtype='float64', metadata=None, export_csv=False):
+    """
+    Write `df` as Parquet (plus a CSV export if requested); returns the Parquet path.
+
+    `metadata` is a JSON-serialisable dict stored in the Parquet footer.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = parquet_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(typed(df, float_dtype), preserve_index=False)
+    if metadata:
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            METADATA_KEY: json.dumps(metadata).encode(),
+        })
+    pq.write_table(table, path)
+    if export_csv:
+        df.to_csv(csv_path(path), index=False)
+    return path
+
+
+def read_metadata(path):
+    """ExoHunt metadata stored by write_table, or {} if there is none"""
+    import pyarrow.parquet as pq
+
+    path = parquet_path(path)
+    if not path.exists():
+        return {}
+    schema_metadata = pq.read_schema(path).metadata or {}
+    return json.loads(schema_metadata.get(METADATA_KEY, b'{}'))
+
+
+def read_table(path, columns=None):
+    """
+    Load a dataset, reading only `columns` (those missing from the file are skipped).
+
+    Reads the Parquet copy when present, otherwise the CSV.
+    """
+    source = resolve(path)
+    if source.suffix == '.parquet':
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(source).names)
+            columns = [c for c in columns if c in available]
+        return pd.read_parquet(source, columns=columns)
+
+    usecols = None if columns is None else (lambda c: c in set(columns))
+    return pd.read_csv(source, usecols=usecols, low_memory=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert ExoHunt datasets between CSV and Parquet")
+    parser.add_argument('paths', nargs='+')
+    args = parser.parse_args()
+
+    for path in map(Path, args.paths):
+        if path.suffix == '.parquet':
+            read_table(path).to_csv(csv_path(path), index=False)
+            print(f"💾 {path} -> {csv_path(path)}")
+        else:
+            df = pd.read_csv(path, low_memory=False)
+            out = write_table(df, path)
+            print(f"💾 {path} ({path.stat().st_size / 1e6:.2f} MB) -> {out} ({out.stat().st_size / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
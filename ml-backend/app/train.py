@@ -5,7 +5,8 @@ Tests MULTIPLE algorithms and selects the BEST performer
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import (
     classification_report, 
@@ -33,25 +34,55 @@ from xgboost import XGBClassifier
 from lightgbm import LGBMClassifier
 from catboost import CatBoostClassifier
 
+import argparse
 import joblib
 import json
 from pathlib import Path
+import sys
+import time
 import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
+from joblib import Parallel, delayed
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.boosting import DEFAULT_PATIENCE, booster_kind, early_stop_fit, only_rows_added, row_hashes, set_rounds
+from app.feature_cache import FeatureCache
+from app.parallelism import ParallelPlan, default_cores, loky_pool, pinned
+from app.scheduler import JobScheduler, set_threads
+from app.storage import read_table, resolve
+
+DATA_PATH = Path('data/processed/kepler_processed.parquet')
+MODELS_DIR = Path('models/trained')
+
+# Row fingerprints of the last run's train / test split (for warm starts)
+SPLIT_FILE = 'training_rows.npz'
+
+# Feature columns
+FEATURE_COLUMNS = [
+    'koi_period',      # Orbital period (days)
+    'koi_duration',    # Transit duration (hours)
+    'koi_depth',       # Transit depth (ppm)
+    'koi_prad',        # Planetary radius (Earth radii)
+    'koi_teq',         # Equilibrium temperature (K)
+    'koi_insol',       # Insolation flux (Earth flux)
+    'koi_steff',       # Stellar effective temperature (K)
+    'koi_slogg',       # Stellar surface gravity
+    'koi_srad'         # Stellar radius (Solar radii)
+]
+
 
 def load_data():
     """Load preprocessed Kepler data"""
     print("📂 Loading data...")
     
-    data_path = Path('data/processed/kepler_processed.csv')
-    if not data_path.exists():
+    # Parquet copy if present, otherwise CSV; only the columns the models use
+    try:
+        df = read_table(DATA_PATH, columns=FEATURE_COLUMNS + ['is_exoplanet'])
+    except FileNotFoundError:
         raise FileNotFoundError("❌ Processed data not found! Run download_data.py first.")
     
-    df = pd.read_csv(data_path)
-    
     print(f"✅ Loaded {len(df)} samples")
     print(f"   - Exoplanets: {df['is_exoplanet'].sum()}")
     print(f"   - Non-Exoplanets: {len(df) - df['is_exoplanet'].sum()}")
@@ -63,18 +94,7 @@ def prepare_features(df):
     """Prepare feature matrix and target vector"""
     print("\n🔧 Preparing features...")
     
-    # Feature columns
-    feature_columns = [
-        'koi_period',      # Orbital period (days)
-        'koi_duration',    # Transit duration (hours)
-        'koi_depth',       # Transit depth (ppm)
-        'koi_prad',        # Planetary radius (Earth radii)
-        'koi_teq',         # Equilibrium temperature (K)
-        'koi_insol',       # Insolation flux (Earth flux)
-        'koi_steff',       # Stellar effective temperature (K)
-        'koi_slogg',       # Stellar surface gravity
-        'koi_srad'         # Stellar radius (Solar radii)
-    ]
+    feature_columns = FEATURE_COLUMNS
     
     X = df[feature_columns].values
     y = df['is_exoplanet'].values
@@ -85,6 +105,22 @@ def prepare_features(df):
     return X, y, feature_columns
 
 
+def load_features(cache):
+    """Feature matrix and labels, memory-mapped from the feature cache when the dataset is unchanged"""
+    try:
+        data_path = resolve(DATA_PATH)
+    except FileNotFoundError:
+        raise FileNotFoundError("❌ Processed data not found! Run download_data.py first.")
+    
+    X, y, feature_names, hit = cache.get_or_build(
+        data_path, FEATURE_COLUMNS, lambda: prepare_features(load_data())[:2]
+    )
+    if hit:
+        print(f"⚡ Loaded cached feature matrix {X.shape} for {data_path}")
+    
+    return X, y, feature_names
+
+
 def get_all_models():
     """Define all ML models to test"""
     models = {
@@ -185,60 +221,303 @@ def get_all_models():
     return models
 
 
-def train_and_evaluate_all(X_train, y_train, X_test, y_test, models):
-    """Train all models and compare performance"""
+def fit_model(model, X, y, early_stopping=None):
+    """Fit `model`; with a patience, boosted models early-stop on an internal split. Returns rounds kept or None"""
+    if not early_stopping or booster_kind(model) is None:
+        model.fit(X, y)
+        return None
+    rounds = early_stop_fit(model, X, y, patience=early_stopping)
+    # Clones (CV folds, refits) train with the budget early stopping found
+    set_rounds(model, rounds)
+    return rounds
+
+
+def fit_and_score(name, model, X_train, y_train, X_test, y_test, early_stopping, threads):
+    """Fit one model and compute its metrics; runs in a scheduler worker with `threads` cores"""
+    # Learners with their own parallelism use the share directly, the rest spread CV folds over it
+    native_threads = set_threads(model, threads)
+    
+    # Train model
+    start = time.perf_counter()
+    rounds = fit_model(model, X_train, y_train, early_stopping)
+    fit_time = time.perf_counter() - start
+    
+    # Make predictions
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+    
+    # Calculate metrics
+    accuracy = accuracy_score(y_test, y_pred)
+    precision = precision_score(y_test, y_pred, zero_division=0)
+    recall = recall_score(y_test, y_pred, zero_division=0)
+    f1 = f1_score(y_test, y_pred, zero_division=0)
+    
+    # ROC-AUC (if model supports predict_proba)
+    try:
+        y_proba = model.predict_proba(X_test)[:, 1]
+        roc_auc = roc_auc_score(y_test, y_proba)
+    except:
+        roc_auc = 0.0
+    
+    # Cross-validation (fold workers split the share; BLAS inside them is pinned to match)
+    cv_jobs = 1 if native_threads else threads
+    with pinned(max(1, threads // cv_jobs)), loky_pool(cv_jobs, max(1, threads // cv_jobs)):
+        cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='accuracy', n_jobs=cv_jobs)
+    
+    # Saved models use all cores again when serving
+    set_threads(model, -1)
+    
+    result = {
+        'Model': name,
+        'Accuracy': accuracy,
+        'Precision': precision,
+        'Recall': recall,
+        'F1 Score': f1,
+        'ROC-AUC': roc_auc,
+        'CV Mean': cv_scores.mean(),
+        'CV Std': cv_scores.std(),
+        'Fit Time (s)': fit_time,
+        'Predict Time (s)': predict_time,
+        'model_object': model
+    }
+    if early_stopping:
+        result['Rounds'] = rounds
+    return result
+
+
+def make_folds(y, n_splits=5):
+    """Stratified CV splits, computed once and shared by every model"""
+    return list(StratifiedKFold(n_splits=n_splits).split(np.zeros(len(y)), y))
+
+
+def _positive_proba(model, X):
+    if hasattr(model, 'predict_proba'):
+        return model.predict_proba(X)[:, 1]
+    return model.predict(X).astype(float)
+
+
+def _fit_fold(model, X_train, y_train, train_idx, val_idx, X_test, early_stopping):
+    start = time.perf_counter()
+    rounds = fit_model(model, X_train[train_idx], y_train[train_idx], early_stopping)
+    fit_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    test_proba = _positive_proba(model, X_test)
+    predict_time = time.perf_counter() - start
+    
+    return _positive_proba(model, X_train[val_idx]), test_proba, fit_time, predict_time, rounds
+
+
+def fit_and_score_oof(name, model, X_train, y_train, X_test, y_test, folds, early_stopping, threads):
+    """
+    Evaluate one model from a single set of fold fits (runs in a scheduler worker).
+    
+    CV metrics come from out-of-fold predictions and holdout metrics from the
+    fold models' averaged test probabilities; no extra full refit happens here.
+    """
+    native_threads = set_threads(model, threads)
+    
+    fold_jobs = 1 if native_threads else min(threads, len(folds))
+    with pinned(max(1, threads // fold_jobs)), loky_pool(fold_jobs, max(1, threads // fold_jobs)):
+        fold_results = Parallel(n_jobs=fold_jobs)(
+            delayed(_fit_fold)(clone(model), X_train, y_train, train_idx, val_idx, X_test, early_stopping)
+            for train_idx, val_idx in folds
+        )
+    
+    # Out-of-fold predictions -> CV metrics
+    cv_scores = np.array([
+        accuracy_score(y_train[val_idx], oof_proba >= 0.5)
+        for (_, val_idx), (oof_proba, *_) in zip(folds, fold_results)
+    ])
+    
+    # Fold-averaged test probabilities -> holdout metrics
+    y_proba = np.mean([fold[1] for fold in fold_results], axis=0)
+    y_pred = (y_proba >= 0.5).astype(int)
+    try:
+        roc_auc = roc_auc_score(y_test, y_proba)
+    except ValueError:
+        roc_auc = 0.0
+    
+    result = {
+        'Model': name,
+        'Accuracy': accuracy_score(y_test, y_pred),
+        'Precision': precision_score(y_test, y_pred, zero_division=0),
+        'Recall': recall_score(y_test, y_pred, zero_division=0),
+        'F1 Score': f1_score(y_test, y_pred, zero_division=0),
+        'ROC-AUC': roc_auc,
+        'CV Mean': cv_scores.mean(),
+        'CV Std': cv_scores.std(),
+        'Fit Time (s)': float(np.mean([r[2] for r in fold_results])),
+        'Predict Time (s)': float(np.mean([r[3] for r in fold_results])),
+        # Only the selected model is refit on the full training split
+        'model_object': None
+    }
+    if early_stopping:
+        rounds = [fold[4] for fold in fold_results if fold[4] is not None]
+        result['Rounds'] = int(np.mean(rounds)) if rounds else None
+    return result
+
+
+def refit_best(model, X_train, y_train, early_stopping=None, threads=None):
+    """Fit the selected model on the full training split (OOF evaluation only keeps fold fits)"""
+    print("🔁 Refitting best model on the full training split...")
+    threads = threads or default_cores()
+    set_threads(model, threads)
+    start = time.perf_counter()
+    with pinned(threads):
+        rounds = fit_model(model, X_train, y_train, early_stopping)
+    # Saved models use all cores again when serving
+    set_threads(model, -1)
+    print(f"   ✅ Refit in {time.perf_counter() - start:.1f}s" + (f" ({rounds} rounds)\n" if rounds else "\n"))
+    return model, rounds
+
+
+def train_and_evaluate_all(X_train, y_train, X_test, y_test, models, cores=None, parallel=None, timeout=None,
+                           evaluation='oof', early_stopping=None):
+    """
+    Train all models concurrently within a core budget and compare performance.
+    
+    evaluation='oof' scores each model from one shared set of 5 fold fits;
+    'holdout' fits on the full split and runs a separate 5-fold CV (6 fits per model).
+    With `early_stopping` (patience), boosted models stop on an internal validation split.
+    """
     print("\n" + "🔥"*30)
     print(" "*8 + "TRAINING ALL ML ALGORITHMS")
     print("🔥"*30 + "\n")
     
-    results = []
+    scheduler = JobScheduler(cores=cores, parallel=parallel, timeout=timeout)
+    print(f"⚙️  {scheduler.cores} cores: {scheduler.parallel} models at a time x {scheduler.threads} threads each"
+          + (f", {timeout:.0f}s limit per model\n" if timeout else "\n"))
+    
+    results = {}
+    
+    def report(name, outcome):
+        if outcome['status'] == 'ok':
+            result = outcome['result']
+            results[name] = result
+            print(f"   ✅ {name}: Accuracy: {result['Accuracy']:.4f} | F1: {result['F1 Score']:.4f} | "
+                  f"ROC-AUC: {result['ROC-AUC']:.4f} | fit {result['Fit Time (s)']:.1f}s | "
+                  f"predict {result['Predict Time (s)']:.3f}s")
+        elif outcome['status'] == 'timeout':
+            print(f"   ⏱️  {name}: timed out ({outcome['error']})")
+        else:
+            print(f"   ❌ {name} failed: {outcome['error']}")
+    
+    if evaluation == 'oof':
+        folds = make_folds(y_train)
+        print(f"🧩 Out-of-fold evaluation on {len(folds)} shared stratified folds\n")
+        jobs = {
+            name: (fit_and_score_oof, (name, model, X_train, y_train, X_test, y_test, folds, early_stopping))
+            for name, model in models.items()
+        }
+    else:
+        jobs = {
+            name: (fit_and_score, (name, model, X_train, y_train, X_test, y_test, early_stopping))
+            for name, model in models.items()
+        }
+    scheduler.run(jobs, on_done=report)
     
-    for name, model in models.items():
-        print(f"🤖 Training {name}...")
+    # Keep the zoo's order regardless of finishing order
+    return [results[name] for name in models if name in results]
+
+
+def fit_subset_score(name, model, X_fit, y_fit, X_val, y_val, early_stopping, threads):
+    """One racing rung: fit on a data subset and score F1 on the racing validation split"""
+    set_threads(model, threads)
+    start = time.perf_counter()
+    fit_model(model, X_fit, y_fit, early_stopping)
+    fit_time = time.perf_counter() - start
+    f1 = f1_score(y_val, model.predict(X_val), zero_division=0)
+    return {'F1 Score': f1, 'fit_time': fit_time}
+
+
+def successive_halving(models, X_train, y_train, eta=3, min_survivors=2, min_rows=200,
+                       cores=None, parallel=None, timeout=None, early_stopping=None):
+    """
+    Race the zoo on growing subsets of the training split, keeping the best 1/eta by F1 each rung.
+    
+    Returns (survivor names, per-model racing history). Rung sizes grow by `eta` and
+    end at 1/eta of the racing pool, so the survivors' full evaluation is the last rung.
+    """
+    print("\n" + "🏁"*30)
+    print(" "*8 + "SUCCESSIVE-HALVING MODEL SELECTION")
+    print("🏁"*30 + "\n")
+    
+    # Racing scores on a fixed stratified validation split, never on the test set
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=0.2, random_state=42, stratify=y_train
+    )
+    order = np.random.default_rng(42).permutation(len(y_fit))
+    
+    n_rungs = 0
+    remaining = len(models)
+    while remaining > min_survivors:
+        remaining = max(min_survivors, int(np.ceil(remaining / eta)))
+        n_rungs += 1
+    
+    scheduler = JobScheduler(cores=cores, parallel=parallel, timeout=timeout)
+    candidates = list(models)
+    history = {name: {'rungs': [], 'eliminated_at': None} for name in models}
+    
+    for rung in range(n_rungs):
+        size = min(len(y_fit), max(min_rows, len(y_fit) // eta ** (n_rungs - rung)))
+        idx = order[:size]
+        print(f"🏃 Rung {rung + 1}/{n_rungs}: {len(candidates)} models on {size} samples")
         
-        try:
-            # Train model
-            model.fit(X_train, y_train)
-            
-            # Make predictions
-            y_pred = model.predict(X_test)
-            
-            # Calculate metrics
-            accuracy = accuracy_score(y_test, y_pred)
-            precision = precision_score(y_test, y_pred, zero_division=0)
-            recall = recall_score(y_test, y_pred, zero_division=0)
-            f1 = f1_score(y_test, y_pred, zero_division=0)
-            
-            # ROC-AUC (if model supports predict_proba)
-            try:
-                y_proba = model.predict_proba(X_test)[:, 1]
-                roc_auc = roc_auc_score(y_test, y_proba)
-            except:
-                roc_auc = 0.0
-            
-            # Cross-validation
-            cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='accuracy', n_jobs=-1)
-            cv_mean = cv_scores.mean()
-            
-            results.append({
-                'Model': name,
-                'Accuracy': accuracy,
-                'Precision': precision,
-                'Recall': recall,
-                'F1 Score': f1,
-                'ROC-AUC': roc_auc,
-                'CV Mean': cv_mean,
-                'CV Std': cv_scores.std(),
-                'model_object': model
-            })
-            
-            print(f"   ✅ Accuracy: {accuracy:.4f} | F1: {f1:.4f} | ROC-AUC: {roc_auc:.4f}\n")
-            
-        except Exception as e:
-            print(f"   ❌ Failed: {str(e)}\n")
-            continue
-    
-    return results
+        outcomes = scheduler.run({
+            name: (fit_subset_score, (name, models[name], X_fit[idx], y_fit[idx], X_val, y_val, early_stopping))
+            for name in candidates
+        })
+        scores = {}
+        for name in candidates:
+            outcome = outcomes[name]
+            if outcome['status'] == 'ok':
+                scores[name] = outcome['result']['F1 Score']
+                history[name]['rungs'].append((size, scores[name], outcome['result']['fit_time']))
+            else:
+                # Failed or timed-out candidates are the first to go
+                scores[name] = -1.0
+                history[name]['rungs'].append((size, None, outcome['seconds']))
+        
+        keep = max(min_survivors, int(np.ceil(len(candidates) / eta)))
+        ranked = sorted(candidates, key=lambda name: scores[name], reverse=True)
+        for name in ranked:
+            f1 = scores[name]
+            marker = "✅" if name in ranked[:keep] else "❌"
+            print(f"   {marker} {name:<22} F1: {f1:.4f}" if f1 >= 0 else f"   {marker} {name:<22} failed")
+        for name in ranked[keep:]:
+            history[name]['eliminated_at'] = rung + 1
+        candidates = ranked[:keep]
+        print()
+    
+    return candidates, history
+
+
+def report_halving(history, results, n_train, n_folds=5):
+    """Print the final ranking and the fit time racing saved (eliminated models' full cost is extrapolated)"""
+    print("\n🏁 FINAL RANKING")
+    ranked = sorted(results, key=lambda r: r['F1 Score'], reverse=True)
+    for i, result in enumerate(ranked, 1):
+        print(f"   {i:>2}. {result['Model']:<22} F1: {result['F1 Score']:.4f} (full evaluation)")
+    eliminated = sorted(
+        (name for name, h in history.items() if h['eliminated_at']),
+        key=lambda name: (-history[name]['eliminated_at'], -(history[name]['rungs'][-1][1] or -1.0))
+    )
+    for i, name in enumerate(eliminated, len(ranked) + 1):
+        size, f1, _ = history[name]['rungs'][-1]
+        score = f"F1: {f1:.4f}" if f1 is not None else "failed"
+        print(f"   {i:>2}. {name:<22} {score} (dropped after rung {history[name]['eliminated_at']}, {size} samples)")
+    
+    racing = sum(fit_time for h in history.values() for _, _, fit_time in h['rungs'])
+    # Fit time scales roughly linearly with rows for a first-order estimate
+    fold_rows = n_train * (n_folds - 1) / n_folds
+    skipped = sum(
+        history[name]['rungs'][-1][2] * fold_rows / history[name]['rungs'][-1][0] * n_folds
+        for name in eliminated
+    )
+    print(f"\n💰 Racing spent {racing:.1f}s of fit time and skipped the full evaluation of "
+          f"{len(eliminated)} models (≈{skipped:.1f}s), saving ≈{skipped - racing:.1f}s")
 
 
 def display_results(results):
@@ -341,11 +620,11 @@ def evaluate_detailed(model, X_train, y_train, X_test, y_test, feature_names, mo
     }
 
 
-def save_model(model, scaler, metrics, feature_names, model_name, all_results):
+def save_model(model, scaler, metrics, feature_names, model_name, all_results, models_dir=MODELS_DIR):
     """Save best model and all results"""
     print("\n💾 Saving models and results...")
     
-    models_dir = Path('models/trained')
+    models_dir = Path(models_dir)
     models_dir.mkdir(parents=True, exist_ok=True)
     
     # Save best model
@@ -375,6 +654,82 @@ def save_model(model, scaler, metrics, feature_names, model_name, all_results):
     print(f"   ✅ Metadata saved: {metadata_path}")
 
 
+def save_split(X_train, y_train, X_test, y_test, models_dir=MODELS_DIR):
+    """Fingerprint the train / test rows so a later run can tell if only rows were added"""
+    np.savez(models_dir / SPLIT_FILE, train=row_hashes(X_train, y_train), test=row_hashes(X_test, y_test))
+
+
+def warm_start(X, y, feature_names, patience, models_dir=MODELS_DIR, threads=None):
+    """
+    Continue the previous run's boosted model on the current data, if only rows were added.
+    
+    Previous train / test rows keep their side of the split and new rows are split
+    80/20. The previous scaler is reused so the existing trees' thresholds stay valid.
+    Returns False (nothing written) when a warm start is not possible.
+    """
+    print("\n♨️  Warm start from the previous run...")
+    paths = [models_dir / name for name in ('exoplanet_model.pkl', 'scaler.pkl', 'model_metadata.json', SPLIT_FILE)]
+    if not all(path.exists() for path in paths):
+        print("   ⚠️  No previous run to warm-start from")
+        return False
+    
+    previous = joblib.load(paths[0])
+    with open(paths[2]) as f:
+        metadata = json.load(f)
+    if booster_kind(previous) is None:
+        print(f"   ⚠️  Previous best model ({metadata['best_model']}) is not a boosted model")
+        return False
+    if metadata['feature_names'] != list(feature_names):
+        print("   ⚠️  Feature columns changed since the previous run")
+        return False
+    
+    split = np.load(paths[3])
+    hashes = row_hashes(X, y)
+    if not only_rows_added(np.concatenate([split['train'], split['test']]), hashes):
+        print("   ⚠️  Rows were changed or removed since the previous run")
+        return False
+    
+    in_test = np.isin(hashes, split['test'])
+    new_idx = np.flatnonzero(~in_test & ~np.isin(hashes, split['train']))
+    if len(new_idx) == 0:
+        print("   ♻️  No new rows since the previous run, nothing to do")
+        return True
+    
+    # New rows are split 80/20 like a full run (stratified when both classes are represented)
+    train_mask = ~in_test
+    if len(new_idx) >= 10:
+        stratify = y[new_idx] if np.bincount(y[new_idx], minlength=2).min() >= 2 else None
+        _, new_test = train_test_split(new_idx, test_size=0.2, random_state=42, stratify=stratify)
+        train_mask[new_test] = False
+    X_train, y_train, X_test, y_test = X[train_mask], y[train_mask], X[~train_mask], y[~train_mask]
+    print(f"   {len(new_idx)} new rows | training set: {len(y_train)} | test set: {len(y_test)}")
+    
+    scaler = joblib.load(paths[1])
+    X_train_scaled = scaler.transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+    
+    model_name = metadata['best_model']
+    start = time.perf_counter()
+    model = clone(previous)
+    threads = threads or default_cores()
+    set_threads(model, threads)
+    with pinned(threads):
+        rounds = early_stop_fit(model, X_train_scaled, y_train, patience=patience, init_model=previous)
+    set_threads(model, -1)
+    set_rounds(model, rounds)
+    previous_rounds = metadata.get('metrics', {}).get('early_stopping', {}).get('rounds')
+    print(f"   ✅ Continued {model_name} to {rounds} rounds"
+          + (f" (from {previous_rounds})" if previous_rounds else "")
+          + f" in {time.perf_counter() - start:.1f}s")
+    
+    metrics = evaluate_detailed(model, X_train_scaled, y_train, X_test_scaled, y_test, feature_names, model_name)
+    metrics['early_stopping'] = {'patience': patience, 'rounds': rounds, 'warm_start': True}
+    save_model(model, scaler, metrics, feature_names, model_name, pd.DataFrame(metadata.get('all_results', [])),
+               models_dir)
+    save_split(X_train, y_train, X_test, y_test, models_dir)
+    return True
+
+
 def plot_confusion_matrix(cm, model_name, save_path='models/trained/confusion_matrix.png'):
     """Plot confusion matrix"""
     plt.figure(figsize=(8, 6))
@@ -416,15 +771,39 @@ def plot_model_comparison(df_results, save_path='models/trained/model_comparison
 
 def main():
     """Main training pipeline"""
+    parser = argparse.ArgumentParser(description="Train and compare the ExoHunt model zoo")
+    parser.add_argument('--cores', type=int, default=None,
+                        help="Total core budget shared by every nested level (default: all available)")
+    parser.add_argument('--parallel', type=int, default=None, help="Models trained at once (default: cores // 2)")
+    parser.add_argument('--model-timeout', type=float, default=900, help="Wall-clock seconds per model (0 = none)")
+    parser.add_argument('--selection', choices=['full', 'halving'], default='full',
+                        help="full: evaluate every model; halving: race on growing subsets first")
+    parser.add_argument('--halving-eta', type=int, default=3, help="Keep 1/eta of the models per racing rung")
+    parser.add_argument('--evaluation', choices=['oof', 'holdout'], default='oof',
+                        help="oof: metrics from shared fold fits, refit only the best model; "
+                             "holdout: full fit plus separate 5-fold CV per model")
+    parser.add_argument('--early-stopping', type=int, default=0, metavar='PATIENCE',
+                        help="Early-stop XGBoost / LightGBM / CatBoost after PATIENCE rounds "
+                             "without validation improvement (0 = fixed budgets)")
+    parser.add_argument('--warm-start', action='store_true',
+                        help="Continue the previous boosted model when only rows were added")
+    args = parser.parse_args()
+    early_stopping = args.early_stopping or None
+    plan = ParallelPlan(args.cores)
+    
     print("\n" + "🚀"*30)
     print(" "*6 + "EXOHUNT ULTIMATE ML TRAINING PIPELINE")
     print("🚀"*30 + "\n")
     
-    # Load data
-    df = load_data()
+    # Load data and prepare features (memory-mapped cache when the dataset is unchanged)
+    cache = FeatureCache()
+    X, y, feature_names = load_features(cache)
     
-    # Prepare features
-    X, y, feature_names = prepare_features(df)
+    if args.warm_start:
+        if warm_start(X, y, feature_names, patience=args.early_stopping or DEFAULT_PATIENCE,
+                      threads=plan.single('Warm-start fit')):
+            return
+        print("   ↪️  Falling back to a full training run")
     
     # Split data
     print("\n✂️  Splitting data (80% train, 20% test)...")
@@ -441,12 +820,34 @@ def main():
     X_test_scaled = scaler.transform(X_test)
     print("   ✅ Features scaled using StandardScaler")
     
+    # Cross-validation workers map the scaled split instead of each receiving a pickled copy
+    X_train_scaled = cache.share('train_X_train_scaled', X_train_scaled)
+    y_train = cache.share('train_y_train', y_train)
+    
     # Get all models
     models = get_all_models()
     print(f"\n🤖 Testing {len(models)} ML algorithms...")
     
+    # Optionally race the zoo first so only the survivors get the full evaluation
+    candidates = models
+    if args.selection == 'halving':
+        parallel, _ = plan.split('Halving rungs (models at once)', len(models),
+                                 outer=args.parallel or max(1, plan.cores // 2))
+        survivors, history = successive_halving(models, X_train_scaled, y_train, eta=args.halving_eta,
+                                                cores=plan.cores, parallel=parallel,
+                                                timeout=args.model_timeout or None,
+                                                early_stopping=early_stopping)
+        candidates = {name: models[name] for name in survivors}
+    
     # Train and evaluate all models
-    results = train_and_evaluate_all(X_train_scaled, y_train, X_test_scaled, y_test, models)
+    parallel, _ = plan.split('Model evaluation (models at once)', len(candidates),
+                             outer=args.parallel or max(1, plan.cores // 2))
+    results = train_and_evaluate_all(X_train_scaled, y_train, X_test_scaled, y_test, candidates,
+                                     cores=plan.cores, parallel=parallel,
+                                     timeout=args.model_timeout or None, evaluation=args.evaluation,
+                                     early_stopping=early_stopping)
+    if args.selection == 'halving':
+        report_halving(history, results, len(y_train))
     
     # Display results
     df_results = display_results(results)
@@ -455,10 +856,16 @@ def main():
     best_result = get_best_model(results)
     best_model = best_result['model_object']
     best_name = best_result['Model']
+    best_rounds = best_result.get('Rounds')
+    if best_model is None:
+        best_model, best_rounds = refit_best(models[best_name], X_train_scaled, y_train, early_stopping,
+                                             threads=plan.single('Best-model refit'))
     
     # Detailed evaluation
     metrics = evaluate_detailed(best_model, X_train_scaled, y_train, 
                                X_test_scaled, y_test, feature_names, best_name)
+    if best_rounds:
+        metrics['early_stopping'] = {'patience': early_stopping, 'rounds': best_rounds, 'warm_start': False}
     
     # Plot confusion matrix
     plot_confusion_matrix(np.array(metrics['confusion_matrix']), best_name)
@@ -468,6 +875,7 @@ def main():
     
     # Save everything
     save_model(best_model, scaler, metrics, feature_names, best_name, df_results)
+    save_split(X_train, y_train, X_test, y_test)
     
     print("\n" + "✅"*30)
     print(" "*8 + "🎉 TRAINING COMPLETE! 🎉")
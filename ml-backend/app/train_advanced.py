@@ -9,12 +9,26 @@ ExoHunt ADVANCED ML Training Pipeline
 
 import pandas as pd
 import numpy as np
+import argparse
 from pathlib import Path
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.features import BASE_FEATURES, FEATURE_NAMES, compute_features
+from app.model_store import write_manifest
+from app.boosting import booster_kind, early_stop_fit, set_rounds
+from app.feature_cache import FeatureCache
+from app.feature_scoring import mutual_information, select_top_k
+from app.parallelism import ParallelPlan, pinned
+from app.stacking import StackingTrainer, fold_plan
+from app.tuning import SEARCH_SPACE, tune_xgboost
+from app.storage import read_table, resolve
+
 # ML Core
-from sklearn.model_selection import train_test_split, StratifiedKFold, cross_val_score
+from sklearn.model_selection import train_test_split, StratifiedKFold
+from sklearn.base import clone
 from sklearn.preprocessing import StandardScaler, RobustScaler
 from sklearn.metrics import (
     classification_report, confusion_matrix, accuracy_score,
@@ -32,26 +46,61 @@ from catboost import CatBoostClassifier
 
 # Advanced techniques
 from imblearn.over_sampling import SMOTE, ADASYN
+from imblearn.under_sampling import RandomUnderSampler
 from imblearn.combine import SMOTETomek
-from sklearn.feature_selection import SelectKBest, mutual_info_classif
-from skopt import BayesSearchCV
-from skopt.space import Real, Integer, Categorical
+from sklearn.neighbors import NearestNeighbors
 
 import joblib
 import json
+import time
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 
 
+UNIFIED_PATH = Path('data/processed/unified_exoplanets.parquet')
+KEPLER_PATH = Path('data/processed/kepler_processed.parquet')
+
+# Meta-models the stack can be re-fitted with (base learners come from the OOF cache).
+# No n_jobs here or on the base learners: thread counts come from the parallelism plan.
+META_MODELS = {
+    'gradient_boosting': lambda: GradientBoostingClassifier(
+        n_estimators=200, max_depth=5, learning_rate=0.05, random_state=42
+    ),
+    'random_forest': lambda: RandomForestClassifier(
+        n_estimators=300, max_depth=8, random_state=42
+    ),
+    'lightgbm': lambda: LGBMClassifier(
+        n_estimators=200, num_leaves=15, learning_rate=0.05, random_state=42, verbose=-1
+    ),
+}
+
+# Class-imbalance strategies:
+# - smote-tomek: SMOTE + Tomek links on the full matrix before the split (original behaviour)
+# - smote: SMOTE with a KD-tree neighbour search on training folds only
+# - undersample: class-balanced random undersampling on training folds only
+# - class-weight: no resampling; balanced class weights / scale_pos_weight in the learners
+IMBALANCE_STRATEGIES = ('smote-tomek', 'smote', 'undersample', 'class-weight')
+
+
 class AdvancedExoplanetTrainer:
     """Advanced ML trainer with all optimizations"""
     
-    def __init__(self):
+    def __init__(self, early_stopping=None, meta_model='gradient_boosting', tune_trials=0, cores=None,
+                 imbalance='smote-tomek'):
         self.scaler = RobustScaler()  # Better for outliers than StandardScaler
         self.best_model = None
         self.feature_names = None
         self.metrics = {}
+        self.cache = FeatureCache()
+        self.early_stopping = early_stopping  # patience in rounds, None = fixed budgets
+        self.boosting_rounds = {}
+        self.meta_model = meta_model
+        self.tune_trials = tune_trials
+        self.plan = ParallelPlan(cores)  # one core budget for every nested level
+        self.imbalance = imbalance
+        self.resample_seconds = 0.0
+        self.selection = None
         
     def load_unified_data(self):
         """Load unified multi-dataset"""
@@ -59,16 +108,17 @@ class AdvancedExoplanetTrainer:
         print(" "*5 + "LOADING UNIFIED MULTI-DATASET")
         print("📂"*30 + "\n")
         
-        # Try unified dataset first
-        unified_path = Path('data/processed/unified_exoplanets.csv')
+        # Only the base features and label are read (Parquet copy preferred over CSV)
+        columns = BASE_FEATURES + [f'koi_{feat}' for feat in BASE_FEATURES] + ['is_exoplanet']
         
-        if unified_path.exists():
+        # Try unified dataset first
+        try:
+            df = read_table(UNIFIED_PATH, columns=columns)
             print("✅ Loading unified dataset (Kepler + K2 + TESS)...")
-            df = pd.read_csv(unified_path)
             print(f"   Total samples: {len(df)}")
-        else:
+        except FileNotFoundError:
             print("⚠️  Unified dataset not found, loading Kepler only...")
-            df = pd.read_csv('data/processed/kepler_processed.csv')
+            df = read_table(KEPLER_PATH, columns=columns)
             print(f"   Kepler samples: {len(df)}")
         
         print(f"   - Exoplanets: {df['is_exoplanet'].sum()}")
@@ -81,14 +131,9 @@ class AdvancedExoplanetTrainer:
         """Create advanced physics-based features"""
         print("\n🔬 Engineering advanced features...")
         
-        base_features = [
-            'period', 'duration', 'depth', 'prad', 
-            'teq', 'insol', 'steff', 'slogg', 'srad'
-        ]
-        
         # Map column names (handle both unified and Kepler-only format)
         col_map = {}
-        for feat in base_features:
+        for feat in BASE_FEATURES:
             # Try unified format first
             if feat in df.columns:
                 col_map[feat] = feat
@@ -98,59 +143,34 @@ class AdvancedExoplanetTrainer:
         
         print(f"   Found {len(col_map)} base features")
         
-        # Create feature DataFrame
-        X = pd.DataFrame()
-        
-        # Add base features
-        for feat_name, col_name in col_map.items():
-            X[feat_name] = df[col_name]
-        
-        # Physics-based derived features
+        # Physics-based derived features (shared kernel, same as serving)
         print("   Creating physics-based features...")
-        
-        # Transit geometry
-        X['transit_depth_ratio'] = X['depth'] / (X['prad']**2 + 1e-10)
-        X['duration_period_ratio'] = X['duration'] / (X['period'] + 1e-10)
-        
-        # Stellar characteristics
-        X['stellar_density'] = 10**X['slogg'] / (X['srad']**2 + 1e-10)
-        X['stellar_luminosity'] = (X['srad']**2) * (X['steff']**4)
-        
-        # Planet characteristics
-        X['planet_density'] = (X['prad']**3) / (X['period']**2 + 1e-10)
-        X['equilibrium_temp_ratio'] = X['teq'] / (X['steff'] + 1e-10)
-        X['irradiation_ratio'] = X['insol'] / (X['teq'] + 1e-10)
-        
-        # Orbital mechanics
-        X['semi_major_axis'] = ((X['period'] / 365.25)**2 * X['srad'])**(1/3)
-        X['orbital_velocity'] = (2 * np.pi * X['semi_major_axis']) / (X['period'] + 1e-10)
-        
-        # Habitability indicators
-        X['habitable_zone_distance'] = X['semi_major_axis'] / (np.sqrt(X['insol']) + 1e-10)
-        X['surface_gravity'] = X['slogg'] * (X['prad']**2)
-        
-        # Statistical transformations
-        X['log_period'] = np.log10(X['period'] + 1)
-        X['log_insol'] = np.log10(X['insol'] + 1)
-        X['log_depth'] = np.log10(X['depth'] + 1)
-        X['sqrt_prad'] = np.sqrt(X['prad'])
-        
-        # Interaction features (most predictive combinations)
-        X['prad_teq_interaction'] = X['prad'] * X['teq']
-        X['period_depth_interaction'] = X['period'] * X['depth']
-        X['insol_steff_interaction'] = X['insol'] * X['steff']
-        
-        # Polynomial features (carefully selected)
-        X['period_squared'] = X['period']**2
-        X['prad_squared'] = X['prad']**2
-        X['depth_squared'] = X['depth']**2
+        base = np.column_stack([df[col_map[feat]].to_numpy(dtype=np.float64) for feat in BASE_FEATURES])
+        X = pd.DataFrame(compute_features(base), columns=FEATURE_NAMES, index=df.index)
         
         print(f"   ✅ Created {X.shape[1]} total features")
         
         return X
     
+    def load_features(self):
+        """Engineered X / y, memory-mapped from the feature cache when the dataset is unchanged"""
+        try:
+            data_path = resolve(UNIFIED_PATH)
+        except FileNotFoundError:
+            data_path = resolve(KEPLER_PATH)
+        
+        def build():
+            df = self.load_unified_data()
+            return self.engineer_advanced_features(df), df['is_exoplanet'].values
+        
+        X, y, feature_names, hit = self.cache.get_or_build(data_path, FEATURE_NAMES, build)
+        if hit:
+            print(f"\n⚡ Loaded cached feature matrix {X.shape} for {data_path}")
+        
+        return pd.DataFrame(X, columns=feature_names, copy=False), y
+    
     def handle_class_imbalance(self, X, y):
-        """Apply SMOTE to balance classes"""
+        """Apply SMOTE-Tomek to balance classes (full matrix, before the split)"""
         print("\n⚖️  Handling class imbalance with SMOTE...")
         
         print(f"   Before SMOTE:")
@@ -159,69 +179,80 @@ class AdvancedExoplanetTrainer:
         print(f"      - Ratio: {np.sum(y) / len(y) * 100:.2f}%")
         
         # Use SMOTETomek for better results (SMOTE + Tomek links)
-        smote_tomek = SMOTETomek(random_state=42, n_jobs=-1)
-        X_balanced, y_balanced = smote_tomek.fit_resample(X, y)
+        threads = self.plan.single('SMOTE-Tomek resampling')
+        smote_tomek = SMOTETomek(random_state=42, n_jobs=threads)
+        start = time.perf_counter()
+        with pinned(threads):
+            X_balanced, y_balanced = smote_tomek.fit_resample(X, y)
+        self.resample_seconds = time.perf_counter() - start
         
         print(f"   After SMOTE-Tomek:")
         print(f"      - Exoplanets: {np.sum(y_balanced)}")
         print(f"      - Non-Exoplanets: {len(y_balanced) - np.sum(y_balanced)}")
         print(f"      - Ratio: {np.sum(y_balanced) / len(y_balanced) * 100:.2f}%")
+        print(f"   ⏱️  Resampling took {self.resample_seconds:.2f}s")
         
         return X_balanced, y_balanced
     
+    def fold_sampler(self):
+        """Resampler applied to each training fold, or None"""
+        if self.imbalance == 'smote':
+            # k_neighbors=5 plus the sample itself; KD-tree search instead of brute force
+            neighbours = NearestNeighbors(n_neighbors=6, algorithm='kd_tree')
+            return SMOTE(k_neighbors=neighbours, random_state=42)
+        if self.imbalance == 'undersample':
+            return RandomUnderSampler(random_state=42)
+        return None
+    
+    def apply_class_weights(self, stacking_model, y):
+        """Balanced class weights for every base learner (no resampling)"""
+        pos = int(np.sum(y))
+        scale_pos_weight = (len(y) - pos) / max(pos, 1)
+        print(f"\n⚖️  Class weights: balanced, scale_pos_weight={scale_pos_weight:.3f}")
+        weights = {
+            'rf': {'class_weight': 'balanced'},
+            'xgb': {'scale_pos_weight': scale_pos_weight},
+            'lgbm': {'class_weight': 'balanced'},
+            'catboost': {'auto_class_weights': 'Balanced'},
+            'extra': {'class_weight': 'balanced'},
+        }
+        for name, estimator in stacking_model.estimators:
+            estimator.set_params(**weights.get(name, {}))
+    
     def feature_selection(self, X, y, k=30):
-        """Select top K most informative features"""
+        """Select top K most informative features (MI on a subsample, cached per dataset)"""
         print(f"\n🎯 Selecting top {k} features...")
         
-        selector = SelectKBest(mutual_info_classif, k=min(k, X.shape[1]))
-        X_selected = selector.fit_transform(X, y)
+        feature_names = X.columns.tolist()
+        scores = mutual_information(X.to_numpy(), y, feature_names, plan=self.plan)
+        selected_features = select_top_k(scores, feature_names, k)
+        X_selected = X[selected_features].to_numpy()
+        self.selection = {'requested_k': k, 'kept': len(selected_features), 'available': len(feature_names)}
         
-        # Get selected feature names
-        feature_mask = selector.get_support()
-        selected_features = X.columns[feature_mask].tolist()
-        
-        print(f"   ✅ Selected features: {len(selected_features)}")
-        print(f"   Top 10: {selected_features[:10]}")
+        if k > len(feature_names):
+            print(f"   ⚠️  k={k} exceeds the {len(feature_names)} available features, keeping all of them")
+        print(f"   ✅ Selected features: {len(selected_features)} of {len(feature_names)}")
+        ranked = sorted(selected_features, key=lambda name: scores[name], reverse=True)
+        print(f"   Top 10: {ranked[:10]}")
         
         return X_selected, selected_features
     
-    def bayesian_optimize_xgboost(self, X, y):
-        """Bayesian optimization for XGBoost"""
+    def bayesian_optimize_xgboost(self, X, y, n_trials=30, fixed=None):
+        """Bayesian optimization for XGBoost (parallel, pruned, resumable optuna study)"""
         print("\n🔮 Bayesian optimization for XGBoost...")
         
-        param_space = {
-            'n_estimators': Integer(200, 1000),
-            'max_depth': Integer(5, 15),
-            'learning_rate': Real(0.01, 0.3, prior='log-uniform'),
-            'subsample': Real(0.6, 1.0),
-            'colsample_bytree': Real(0.6, 1.0),
-            'min_child_weight': Integer(1, 10),
-            'gamma': Real(0, 5)
-        }
+        # With early stopping every trial stops on its own folds, so the round
+        # budget always belongs to the trial's learning rate and depth; folds are
+        # resampled like the stack's, so it also belongs to the class balance
+        best_params, study = tune_xgboost(X, y, n_trials=n_trials, plan=self.plan, fixed=fixed,
+                                          early_stopping=self.early_stopping, sampler=self.fold_sampler())
         
-        xgb_model = XGBClassifier(
-            random_state=42,
-            n_jobs=-1,
-            eval_metric='logloss'
-        )
-        
-        bayes_search = BayesSearchCV(
-            xgb_model,
-            param_space,
-            n_iter=30,  # Number of parameter settings to sample
-            cv=5,
-            scoring='f1',
-            n_jobs=-1,
-            random_state=42,
-            verbose=0
-        )
+        print(f"   ✅ Best F1 score: {study.best_value:.4f}")
+        print(f"   Best params: {study.best_params}")
+        if self.early_stopping:
+            print(f"   Early stopping: {best_params['n_estimators']} rounds")
         
-        bayes_search.fit(X, y)
-        
-        print(f"   ✅ Best F1 score: {bayes_search.best_score_:.4f}")
-        print(f"   Best params: {bayes_search.best_params_}")
-        
-        return bayes_search.best_estimator_
+        return best_params
     
     def create_stacking_ensemble(self, X, y):
         """Create advanced stacking ensemble"""
@@ -236,7 +267,6 @@ class AdvancedExoplanetTrainer:
                 min_samples_leaf=2,
                 max_features='sqrt',
                 random_state=42,
-                n_jobs=-1,
                 class_weight='balanced'
             )),
             
@@ -249,7 +279,6 @@ class AdvancedExoplanetTrainer:
                 min_child_weight=3,
                 gamma=0.1,
                 random_state=42,
-                n_jobs=-1,
                 eval_metric='logloss'
             )),
             
@@ -260,7 +289,6 @@ class AdvancedExoplanetTrainer:
                 num_leaves=50,
                 min_child_samples=20,
                 random_state=42,
-                n_jobs=-1,
                 verbose=-1
             )),
             
@@ -277,25 +305,18 @@ class AdvancedExoplanetTrainer:
                 max_depth=25,
                 min_samples_split=5,
                 random_state=42,
-                n_jobs=-1,
                 class_weight='balanced'
             ))
         ]
         
-        # Meta-model (Gradient Boosting)
-        meta_model = GradientBoostingClassifier(
-            n_estimators=200,
-            max_depth=5,
-            learning_rate=0.05,
-            random_state=42
-        )
+        # Meta-model (Gradient Boosting by default)
+        meta_model = META_MODELS[self.meta_model]()
         
         # Create stacking classifier
         stacking = StackingClassifier(
             estimators=base_models,
             final_estimator=meta_model,
-            cv=5,
-            n_jobs=-1
+            cv=5
         )
         
         print("   Base models:")
@@ -305,18 +326,35 @@ class AdvancedExoplanetTrainer:
         
         return stacking
     
-    def train_and_evaluate(self, df):
+    def tune_boosting_rounds(self, stacking_model, X, y, skip=()):
+        """Early-stop each boosted base learner once and fix its round budget for the stack's fits"""
+        print(f"\n⏱️  Early stopping boosted base learners (patience {self.early_stopping})...")
+        threads = self.plan.single('Early-stopping base learners')
+        sampler = self.fold_sampler()
+        if sampler is not None:
+            # The stack fits on resampled rows, so the round budget is found on them too
+            with pinned(threads):
+                X, y = self.plan.apply(sampler, threads).fit_resample(X, y)
+        for name, estimator in stacking_model.estimators:
+            if booster_kind(estimator) is None or name in skip:
+                continue
+            probe = self.plan.apply(clone(estimator), threads)
+            rounds = early_stop_fit(probe, X, y, patience=self.early_stopping)
+            set_rounds(estimator, rounds)
+            self.boosting_rounds[name] = rounds
+            print(f"   {name}: {rounds} rounds")
+    
+    def train_and_evaluate(self, X, y):
         """Main training pipeline"""
         print("\n" + "🔥"*30)
         print(" "*5 + "ADVANCED TRAINING PIPELINE")
         print("🔥"*30)
         
-        # Engineer features
-        X = self.engineer_advanced_features(df)
-        y = df['is_exoplanet'].values
-        
-        # Handle imbalance
-        X_balanced, y_balanced = self.handle_class_imbalance(X, y)
+        # Handle imbalance (the fold-level strategies leave the matrix untouched here)
+        if self.imbalance == 'smote-tomek':
+            X_balanced, y_balanced = self.handle_class_imbalance(X, y)
+        else:
+            X_balanced, y_balanced = X.to_numpy(), np.asarray(y)
         
         # Feature selection
         X_selected, self.feature_names = self.feature_selection(
@@ -342,7 +380,31 @@ class AdvancedExoplanetTrainer:
         # Train stacking ensemble
         print("\n🤖 Training Stacking Ensemble...")
         stacking_model = self.create_stacking_ensemble(X_train_scaled, y_train)
-        stacking_model.fit(X_train_scaled, y_train)
+        if self.imbalance == 'class-weight':
+            self.apply_class_weights(stacking_model, y_train)
+        tuned_xgb = ()
+        if self.tune_trials:
+            # Only the searched params move over; weights, threads and seeds stay the stack's
+            # Trials are scored with the class weight the stack's XGBoost ships with
+            weight = stacking_model.named_estimators['xgb'].get_params().get('scale_pos_weight')
+            fixed = {'scale_pos_weight': weight} if weight is not None else None
+            tuned = self.bayesian_optimize_xgboost(X_train_scaled, y_train, n_trials=self.tune_trials, fixed=fixed)
+            stacking_model.named_estimators['xgb'].set_params(**{name: tuned[name] for name in SEARCH_SPACE})
+            tuned_xgb = ('xgb',)
+            if self.early_stopping:
+                # The tuned round count already comes from early stopping inside the trials
+                self.boosting_rounds['xgb'] = tuned['n_estimators']
+        if self.early_stopping:
+            self.tune_boosting_rounds(stacking_model, X_train_scaled, y_train, skip=tuned_xgb)
+        
+        # Base learners are fitted once per fold of one plan; their out-of-fold
+        # probabilities are cached and reused for the meta-model and for CV
+        X_train_scaled = self.cache.share('advanced_X_train_scaled', X_train_scaled)
+        y_train = self.cache.share('advanced_y_train', y_train)
+        folds = fold_plan(y_train, n_splits=5)
+        trainer = StackingTrainer(stacking_model.estimators, plan=self.plan, sampler=self.fold_sampler())
+        stacking_model = trainer.fit(X_train_scaled, y_train, stacking_model.final_estimator, folds)
+        self.resample_seconds += trainer.resample_seconds
         
         # Evaluate
         y_pred = stacking_model.predict(X_test_scaled)
@@ -357,12 +419,9 @@ class AdvancedExoplanetTrainer:
             'roc_auc': roc_auc_score(y_test, y_proba)
         }
         
-        # Cross-validation
-        print("\n🔄 Performing 10-fold cross-validation...")
-        cv_scores = cross_val_score(
-            stacking_model, X_train_scaled, y_train,
-            cv=10, scoring='f1', n_jobs=-1
-        )
+        # Cross-validation of the meta-model over the cached out-of-fold matrix (no base refits)
+        print(f"\n🔄 Performing {len(folds)}-fold cross-validation on cached out-of-fold predictions...")
+        cv_scores = trainer.cross_validate(X_train_scaled, y_train, stacking_model.final_estimator, folds)
         self.metrics['cv_mean'] = cv_scores.mean()
         self.metrics['cv_std'] = cv_scores.std()
         
@@ -377,6 +436,7 @@ class AdvancedExoplanetTrainer:
         print(f"   F1 Score:  {self.metrics['f1_score']*100:.2f}%")
         print(f"   ROC-AUC:   {self.metrics['roc_auc']*100:.2f}%")
         print(f"   CV F1:     {self.metrics['cv_mean']*100:.2f}% (+/- {self.metrics['cv_std']*2*100:.2f}%)")
+        print(f"   Imbalance: {self.imbalance} (resampling {self.resample_seconds:.2f}s)")
         
         # Confusion matrix
         cm = confusion_matrix(y_test, y_pred)
@@ -395,7 +455,8 @@ class AdvancedExoplanetTrainer:
         models_dir = Path('models/trained')
         models_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save model
+        # Save model (serving may use every core again)
+        self.plan.apply(self.best_model, -1)
         joblib.dump(self.best_model, models_dir / 'exoplanet_model_advanced.pkl')
         joblib.dump(self.scaler, models_dir / 'scaler_advanced.pkl')
         
@@ -403,30 +464,59 @@ class AdvancedExoplanetTrainer:
         metadata = {
             'model_type': 'StackingClassifier',
             'feature_names': self.feature_names,
+            'decision_threshold': 0.5,
             'metrics': {k: float(v) for k, v in self.metrics.items()},
             'training_date': datetime.now().isoformat(),
+            'early_stopping': {
+                'patience': self.early_stopping,
+                'rounds': self.boosting_rounds
+            } if self.early_stopping else None,
+            'meta_model': self.meta_model,
+            'feature_selection': self.selection,
+            'imbalance': {'strategy': self.imbalance, 'resample_seconds': round(self.resample_seconds, 3)},
+            'parallelism': {'cores': self.plan.cores, 'stages': self.plan.summary()},
             'notes': 'Advanced model with SMOTE, feature engineering, and stacking'
         }
         
         with open(models_dir / 'model_metadata_advanced.json', 'w') as f:
             json.dump(metadata, f, indent=2)
         
+        # SHA-256 manifest the API verifies before serving (upload it with the artifacts)
+        write_manifest(models_dir)
+        
         print("   ✅ Model saved successfully")
 
 
 def main():
     """Run advanced training"""
+    parser = argparse.ArgumentParser(description="Train the advanced ExoHunt stacking ensemble")
+    parser.add_argument('--early-stopping', type=int, default=0, metavar='PATIENCE',
+                        help="Pick XGBoost / LightGBM / CatBoost round budgets by early stopping (0 = fixed)")
+    parser.add_argument('--meta-model', choices=sorted(META_MODELS), default='gradient_boosting',
+                        help="Stacking meta-model; base learners are reused from the out-of-fold cache")
+    parser.add_argument('--tune-xgboost', type=int, default=0, metavar='TRIALS',
+                        help="Tune the stack's XGBoost learner with a resumable optuna study (0 = off)")
+    parser.add_argument('--imbalance', choices=IMBALANCE_STRATEGIES, default='smote-tomek',
+                        help="smote-tomek: resample the full matrix (original); smote / undersample: "
+                             "resample training folds only; class-weight: weight the learners instead")
+    parser.add_argument('--cores', type=int, default=None,
+                        help="Total core budget shared by every nested level (default: all available)")
+    args = parser.parse_args()
+    
     print("\n" + "🚀"*30)
     print(" "*3 + "EXOHUNT ADVANCED ML TRAINING")
     print("🚀"*30)
     
-    trainer = AdvancedExoplanetTrainer()
+    trainer = AdvancedExoplanetTrainer(early_stopping=args.early_stopping or None, meta_model=args.meta_model,
+                                       tune_trials=args.tune_xgboost, cores=args.cores,
+                                       imbalance=args.imbalance)
+    print(f"\n🧵 Core budget: {trainer.plan.cores}")
     
-    # Load data
-    df = trainer.load_unified_data()
+    # Load data and engineer features (memory-mapped cache when the dataset is unchanged)
+    X, y = trainer.load_features()
     
     # Train and evaluate
-    trainer.train_and_evaluate(df)
+    trainer.train_and_evaluate(X, y)
     
     # Save model
     trainer.save_model()
@@ -0,0 +1,162 @@
+"""
+ExoHunt hyperparameter tuning (optuna)
+- TPE search over the XGBoost space with several trials evaluated at once;
+  the core budget is split explicitly (`parallel` trials x `cores // parallel`
+  XGBoost threads) instead of every fit using n_jobs=-1
+- Each trial reports its running CV F1 after every fold and a MedianPruner
+  stops trials that trail the median of earlier trials at the same fold
+- With early stopping, every fold fit stops on a validation split of its own
+  training rows, so each trial's round count matches its learning rate and
+  depth; the best trial's mean stopping round is returned as n_estimators
+- With a `sampler` (SMOTE, undersampling), each fold's training rows are
+  resampled once, as the stack's own fold fits are, so tuned params and
+  rounds come from the class balance they are applied to; validation rows
+  stay real
+- Trials are stored in a local SQLite study, so an interrupted search resumes
+  where it stopped and only the remaining trial budget is run; trials a
+  killed run left behind are marked failed by heartbeat and not counted
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import optuna
+from optuna.trial import TrialState
+from sklearn.base import clone
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+from xgboost import XGBClassifier
+
+from app.boosting import early_stop_fit
+from app.parallelism import ParallelPlan, pinned
+from app.stacking import learner_key
+
+DEFAULT_STORAGE = Path(os.getenv("EXOHUNT_TUNING_DB", "data/cache/tuning.db"))
+
+# Parameters the search sets; copy only these onto another XGBoost learner
+SEARCH_SPACE = ('n_estimators', 'max_depth', 'learning_rate', 'subsample',
+                'colsample_bytree', 'min_child_weight', 'gamma')
+
+# Round cap for early-stopped trials (the top of the searched n_estimators range)
+MAX_ROUNDS = 1000
+
+
+def suggest_xgboost(trial, fixed=None):
+    """XGBoost search space (the former BayesSearchCV space); `fixed` params are not searched"""
+    fixed = fixed or {}
+    space = {
+        'n_estimators': lambda: trial.suggest_int('n_estimators', 200, 1000),
+        'max_depth': lambda: trial.suggest_int('max_depth', 5, 15),
+        'learning_rate': lambda: trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
+        'subsample': lambda: trial.suggest_float('subsample', 0.6, 1.0),
+        'colsample_bytree': lambda: trial.suggest_float('colsample_bytree', 0.6, 1.0),
+        'min_child_weight': lambda: trial.suggest_int('min_child_weight', 1, 10),
+        'gamma': lambda: trial.suggest_float('gamma', 0.0, 5.0),
+    }
+    return {**{name: suggest() for name, suggest in space.items() if name not in fixed}, **fixed}
+
+
+def study_key(X, y, fixed=None):
+    """Default study name: the same data and fixed params resume the same study"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.int64).tobytes())
+    digest.update(repr(sorted((fixed or {}).items())).encode())
+    return digest.hexdigest()[:12]
+
+
+def load_study(name, storage=DEFAULT_STORAGE, seed=42):
+    """Create or reopen the SQLite-backed study `name`"""
+    path = Path(storage)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    storage = optuna.storages.RDBStorage(
+        f"sqlite:///{path}",
+        heartbeat_interval=60,
+        grace_period=180,
+    )
+    return optuna.create_study(
+        study_name=name,
+        storage=storage,
+        direction='maximize',
+        load_if_exists=True,
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        # Prune only once a few trials have finished and after the first fold
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1),
+    )
+
+
+def tune_xgboost(X, y, n_trials=30, n_splits=5, plan=None, parallel=None, fixed=None,
+                 storage=DEFAULT_STORAGE, study_name=None, timeout=None, early_stopping=None, sampler=None):
+    """
+    Tune XGBoost for CV F1; returns (best params, study).
+
+    The best params include `fixed` and, with early stopping, the best trial's
+    round count as n_estimators; callers apply them to their own learner, so
+    no model is refitted here.
+
+    `n_trials` is the study's total budget: trials already stored (e.g. by an
+    interrupted run) count towards it. The study is named after the data,
+    `fixed` params and `early_stopping` unless `study_name` is given. `parallel`
+    trials run at once (default: a quarter of the plan's cores) and share its budget.
+    With `early_stopping` (patience), n_estimators is a cap rather than searched.
+    `sampler` resamples every fold's training rows (once, before the trials).
+    """
+    plan = plan or ParallelPlan()
+    X = np.asarray(X)
+    y = np.asarray(y)
+    fixed = dict(fixed or {})
+    key_params = fixed
+    if early_stopping:
+        fixed = {'n_estimators': MAX_ROUNDS, **fixed}
+        key_params = {**fixed, 'early_stopping': early_stopping}
+    if sampler is not None:
+        key_params = {**key_params, 'sampler': learner_key(sampler)}
+    study_name = study_name or f"xgboost-{study_key(X, y, key_params)}"
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42).split(X, y))
+    fit_sets = [(X[train_idx], y[train_idx]) for train_idx, _ in folds]
+    if sampler is not None:
+        resample_threads = plan.single(f'{type(sampler).__name__} tuning-fold resampling')
+        with pinned(resample_threads):
+            fit_sets = [plan.apply(clone(sampler), resample_threads).fit_resample(X_fit, y_fit)
+                        for X_fit, y_fit in fit_sets]
+
+    def objective(trial):
+        params = suggest_xgboost(trial, fixed)
+        scores = []
+        rounds = []
+        for step, ((X_fit, y_fit), (_, val_idx)) in enumerate(zip(fit_sets, folds)):
+            model = XGBClassifier(**params, random_state=42, n_jobs=threads, eval_metric='logloss')
+            if early_stopping:
+                rounds.append(early_stop_fit(model, X_fit, y_fit, patience=early_stopping))
+                trial.set_user_attr('rounds', int(np.mean(rounds)))
+            else:
+                model.fit(X_fit, y_fit)
+            scores.append(f1_score(y[val_idx], model.predict(X[val_idx])))
+            trial.report(float(np.mean(scores)), step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+        return float(np.mean(scores))
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = load_study(study_name, storage)
+    done = len(study.get_trials(deepcopy=False, states=(TrialState.COMPLETE, TrialState.PRUNED)))
+    remaining = max(0, n_trials - done)
+    print(f"   Study '{study_name}': {done} stored trials, running {remaining} more")
+
+    start = time.perf_counter()
+    if remaining:
+        parallel, threads = plan.split('XGBoost tuning trials', remaining, outer=parallel or max(1, plan.cores // 4))
+        # Trials are threads of this process, so the pin covers all of them
+        with pinned(threads):
+            study.optimize(objective, n_trials=remaining, n_jobs=parallel, timeout=timeout)
+    states = [t.state for t in study.trials]
+    print(f"   ✅ {states.count(TrialState.COMPLETE)} complete, "
+          f"{states.count(TrialState.PRUNED)} pruned in {time.perf_counter() - start:.1f}s")
+
+    best_params = {**study.best_params, **fixed}
+    if early_stopping:
+        best_params['n_estimators'] = study.best_trial.user_attrs['rounds']
+    return best_params, study
@@ -4,114 +4,116 @@ Downloads Kepler, K2, and TESS data for ultimate accuracy
 """
 
 import pandas as pd
-import requests
-from io import StringIO
+import numpy as np
+import argparse
+import os
 from pathlib import Path
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
-# NASA Dataset URLs
-KEPLER_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?query=select+*+from+cumulative&format=csv"
-K2_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?query=select+*+from+k2pandc&format=csv"
-TESS_URL = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?query=select+*+from+TOI&format=csv"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.catalog import ID_COLUMNS, SOURCE_COLUMN_MAPS
+from app.downloader import fetch_all, load_meta
+from app.outliers import MODES as OUTLIER_MODES, filter_outliers
+from app.partitions import load_partition, merge_partition, partition_path, save_partition, stable_ids
+from app.storage import parquet_path, read_metadata, read_table, write_table
+from app.features import BASE_FEATURES, DERIVED_FEATURES, compute_features
 
+# NASA Dataset URLs (overridable, e.g. to point at a mirror or a local stand-in)
+KEPLER_URL = os.getenv("EXOHUNT_KEPLER_URL", "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?query=select+*+from+cumulative&format=csv")
+K2_URL = os.getenv("EXOHUNT_K2_URL", "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?query=select+*+from+k2pandc&format=csv")
+TESS_URL = os.getenv("EXOHUNT_TESS_URL", "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?query=select+*+from+TOI&format=csv")
 
-def download_dataset(url, name):
-    """Download dataset from NASA"""
-    print(f"\n📡 Downloading {name} dataset...")
-    
-    try:
-        response = requests.get(url, verify=False, timeout=60)
-        response.raise_for_status()
-        df = pd.read_csv(StringIO(response.text))
-        
-        # Save raw data
-        raw_path = Path(f'data/raw/{name.lower()}_raw.csv')
-        raw_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(raw_path, index=False)
-        
-        print(f"✅ Downloaded {len(df)} {name} objects")
-        print(f"📊 Columns: {df.shape[1]}")
-        
-        return df
-    except Exception as e:
-        print(f"❌ Failed to download {name}: {str(e)}")
+RAW_DIR = Path('data/raw')
+OUTPUT_PATH = Path('data/processed/unified_exoplanets.parquet')
+
+
+def download_datasets():
+    """Download (or revalidate) all NASA datasets concurrently; returns per-source results"""
+    print("\n📡 Downloading Kepler, K2 and TESS datasets...")
+    sources = {
+        name: (url, RAW_DIR / f'{name.lower()}_raw.csv')
+        for name, url in [("Kepler", KEPLER_URL), ("K2", K2_URL), ("TESS", TESS_URL)]
+    }
+    results = fetch_all(sources, verify=False)
+
+    for name, result in results.items():
+        if result['status'] == 'failed':
+            print(f"❌ Failed to download {name}: {result['error']}")
+        elif result['changed']:
+            print(f"✅ {name}: {result['status']} {result['bytes'] / 1e6:.1f} MB in {result['seconds']:.1f}s")
+        else:
+            print(f"♻️  {name}: unchanged ({result['status']}, sha256 {result['sha256'][:12]})")
+    return results
+
+
+def load_raw(name, result):
+    """Read a downloaded source, falling back to the last good copy if the download failed"""
+    path = result['path']
+    if not path.exists():
         return None
+    if result['status'] == 'failed':
+        print(f"⚠️  Using previously downloaded {name} data from {path}")
 
+    # The CSV stays byte-identical to the archive (for revalidation); parsing
+    # happens once per content hash and the Parquet copy is reused after that
+    sha256 = result.get('sha256')
+    if sha256 and read_metadata(path).get('sha256') == sha256:
+        df = read_table(parquet_path(path))
+    else:
+        df = pd.read_csv(path, comment='#', low_memory=False)
+        if sha256:
+            write_table(df, path, metadata={'sha256': sha256})
+    print(f"📊 {name}: {len(df)} objects, {df.shape[1]} columns")
+    return df
+
+
+def build_partition(name, process, result):
+    """Processed rows (with features) for one source, reprocessing only if its content changed"""
+    key = name.lower()
+    path = partition_path(name)
+    sha256 = result.get('sha256') or load_meta(result['path']).get('sha256')
+    column_map = {**SOURCE_COLUMN_MAPS[key], 'object_id': ID_COLUMNS[key]}
+    
+    # A changed column map (e.g. a corrected archive column) reprocesses unchanged raw files too
+    cached = load_partition(path, sha256, column_map) if sha256 else None
+    if cached is not None:
+        print(f"   ♻️  {name}: {len(cached)} samples (unchanged, cached partition)")
+        return cached
+    
+    raw_df = load_raw(name, result)
+    if raw_df is None or raw_df.empty:
+        return None
+    
+    clean = process(raw_df, column_map)
+    clean['source'] = name
+    # Archive row number stands in for exports without an ID column
+    clean['object_id'] = stable_ids(name, clean['object_id'] if 'object_id' in clean else clean.index)
+    
+    # Merge by object ID: features are only computed for new or changed rows
+    value_columns = [c for c in clean.columns if c != 'object_id']
+    partition, stats = merge_partition(load_partition(path), clean, value_columns, create_advanced_features)
+    save_partition(partition, path, sha256, column_map)
+    print(f"   ✅ {name}: {len(partition)} samples ({stats['added']} added, {stats['updated']} updated, "
+          f"{stats['removed']} removed, {stats['unchanged']} unchanged)")
+    return partition
 
-def unify_datasets(kepler_df, k2_df, tess_df):
+
+def unify_datasets(results):
     """
     Unify all datasets into one master dataset
     Based on NASA research: combining datasets improves accuracy
     """
     print("\n🔗 Unifying datasets...")
     
-    # Common features across all datasets (focusing on transit parameters)
-    common_features = {
-        # Kepler column names
-        'kepler': {
-            'period': 'koi_period',
-            'duration': 'koi_duration', 
-            'depth': 'koi_depth',
-            'prad': 'koi_prad',
-            'teq': 'koi_teq',
-            'insol': 'koi_insol',
-            'steff': 'koi_steff',
-            'slogg': 'koi_slogg',
-            'srad': 'koi_srad',
-            'disposition': 'koi_disposition'
-        },
-        # K2 column names (similar to Kepler)
-        'k2': {
-            'period': 'pl_orbper',  # Orbital period
-            'duration': 'pl_trandur',  # Transit duration
-            'depth': 'pl_trandep',  # Transit depth
-            'prad': 'pl_rade',  # Planet radius
-            'teq': 'pl_eqt',  # Equilibrium temp
-            'insol': 'pl_insol',  # Insolation
-            'steff': 'st_teff',  # Stellar temp
-            'slogg': 'st_logg',  # Stellar gravity
-            'srad': 'st_rad',  # Stellar radius
-            'disposition': 'pl_def_refname'  # Disposition
-        },
-        # TESS column names
-        'tess': {
-            'period': 'pl_orbper',
-            'duration': 'pl_trandur',
-            'depth': 'pl_trandep',
-            'prad': 'pl_rade',
-            'teq': 'pl_eqt',
-            'insol': 'pl_insol',
-            'steff': 'st_teff',
-            'slogg': 'st_logg',
-            'srad': 'st_rad',
-            'disposition': 'tfopwg_disp'
-        }
-    }
-    
-    # Process each dataset
+    # Each source is an incremental partition keyed on its content hash
+    processors = {'Kepler': process_kepler, 'K2': process_k2, 'TESS': process_tess}
     datasets = []
-    
-    # Kepler
-    if kepler_df is not None and not kepler_df.empty:
-        kepler_clean = process_kepler(kepler_df, common_features['kepler'])
-        kepler_clean['source'] = 'Kepler'
-        datasets.append(kepler_clean)
-        print(f"   ✅ Kepler: {len(kepler_clean)} samples")
-    
-    # K2
-    if k2_df is not None and not k2_df.empty:
-        k2_clean = process_k2(k2_df, common_features['k2'])
-        k2_clean['source'] = 'K2'
-        datasets.append(k2_clean)
-        print(f"   ✅ K2: {len(k2_clean)} samples")
-    
-    # TESS
-    if tess_df is not None and not tess_df.empty:
-        tess_clean = process_tess(tess_df, common_features['tess'])
-        tess_clean['source'] = 'TESS'
-        datasets.append(tess_clean)
-        print(f"   ✅ TESS: {len(tess_clean)} samples")
+    for name, process in processors.items():
+        partition = build_partition(name, process, results[name])
+        if partition is not None and not partition.empty:
+            datasets.append(partition)
     
     # Combine all datasets
     if datasets:
@@ -188,66 +190,57 @@ def create_advanced_features(df):
     """
     print("\n🔬 Creating advanced features...")
     
-    # Physics-based features
-    df['transit_depth_ratio'] = df['depth'] / df['prad']
-    df['stellar_density'] = 10**df['slogg'] / df['srad']**2
-    df['planet_density'] = df['prad']**3 / df['period']**2
-    df['irradiation_ratio'] = df['insol'] / df['teq']
-    df['semi_major_axis'] = (df['period'] * df['srad'])**(1/3)
+    # Same kernel as training and serving, so stored columns match the model's features
+    derived = list(DERIVED_FEATURES)
+    base = df[BASE_FEATURES].to_numpy(dtype=np.float64)
+    features = pd.DataFrame(compute_features(base, derived), columns=derived, index=df.index)
+    df = pd.concat([df.drop(columns=derived, errors='ignore'), features], axis=1)
     
-    # Statistical features
-    df['temp_ratio'] = df['teq'] / df['steff']
-    df['radius_ratio'] = df['prad'] / df['srad']
-    df['log_period'] = np.log10(df['period'])
-    df['log_insol'] = np.log10(df['insol'] + 1)
-    
-    print(f"✅ Created {9} advanced features")
+    print(f"✅ Created {len(derived)} advanced features")
     
     return df
 
 
 def main():
     """Main multi-dataset pipeline"""
+    parser = argparse.ArgumentParser(description="Download and unify the Kepler, K2 and TESS datasets")
+    parser.add_argument('--force', action='store_true', help="Reprocess even if no source changed")
+    parser.add_argument('--csv', action='store_true', help="Also export the unified dataset as CSV")
+    parser.add_argument('--outlier-mode', choices=OUTLIER_MODES, default='independent',
+                        help="independent: bounds from the full dataset (order-independent); "
+                             "sequential: legacy column-by-column filtering")
+    args = parser.parse_args()
+
     print("\n" + "🚀"*30)
     print(" "*8 + "EXOHUNT MULTI-DATASET PIPELINE")
     print("🚀"*30 + "\n")
     
     # Download all datasets
-    kepler_df = download_dataset(KEPLER_URL, "Kepler")
-    k2_df = download_dataset(K2_URL, "K2")
-    tess_df = download_dataset(TESS_URL, "TESS")
-    
-    # Unify datasets
-    unified_df = unify_datasets(kepler_df, k2_df, tess_df)
+    results = download_datasets()
+    if not args.force and OUTPUT_PATH.exists() and not any(r['changed'] for r in results.values()):
+        print(f"\n♻️  No source changed, keeping {OUTPUT_PATH} (use --force to rebuild)")
+        return
+
+    # Unify datasets (advanced features are computed per partition, for new rows only)
+    unified_df = unify_datasets(results)
     
     if unified_df.empty:
         print("❌ No data to process")
         return
     
-    # Create advanced features
-    unified_df = create_advanced_features(unified_df)
-    
-    # Remove outliers (IQR method)
-    print("\n🔬 Removing outliers...")
-    feature_cols = [c for c in unified_df.columns if c not in ['is_exoplanet', 'source', 'disposition']]
+    # Remove outliers (IQR method, one vectorized pass)
+    print(f"\n🔬 Removing outliers ({args.outlier_mode})...")
+    feature_cols = [c for c in unified_df.columns if c not in ['is_exoplanet', 'source', 'disposition', 'object_id']]
     
-    for col in feature_cols:
-        Q1 = unified_df[col].quantile(0.01)
-        Q3 = unified_df[col].quantile(0.99)
-        IQR = Q3 - Q1
-        lower = Q1 - 1.5 * IQR
-        upper = Q3 + 1.5 * IQR
-        
-        before = len(unified_df)
-        unified_df = unified_df[(unified_df[col] >= lower) & (unified_df[col] <= upper)]
-        removed = before - len(unified_df)
+    before = len(unified_df)
+    unified_df, rejected = filter_outliers(unified_df, feature_cols, mode=args.outlier_mode)
+    for col, removed in rejected.items():
         if removed > 0:
             print(f"   {col}: removed {removed} outliers")
+    print(f"   Total removed: {before - len(unified_df)} rows")
     
     # Save unified dataset
-    output_path = Path('data/processed/unified_exoplanets.csv')
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    unified_df.to_csv(output_path, index=False)
+    output_path = write_table(unified_df, OUTPUT_PATH, export_csv=args.csv)
     
     print(f"\n✅ Final unified dataset: {len(unified_df)} samples")
     print(f"   - Exoplanets: {unified_df['is_exoplanet'].sum()}")
@@ -260,5 +253,4 @@ def main():
 
 
 if __name__ == "__main__":
-    import numpy as np
     main()
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""Serving paths end to end: a tiny model served through EXOHUNT_ARTIFACT_SOURCE and FastAPI's TestClient"""
+
+import importlib
+import io
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import joblib
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from app.batching import MicroBatcher
+from app.executor import InferenceExecutor
+from app.features import BASE_FEATURES, compute_features
+from app.model_store import METADATA_FILE, MODEL_FILE, SCALER_FILE, write_manifest
+
+FEATURES = ['period', 'prad', 'teq', 'planet_density', 'log_period']
+
+
+def planet(i):
+    """Distinct, valid base values per index"""
+    return {'period': 1.0 + i, 'duration': 3.0, 'depth': 500.0 + 10 * i, 'prad': 0.5 + 0.3 * i,
+            'teq': 400.0 + 20 * i, 'insol': 50.0, 'steff': 5700.0, 'slogg': 4.4, 'srad': 1.0}
+
+
+@pytest.fixture(scope='module')
+def artifacts(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    base = rng.uniform(0.5, 5.0, size=(200, len(BASE_FEATURES))) * [10, 1, 300, 1, 300, 30, 1500, 1, 1]
+    X = compute_features(base, FEATURES)
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression().fit(scaler.transform(X), (base[:, 3] > 2.5).astype(int))
+
+    source = tmp_path_factory.mktemp('artifacts')
+    joblib.dump(model, source / MODEL_FILE)
+    joblib.dump(scaler, source / SCALER_FILE)
+    (source / METADATA_FILE).write_text(json.dumps({
+        'feature_names': FEATURES, 'decision_threshold': 0.5, 'metrics': {'f1_score': 1.0},
+    }))
+    write_manifest(source)
+
+    def expected(rows):
+        X_rows = compute_features(np.array([[row[f] for f in BASE_FEATURES] for row in rows]), FEATURES)
+        return model.predict_proba(scaler.transform(X_rows))[:, 1]
+
+    return source, expected
+
+
+@contextmanager
+def serve(source, model_dir, **env):
+    """Reimport api.main against `source` with extra EXOHUNT_* settings"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('EXOHUNT_ARTIFACT_SOURCE', str(source))
+        mp.setenv('EXOHUNT_MODEL_DIR', str(model_dir))
+        mp.setenv('EXOHUNT_CACHE_SIZE', '0')  # every request reaches the model
+        for name, value in env.items():
+            mp.setenv(name, value)
+        sys.modules.pop('api.main', None)
+        main = importlib.import_module('api.main')
+        with TestClient(main.app) as client:
+            yield main, client
+        main.inference.shutdown()
+
+
+@pytest.fixture(scope='module')
+def api(artifacts, tmp_path_factory):
+    source, expected = artifacts
+    with serve(source, tmp_path_factory.mktemp('model_cache')) as (main, client):
+        yield main, client, expected
+
+
+def test_concurrent_predictions_are_coalesced(api, monkeypatch):
+    main, client, expected = api
+    batcher = MicroBatcher(main.score_planets, max_batch_size=32, max_wait_ms=200)
+    monkeypatch.setattr(main, 'batcher', batcher)
+    client.get('/ready')  # load the model before timing the burst
+
+    planets = [planet(i) for i in range(8)]
+    with ThreadPoolExecutor(len(planets)) as pool:
+        responses = list(pool.map(lambda p: client.post('/predict', json=p), planets))
+
+    assert all(r.status_code == 200 for r in responses)
+    probabilities = [r.json()['probability_exoplanet'] for r in responses]
+    # Each caller gets its own row back, not a neighbour's
+    np.testing.assert_allclose(probabilities, expected(planets))
+    assert batcher.stats()['items'] == len(planets)
+    assert batcher.stats()['largest_batch'] > 1
+
+
+def test_saturated_executor_returns_503(api, monkeypatch):
+    main, client, _ = api
+    started, release = threading.Event(), threading.Event()
+
+    def blocked(rows):
+        started.set()
+        release.wait(10)
+        return [(True, 0.1, 0.9)] * len(rows)
+
+    monkeypatch.setattr(main, 'predict_rows', blocked)
+    monkeypatch.setattr(main, 'inference', InferenceExecutor('thread', max_workers=1, max_queue=0))
+    monkeypatch.setattr(main, 'batcher', MicroBatcher(main.score_planets, max_wait_ms=0))
+
+    with ThreadPoolExecutor(1) as pool:
+        first = pool.submit(client.post, '/predict', json=planet(0))
+        assert started.wait(10)
+        shed = client.post('/predict', json=planet(1))
+        release.set()
+        assert first.result().status_code == 200
+
+    assert shed.status_code == 503
+    assert shed.headers['Retry-After'] == '1'
+    assert main.inference.stats()['rejected'] == 1
+    main.inference.shutdown()
+
+
+def test_backlog_behind_a_micro_batch_is_shed(api, monkeypatch):
+    main, client, _ = api
+    started, release = threading.Event(), threading.Event()
+
+    def blocked(rows):
+        started.set()
+        release.wait(10)
+        return [(True, 0.1, 0.9)] * len(rows)
+
+    monkeypatch.setattr(main, 'predict_rows', blocked)
+    monkeypatch.setattr(main, 'inference', InferenceExecutor('thread', max_workers=1, max_queue=2))
+    monkeypatch.setattr(main, 'batcher', MicroBatcher(main.score_planets, max_batch_size=32, max_wait_ms=200))
+
+    with ThreadPoolExecutor(6) as pool:
+        first = pool.submit(client.post, '/predict', json=planet(0))
+        assert started.wait(10)
+        # The rest would coalesce into a single batch; only max_queue of them may wait
+        rest = [pool.submit(client.post, '/predict', json=planet(i)) for i in range(1, 6)]
+        deadline = time.monotonic() + 10
+        while main.inference.stats()['rejected'] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        statuses = sorted(r.result().status_code for r in [first] + rest)
+
+    assert statuses == [200, 200, 200, 503, 503, 503]
+    assert main.inference.stats()['rejected'] == 3
+    main.inference.shutdown()
+
+
+def test_batch_scores_in_order_and_enforces_limit(api, monkeypatch):
+    main, client, expected = api
+    monkeypatch.setattr(main, 'MAX_BATCH_SIZE', 4)
+    planets = [planet(i) for i in range(4)]
+
+    response = client.post('/predict/batch', json={'planets': planets})
+    assert response.status_code == 200
+    body = response.json()
+    assert body['count'] == 4
+    np.testing.assert_allclose([p['probability_exoplanet'] for p in body['predictions']], expected(planets))
+
+    too_many = client.post('/predict/batch', json={'planets': planets + [planet(4)]})
+    assert too_many.status_code == 413
+
+
+def test_file_scores_stream_in_order(api):
+    _, client, expected = api
+    planets = [planet(i) for i in range(7)]
+    rows = [[f'obj-{i}'] + [p[f] for f in BASE_FEATURES] for i, p in enumerate(planets)]
+    rows[3][2] = ''  # missing duration -> null score
+    csv_text = '\n'.join(','.join(map(str, row)) for row in [['object_id'] + BASE_FEATURES] + rows)
+
+    response = client.post('/predict/file?chunk_size=2',
+                           files={'file': ('catalog.csv', io.BytesIO(csv_text.encode()), 'text/csv')})
+    assert response.status_code == 200
+    assert response.headers['X-Catalog-Layout'] == 'unified'
+    records = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [r['row'] for r in records] == list(range(7))
+    assert [r['object_id'] for r in records] == [f'obj-{i}' for i in range(7)]
+    assert records[3]['probability_exoplanet'] is None
+    valid = [i for i in range(7) if i != 3]
+    np.testing.assert_allclose([records[i]['probability_exoplanet'] for i in valid],
+                               expected([planets[i] for i in valid]))
+
+
+def test_process_mode_loads_the_model_only_in_workers(artifacts, tmp_path):
+    source, expected = artifacts
+    with serve(source, tmp_path, EXOHUNT_EXECUTOR='process', EXOHUNT_INFERENCE_WORKERS='1') as (main, client):
+        assert client.get('/ready').status_code == 200
+        # The API process verified the artifacts but never unpickled the ensemble
+        assert main.model is None and main.predictor is None
+
+        root = client.get('/').json()
+        assert root['ready'] and root['warm']
+        assert 'worker_first_predict' in root['startup_profile']['phases']
+
+        response = client.post('/predict', json=planet(3))
+        assert response.status_code == 200
+        np.testing.assert_allclose(response.json()['probability_exoplanet'], expected([planet(3)])[0])
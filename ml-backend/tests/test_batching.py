@@ -0,0 +1,31 @@
+"""Micro-batcher bookkeeping: in-flight dispatches stay referenced until they finish"""
+
+import asyncio
+import gc
+
+from app.batching import MicroBatcher
+
+
+def test_dispatch_tasks_are_held_until_done():
+    release = asyncio.Event()
+
+    async def score(items):
+        await release.wait()
+        return [item * 2 for item in items]
+
+    async def scenario():
+        batcher = MicroBatcher(score, max_batch_size=4, max_wait_ms=0)
+        waiting = asyncio.gather(*(batcher.submit(i) for i in range(3)))
+        while not batcher._dispatching:
+            await asyncio.sleep(0)
+        gc.collect()
+        assert all(not task.done() for task in batcher._dispatching)
+
+        release.set()
+        assert await waiting == [0, 2, 4]
+        await asyncio.sleep(0)
+        assert not batcher._dispatching
+        return batcher.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats['items'] == 3
@@ -0,0 +1,89 @@
+"""Early stopping for every boosted library and warm starts from a saved booster"""
+
+import joblib
+import numpy as np
+import pytest
+import xgboost
+from catboost import CatBoostClassifier
+from lightgbm import LGBMClassifier
+from sklearn.datasets import make_classification
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from app.boosting import early_stop_fit, get_rounds, set_rounds
+from app.train import save_model, save_split, warm_start
+
+BOOSTERS = {
+    'xgboost': lambda: XGBClassifier(n_estimators=400, learning_rate=0.3, eval_metric='logloss', n_jobs=1),
+    'lightgbm': lambda: LGBMClassifier(n_estimators=400, learning_rate=0.3, verbose=-1, n_jobs=1),
+    'catboost': lambda: CatBoostClassifier(iterations=400, learning_rate=0.3, verbose=0, thread_count=1,
+                                           allow_writing_files=False),
+}
+
+
+def data(n=600, seed=0):
+    return make_classification(n_samples=n, n_features=6, n_informative=3, flip_y=0.2, random_state=seed)
+
+
+@pytest.mark.parametrize('kind', sorted(BOOSTERS))
+def test_early_stopping_caps_rounds(kind):
+    X, y = data()
+    model = BOOSTERS[kind]()
+    rounds = early_stop_fit(model, X, y, patience=5)
+    assert 0 < rounds < 400
+
+    # The fitted model predicts with the kept rounds, and refits use them as the budget
+    if kind == 'xgboost':
+        assert model.best_iteration + 1 == rounds
+        assert model.get_params()['early_stopping_rounds'] is None
+    elif kind == 'lightgbm':
+        assert model.best_iteration_ == rounds
+    else:
+        assert model.tree_count_ == rounds
+    set_rounds(model, rounds)
+    if kind != 'catboost':
+        assert get_rounds(model) == rounds
+
+
+def test_non_boosted_models_fit_normally():
+    from sklearn.linear_model import LogisticRegression
+    X, y = data()
+    model = LogisticRegression()
+    assert early_stop_fit(model, X, y) is None
+    assert hasattr(model, 'coef_')
+
+
+def test_warm_start_continues_the_saved_booster(tmp_path):
+    X, y = data(800, seed=1)
+    names = [f'f{i}' for i in range(X.shape[1])]
+    old_train, old_test, new = np.arange(500), np.arange(500, 600), np.arange(600, 800)
+
+    scaler = StandardScaler().fit(X[old_train])
+    previous = XGBClassifier(n_estimators=20, learning_rate=0.3, eval_metric='logloss', n_jobs=1)
+    previous.fit(scaler.transform(X[old_train]), y[old_train])
+    save_model(previous, scaler, {'early_stopping': {'rounds': 20}}, names, 'XGBoost', [], tmp_path)
+    save_split(X[old_train], y[old_train], X[old_test], y[old_test], tmp_path)
+
+    # Nothing new yet: nothing to train
+    assert warm_start(X[:600], y[:600], names, patience=5, models_dir=tmp_path, threads=1)
+
+    assert warm_start(X, y, names, patience=5, models_dir=tmp_path, threads=1)
+    continued = joblib.load(tmp_path / 'exoplanet_model.pkl')
+    # Boosting resumed from the previous 20 trees instead of starting over
+    assert continued.get_booster().num_boosted_rounds() > 20
+    rows = xgboost.DMatrix(scaler.transform(X[new]))
+    np.testing.assert_array_equal(continued.get_booster()[:20].predict(rows, output_margin=True),
+                                  previous.get_booster().predict(rows, output_margin=True))
+
+
+def test_warm_start_refuses_changed_rows(tmp_path):
+    X, y = data(400, seed=2)
+    names = [f'f{i}' for i in range(X.shape[1])]
+    scaler = StandardScaler().fit(X[:300])
+    previous = XGBClassifier(n_estimators=10, eval_metric='logloss', n_jobs=1).fit(scaler.transform(X[:300]), y[:300])
+    save_model(previous, scaler, {}, names, 'XGBoost', [], tmp_path)
+    save_split(X[:300], y[:300], X[300:], y[300:], tmp_path)
+
+    X_changed = X.copy()
+    X_changed[0, 0] += 1.0
+    assert not warm_start(X_changed, y, names, patience=5, models_dir=tmp_path, threads=1)
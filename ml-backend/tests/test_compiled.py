@@ -0,0 +1,63 @@
+"""Parity of the compiled inference engine with sklearn's StackingClassifier"""
+
+import numpy as np
+import pytest
+from catboost import CatBoostClassifier
+from lightgbm import LGBMClassifier
+from sklearn.datasets import make_classification
+from sklearn.ensemble import (
+    ExtraTreesClassifier, GradientBoostingClassifier,
+    RandomForestClassifier, StackingClassifier
+)
+from xgboost import XGBClassifier
+
+from app.compiled import PARITY_TOLERANCE, compile_model, compile_verified, max_parity_error
+
+
+@pytest.fixture(scope='module')
+def stacking():
+    X, y = make_classification(n_samples=600, n_features=12, n_informative=6, random_state=0)
+    base_models = [
+        ('rf', RandomForestClassifier(n_estimators=15, max_depth=8, random_state=0)),
+        ('xgb', XGBClassifier(n_estimators=15, max_depth=4, eval_metric='logloss')),
+        ('lgbm', LGBMClassifier(n_estimators=15, num_leaves=15, verbose=-1)),
+        ('catboost', CatBoostClassifier(iterations=15, depth=4, verbose=0, allow_writing_files=False)),
+        ('extra', ExtraTreesClassifier(n_estimators=15, max_depth=8, random_state=0)),
+    ]
+    meta_model = GradientBoostingClassifier(n_estimators=20, max_depth=3, random_state=0)
+    model = StackingClassifier(estimators=base_models, final_estimator=meta_model, cv=3)
+    return model.fit(X, y), X
+
+
+def test_compiled_matches_sklearn_probabilities(stacking):
+    model, X = stacking
+    compiled = compile_model(model)
+    for est, engine in zip(model.estimators_, compiled.base_models):
+        np.testing.assert_allclose(engine.predict_proba1(X), est.predict_proba(X)[:, 1], atol=PARITY_TOLERANCE)
+    assert max_parity_error(model, compiled, X) < PARITY_TOLERANCE
+
+
+def test_single_row_and_large_batch_paths(stacking):
+    model, X = stacking
+    compiled = compile_verified(model, X.shape[1], max_rows=32)
+    np.testing.assert_allclose(compiled.predict_proba(X[:1]), model.predict_proba(X[:1]), atol=PARITY_TOLERANCE)
+    # Above max_rows the original ensemble answers
+    np.testing.assert_array_equal(compiled.predict_proba(X), model.predict_proba(X))
+
+
+def test_unsupported_estimator_raises():
+    from sklearn.linear_model import LogisticRegression
+    X, y = make_classification(n_samples=50, random_state=0)
+    with pytest.raises(NotImplementedError):
+        compile_model(LogisticRegression().fit(X, y))
+
+
+def test_predict_uses_threshold_inclusively(stacking):
+    model, X = stacking
+    compiled = compile_model(model, threshold=0.7)
+    p = compiled.predict_proba(X)[:, 1]
+    np.testing.assert_array_equal(compiled.predict(X), model.classes_[(p >= 0.7).astype(int)])
+
+    # A probability of exactly the threshold is positive, as in EnsemblePredictor
+    compiled.predict_proba = lambda X: np.array([[0.3, 0.7]])
+    assert compiled.predict(X[:1])[0] == model.classes_[1]
@@ -0,0 +1,145 @@
+"""Downloader behaviour against a local HTTP stand-in for the NASA archive"""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.downloader import fetch, fetch_all, load_meta, part_path, save_meta
+
+
+class ArchiveHandler(BaseHTTPRequestHandler):
+    # {path: (body, etag or None)}, set by the fixture
+    files = {}
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body, etag = self.files[self.path]
+        self.requests_seen.append((self.path, dict(self.headers)))
+
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        range_header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if range_header and (if_range is None or if_range == etag):
+            start = int(range_header.split('=')[1].rstrip('-'))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(body)}')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+            body = body[start:]
+        else:
+            self.send_response(200)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def archive():
+    ArchiveHandler.files = {}
+    ArchiveHandler.requests_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ArchiveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield ArchiveHandler, f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_revalidation_skips_unchanged_content(archive, tmp_path):
+    handler, base = archive
+    body = b'kepoi_name,koi_period\nK1,1.5\n' * 1000
+    handler.files['/kepler'] = (body, '"v1"')
+    target = tmp_path / 'kepler_raw.csv'
+
+    first = fetch(f'{base}/kepler', target, chunk_size=1024)
+    assert first['status'] == 'downloaded' and first['changed']
+    assert target.read_bytes() == body
+    assert first['sha256'] == hashlib.sha256(body).hexdigest()
+
+    second = fetch(f'{base}/kepler', target)
+    assert second['status'] == 'not_modified' and not second['changed']
+    assert handler.requests_seen[-1][1].get('If-None-Match') == '"v1"'
+
+    # Without validators the body is re-downloaded but recognised as identical
+    handler.files['/kepler'] = (body, None)
+    third = fetch(f'{base}/kepler', target)
+    assert third['status'] == 'downloaded' and not third['changed']
+
+    handler.files['/kepler'] = (body + b'K2,2.5\n', '"v2"')
+    assert fetch(f'{base}/kepler', target)['changed']
+
+
+def test_interrupted_download_resumes(archive, tmp_path):
+    handler, base = archive
+    body = bytes(range(256)) * 400
+    handler.files['/toi'] = (body, '"toi-1"')
+    target = tmp_path / 'tess_raw.csv'
+
+    # Simulate a previous run that stopped part-way through
+    part_path(target).write_bytes(body[:30000])
+    save_meta(target, {'url': f'{base}/toi', 'pending': {'etag': '"toi-1"', 'last_modified': None}})
+
+    result = fetch(f'{base}/toi', target)
+    assert result['status'] == 'resumed' and result['changed']
+    assert handler.requests_seen[-1][1].get('Range') == 'bytes=30000-'
+    assert target.read_bytes() == body
+    assert not part_path(target).exists()
+    assert 'pending' not in load_meta(target)
+
+    # A partial from an older version is discarded and fetched in full
+    part_path(target).write_bytes(b'stale')
+    save_meta(target, {**load_meta(target), 'pending': {'etag': '"toi-0"', 'last_modified': None}})
+    assert fetch(f'{base}/toi', target)['status'] == 'downloaded'
+    assert target.read_bytes() == body
+
+
+def test_partial_without_validator_or_complete_restarts(archive, tmp_path):
+    handler, base = archive
+    body = b'toi,pl_orbper\n1.01,3.2\n' * 500
+    handler.files['/toi'] = (body, None)
+    target = tmp_path / 'tess_raw.csv'
+
+    # No ETag / Last-Modified: a leftover partial may be from another version, never resume it
+    part_path(target).write_bytes(b'older result set')
+    save_meta(target, {'url': f'{base}/toi', 'pending': {'etag': None, 'last_modified': None}})
+    assert fetch(f'{base}/toi', target)['status'] == 'downloaded'
+    assert 'Range' not in handler.requests_seen[-1][1]
+    assert target.read_bytes() == body
+
+    # A complete partial gets 416 from the server and is fetched again in full
+    handler.files['/toi'] = (body, '"toi-2"')
+    part_path(target).write_bytes(body)
+    save_meta(target, {**load_meta(target), 'pending': {'etag': '"toi-2"', 'last_modified': None}})
+    assert fetch(f'{base}/toi', target)['status'] == 'downloaded'
+    assert target.read_bytes() == body
+    assert not part_path(target).exists()
+
+
+def test_fetch_all_is_concurrent_and_isolates_failures(archive, tmp_path):
+    handler, base = archive
+    handler.files['/kepler'] = (b'a\n1\n', '"k"')
+    handler.files['/k2'] = (b'b\n2\n', None)
+    sources = {
+        'Kepler': (f'{base}/kepler', tmp_path / 'kepler_raw.csv'),
+        'K2': (f'{base}/k2', tmp_path / 'k2_raw.csv'),
+        'TESS': ('http://127.0.0.1:1/toi', tmp_path / 'tess_raw.csv'),
+    }
+
+    results = fetch_all(sources, timeout=5)
+    assert results['Kepler']['changed'] and results['K2']['changed']
+    assert results['TESS']['status'] == 'failed' and 'error' in results['TESS']
+    assert (tmp_path / 'k2_raw.csv').read_bytes() == b'b\n2\n'
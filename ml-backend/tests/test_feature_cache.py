@@ -0,0 +1,64 @@
+"""Memory-mapped feature-matrix cache: hits, misses and invalidation"""
+
+import numpy as np
+
+from app import feature_cache
+from app.feature_cache import FeatureCache
+
+NAMES = ['period', 'prad', 'teq']
+
+
+def dataset(tmp_path, text='period,prad,teq\n1,2,3\n'):
+    path = tmp_path / 'unified.csv'
+    path.write_text(text)
+    return path
+
+
+def test_miss_builds_then_hit_memory_maps(tmp_path):
+    cache = FeatureCache(tmp_path / 'cache')
+    path = dataset(tmp_path)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return np.arange(12.0).reshape(4, 3), np.array([0, 1, 0, 1])
+
+    X, y, names, hit = cache.get_or_build(path, NAMES, build)
+    assert not hit and builds == [1]
+
+    X, y, names, hit = cache.get_or_build(path, NAMES, build)
+    assert hit and builds == [1]
+    assert isinstance(X, np.memmap) and not X.flags.writeable
+    np.testing.assert_array_equal(X, np.arange(12.0).reshape(4, 3))
+    assert y.tolist() == [0, 1, 0, 1] and names == NAMES
+    assert (cache.hits, cache.misses) == (2, 1)  # save() reopens through load()
+
+
+def test_inputs_and_feature_version_change_the_key(tmp_path, monkeypatch):
+    cache = FeatureCache(tmp_path / 'cache')
+    path = dataset(tmp_path)
+    key = cache.key(path, NAMES)
+    cache.save(key, np.ones((2, 3)), np.zeros(2), NAMES)
+
+    assert cache.key(path, NAMES) == key
+    assert cache.key(path, NAMES[:2]) != key
+    assert cache.key(path, NAMES, imbalance='smote') != key
+    assert FeatureCache(tmp_path / 'cache', dtype=np.float32).key(path, NAMES) != key
+
+    monkeypatch.setattr(feature_cache, 'FEATURE_VERSION', feature_cache.FEATURE_VERSION + 1)
+    assert cache.load(cache.key(path, NAMES)) is None
+    monkeypatch.undo()
+
+    dataset(tmp_path, 'period,prad,teq\n1,2,4\n')
+    assert cache.load(cache.key(path, NAMES)) is None
+
+
+def test_incomplete_entry_is_a_miss(tmp_path):
+    cache = FeatureCache(tmp_path / 'cache')
+    key = cache.key(dataset(tmp_path), NAMES)
+    X_path, _, meta_path = cache._paths(key)
+    cache.save(key, np.ones((2, 3)), np.zeros(2), NAMES)
+
+    # meta.json marks a complete entry; without it the arrays are rebuilt
+    meta_path.unlink()
+    assert X_path.exists() and cache.load(key) is None
@@ -0,0 +1,34 @@
+"""Subsampled, cached mutual-information feature scoring"""
+
+from sklearn.datasets import make_classification
+
+from app.feature_scoring import mutual_information, select_top_k, stratified_sample
+from app.parallelism import ParallelPlan
+
+
+def test_stratified_sample_keeps_class_ratio():
+    X, y = make_classification(n_samples=2000, n_features=4, weights=[0.7], random_state=0)
+    X_sample, y_sample = stratified_sample(X, y, 500)
+    assert len(y_sample) == 500
+    assert abs(y_sample.mean() - y.mean()) < 0.01
+
+
+def test_scores_are_cached_and_k_is_capped(tmp_path):
+    X, y = make_classification(n_samples=800, n_features=6, n_informative=2, n_redundant=0,
+                               shuffle=False, random_state=0)
+    names = [f'f{i}' for i in range(6)]
+    plan = ParallelPlan(cores=1)
+    scores = mutual_information(X, y, names, sample_size=400, cache_dir=tmp_path, plan=plan)
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+    # Second run is a cache hit: no new stage is planned, same scores
+    again = mutual_information(X, y, names, sample_size=400, cache_dir=tmp_path, plan=plan)
+    assert again == scores
+    assert len(plan.stages) == 1
+
+    # The informative columns come first with shuffle=False
+    assert select_top_k(scores, names, 2) == ['f0', 'f1']
+    assert select_top_k(scores, names, 35) == names
+    # Different data is a different entry
+    mutual_information(X[::-1], y[::-1], names, sample_size=400, cache_dir=tmp_path, plan=plan)
+    assert len(list(tmp_path.glob('*.json'))) == 2
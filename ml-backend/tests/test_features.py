@@ -0,0 +1,70 @@
+"""Parity of the shared feature kernel with the previous per-row implementation"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.features import BASE_FEATURES, FEATURE_NAMES, compute_features
+from app.train_advanced import AdvancedExoplanetTrainer
+
+
+def legacy_engineer_features(row):
+    """Row-by-row formulas formerly in api/main.py and train_advanced.py"""
+    period, duration, depth, prad, teq, insol, steff, slogg, srad = row
+    f = dict(zip(BASE_FEATURES, row))
+    f['transit_depth_ratio'] = depth / (prad**2 + 1e-10)
+    f['duration_period_ratio'] = duration / (period + 1e-10)
+    f['stellar_density'] = 10**slogg / (srad**2 + 1e-10)
+    f['stellar_luminosity'] = (srad**2) * (steff**4)
+    f['planet_density'] = (prad**3) / (period**2 + 1e-10)
+    f['equilibrium_temp_ratio'] = teq / (steff + 1e-10)
+    f['irradiation_ratio'] = insol / (teq + 1e-10)
+    f['semi_major_axis'] = ((period / 365.25)**2 * srad)**(1/3)
+    f['orbital_velocity'] = (2 * np.pi * f['semi_major_axis']) / (period + 1e-10)
+    f['habitable_zone_distance'] = f['semi_major_axis'] / (np.sqrt(insol) + 1e-10)
+    f['surface_gravity'] = slogg * (prad**2)
+    f['log_period'] = np.log10(period + 1)
+    f['log_insol'] = np.log10(insol + 1)
+    f['log_depth'] = np.log10(depth + 1)
+    f['sqrt_prad'] = np.sqrt(prad)
+    f['prad_teq_interaction'] = prad * teq
+    f['period_depth_interaction'] = period * depth
+    f['insol_steff_interaction'] = insol * steff
+    f['period_squared'] = period**2
+    f['prad_squared'] = prad**2
+    f['depth_squared'] = depth**2
+    return f
+
+
+@pytest.fixture
+def base():
+    rng = np.random.default_rng(0)
+    low = np.array([0.5, 0.5, 10, 0.5, 200, 0.1, 3000, 3.5, 0.2])
+    high = np.array([500, 15, 20000, 20, 3000, 5000, 9000, 5.0, 3.0])
+    return rng.uniform(low, high, size=(200, len(BASE_FEATURES)))
+
+
+def test_kernel_matches_legacy_rows(base):
+    X = compute_features(base)
+    expected = np.array([[legacy_engineer_features(row)[name] for name in FEATURE_NAMES] for row in base])
+    assert X.shape == (len(base), 30)
+    np.testing.assert_allclose(X, expected, rtol=1e-12)
+
+
+def test_kernel_respects_feature_order_and_out(base):
+    names = ['log_depth', 'period', 'orbital_velocity', 'prad_squared']
+    out = np.empty((len(base), len(names)))
+    X = compute_features(base, names, out=out)
+    assert X is out
+    np.testing.assert_allclose(X, compute_features(base)[:, [FEATURE_NAMES.index(n) for n in names]])
+
+
+def test_trainer_uses_kernel_for_both_column_layouts(base):
+    trainer = AdvancedExoplanetTrainer()
+    unified = pd.DataFrame(base, columns=BASE_FEATURES)
+    kepler = unified.add_prefix('koi_')
+
+    for df in (unified, kepler):
+        X = trainer.engineer_advanced_features(df)
+        assert list(X.columns) == FEATURE_NAMES
+        np.testing.assert_allclose(X.to_numpy(), compute_features(base))
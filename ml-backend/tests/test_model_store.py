@@ -0,0 +1,66 @@
+"""Local-first, checksum-verified artifact resolution against a LocalFetcher stand-in for the hub"""
+
+import pytest
+
+from app.model_store import (
+    ARTIFACTS, MANIFEST_FILE, MODEL_FILE, ArtifactVerificationError, LocalFetcher, ModelStore, write_manifest,
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    directory = tmp_path / 'hub'
+    directory.mkdir()
+    for name in ARTIFACTS:
+        (directory / name).write_bytes(f'{name} v1'.encode())
+    write_manifest(directory)
+    return directory
+
+
+def make_store(tmp_path, source, **kwargs):
+    return ModelStore(tmp_path / 'cache', LocalFetcher(source), **kwargs)
+
+
+def test_miss_fetches_then_hits(tmp_path, source):
+    store = make_store(tmp_path, source)
+    paths = store.resolve()
+    assert store.last_report['cache_misses'] == len(ARTIFACTS)
+    assert paths[MODEL_FILE].read_bytes() == b'exoplanet_model_advanced.pkl v1'
+    assert (tmp_path / 'cache' / MANIFEST_FILE).exists()
+
+    # The source disappearing does not matter once everything is cached and verified
+    for path in source.iterdir():
+        path.unlink()
+    store.resolve()
+    assert (store.last_report['cache_hits'], store.last_report['cache_misses']) == (len(ARTIFACTS), 0)
+
+
+def test_corrupt_cached_file_is_refetched(tmp_path, source):
+    store = make_store(tmp_path, source)
+    store.resolve()
+    (tmp_path / 'cache' / MODEL_FILE).write_bytes(b'truncated')
+
+    paths = store.resolve()
+    assert store.last_report['cache_misses'] == 1
+    assert paths[MODEL_FILE].read_bytes() == b'exoplanet_model_advanced.pkl v1'
+
+
+def test_checksum_mismatch_raises(tmp_path, source):
+    (source / MODEL_FILE).write_bytes(b'tampered')
+    with pytest.raises(ArtifactVerificationError, match='Checksum mismatch'):
+        make_store(tmp_path, source).resolve()
+
+
+def test_missing_remote_manifest(tmp_path, source):
+    (source / MANIFEST_FILE).unlink()
+    with pytest.raises(ArtifactVerificationError, match=MANIFEST_FILE):
+        make_store(tmp_path, source).resolve()
+
+    # Opting in pins the downloaded files; later tampering with the cache is caught
+    store = make_store(tmp_path, source, allow_unverified=True)
+    store.resolve()
+    assert store.last_report['verified'] is False
+    (tmp_path / 'cache' / MODEL_FILE).write_bytes(b'tampered')
+    store.resolve()
+    assert store.last_report['cache_misses'] == 1
+    assert (tmp_path / 'cache' / MODEL_FILE).read_bytes() == b'exoplanet_model_advanced.pkl v1'
@@ -0,0 +1,60 @@
+"""Core-budget plan: nested levels never oversubscribe the budget"""
+
+from sklearn.ensemble import RandomForestClassifier, StackingClassifier
+from sklearn.linear_model import LogisticRegression
+
+from app.parallelism import ParallelPlan
+
+
+def test_split_never_oversubscribes():
+    for cores in (1, 2, 7, 16):
+        plan = ParallelPlan(cores)
+        for tasks in (1, 3, 30):
+            outer, inner = plan.split('stage', tasks)
+            assert outer <= tasks
+            assert outer * inner <= cores
+        assert plan.split('capped', 30, outer=2) == (min(2, cores), cores // min(2, cores))
+
+
+def test_apply_sets_nested_n_jobs():
+    stack = StackingClassifier([('rf', RandomForestClassifier(n_jobs=-1))], final_estimator=LogisticRegression())
+    ParallelPlan(4).apply(stack, 2)
+    assert stack.n_jobs == 2
+    assert stack.named_estimators['rf'].n_jobs == 2
+
+
+def test_pinned_keeps_learner_backends():
+    from joblib.parallel import LokyBackend, ThreadingBackend, get_active_backend
+
+    from app.parallelism import loky_pool, pinned
+
+    # sklearn forests ask for threads; pinning must not push them into loky processes
+    with pinned(2), loky_pool(1, 2):
+        assert isinstance(get_active_backend(prefer='threads')[0], ThreadingBackend)
+    with loky_pool(2, 1):
+        assert isinstance(get_active_backend()[0], LokyBackend)
+
+
+def test_apply_resets_fitted_catboost_and_ensemble_copies():
+    import numpy as np
+    from catboost import CatBoostClassifier
+    from sklearn.ensemble import VotingClassifier
+
+    from app.score_catalog import single_threaded
+
+    X, y = np.random.default_rng(0).random((60, 3)), np.arange(60) % 2
+    vote = VotingClassifier([('rf', RandomForestClassifier(n_estimators=5)),
+                             ('cat', CatBoostClassifier(iterations=5, verbose=0, allow_writing_files=False))],
+                            voting='soft')
+    ParallelPlan(4).apply(vote, 1)
+    vote.fit(X, y)
+
+    # Saved models use every core again, including the fitted copies and CatBoost
+    ParallelPlan(4).apply(vote, -1)
+    fitted_rf, fitted_cat = vote.named_estimators_['rf'], vote.named_estimators_['cat']
+    assert fitted_rf.n_jobs == -1
+    assert fitted_cat.get_params().get('thread_count', -1) == -1
+
+    single_threaded(vote)
+    assert fitted_rf.n_jobs == 1 and fitted_cat.get_params()['thread_count'] == 1
+    assert vote.predict_proba(X).shape == (60, 2)
@@ -0,0 +1,44 @@
+"""Incremental partition merge by stable object ID"""
+
+import pandas as pd
+
+from app.partitions import load_partition, merge_partition, save_partition, stable_ids
+
+
+calls = []
+
+
+def add_features(df):
+    calls.append(len(df))
+    return df.assign(ratio=df['depth'] / df['period'])
+
+
+def test_merge_only_recomputes_changed_rows(tmp_path):
+    old = pd.DataFrame({'object_id': ['T:1', 'T:2', 'T:3'], 'period': [1.0, 2.0, 3.0],
+                        'depth': [10.0, 20.0, 30.0], 'disposition': ['PC', 'FP', 'PC']})
+    path = tmp_path / 'tess.parquet'
+    stored, _ = merge_partition(None, old, ['period', 'depth', 'disposition'], add_features)
+    save_partition(stored, path, 'sha-1')
+    assert load_partition(path, 'sha-2') is None
+
+    new = pd.DataFrame({'object_id': ['T:4', 'T:3', 'T:1'], 'period': [4.0, 3.0, 1.0],
+                        'depth': [40.0, 33.0, 10.0], 'disposition': ['PC', 'PC', 'PC']})
+    calls.clear()
+    merged, stats = merge_partition(load_partition(path, 'sha-1'), new, ['period', 'depth', 'disposition'], add_features)
+
+    assert stats == {'unchanged': 1, 'updated': 1, 'added': 1, 'removed': 1}
+    assert calls == [2]
+    assert merged['object_id'].tolist() == ['T:1', 'T:3', 'T:4']
+    assert merged['ratio'].tolist() == [10.0, 11.0, 10.0]
+
+
+def test_stable_ids_disambiguate_repeats():
+    assert stable_ids('K2', ['a', 'b', 'a']).tolist() == ['K2:a', 'K2:b', 'K2:a#1']
+
+
+def test_column_map_change_invalidates_partition(tmp_path):
+    path = tmp_path / 'tess.parquet'
+    frame = pd.DataFrame({'object_id': ['T:1'], 'period': [1.0], 'depth': [10.0]})
+    save_partition(frame, path, 'sha-1', {'duration': 'pl_trandur'})
+    assert load_partition(path, 'sha-1', {'duration': 'pl_trandur'}) is not None
+    assert load_partition(path, 'sha-1', {'duration': 'pl_trandurh'}) is None
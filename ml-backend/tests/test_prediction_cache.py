@@ -0,0 +1,66 @@
+"""LRU + TTL prediction cache: eviction order, expiry, rounding and model-version invalidation"""
+
+import pytest
+
+from app import prediction_cache
+from app.prediction_cache import PredictionCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = PredictionCache(max_size=2)
+    a, b, c = (cache.key([v]) for v in (1.0, 2.0, 3.0))
+    cache.put(a, 'a')
+    cache.put(b, 'b')
+    assert cache.get(a) == 'a'  # a is now more recent than b
+
+    cache.put(c, 'c')
+    assert cache.get(b) is None
+    assert cache.get(a) == 'a' and cache.get(c) == 'c'
+    assert cache.stats()['size'] == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(ttl_seconds=10)
+    key = cache.key([1.0])
+    cache.put(key, 'scored')
+
+    clock[0] += 10
+    assert cache.get(key) == 'scored'
+    clock[0] += 0.5
+    assert cache.get(key) is None
+    assert cache.stats()['size'] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_rounding_shares_entries_only_within_significant_digits():
+    cache = PredictionCache(significant_digits=3)
+    assert cache.key([1.2341, 500.04]) == cache.key([1.2344, 499.96])
+    assert cache.key([1.2341]) != cache.key([1.2351])
+
+
+def test_reset_to_new_model_version_misses():
+    cache = PredictionCache()
+    cache.reset('v1')
+    old = cache.key([1.0, 2.0])
+    cache.put(old, 'v1 score')
+
+    cache.reset('v2')
+    assert cache.get(old) is None
+    # The same inputs under the new model get a different key
+    new = cache.key([1.0, 2.0])
+    assert new != old and cache.get(new) is None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = PredictionCache(max_size=0)
+    key = cache.key([1.0])
+    cache.put(key, 'scored')
+    assert cache.get(key) is None
+    assert cache.stats()['size'] == 0
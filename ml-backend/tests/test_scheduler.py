@@ -0,0 +1,55 @@
+"""Process-per-job scheduler: nested loky pools and memmap arguments by reference"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+from joblib import Parallel, delayed
+
+from app.scheduler import JobScheduler
+
+
+def worker_pids(n_jobs, threads):
+    return os.getpid(), set(Parallel(n_jobs=n_jobs)(delayed(os.getpid)() for _ in range(8)))
+
+
+def describe(X, threads):
+    return type(X).__name__, str(X.filename), float(X.sum())
+
+
+def test_jobs_can_run_loky_pools():
+    outcome = JobScheduler(cores=2, parallel=1).run({'cv': (worker_pids, (2,))})['cv']
+    assert outcome['status'] == 'ok'
+    job_pid, pids = outcome['result']
+    # Folds ran in loky workers, not serially inside the job
+    assert job_pid not in pids
+
+
+def test_memmap_arguments_are_reopened_in_place(tmp_path):
+    path = tmp_path / 'X.npy'
+    np.save(path, np.arange(12.0).reshape(4, 3))
+    X = np.load(path, mmap_mode='r')
+
+    outcomes = JobScheduler(cores=1).run({'whole': (describe, (X,)), 'slice': (describe, (X[1:],))})
+    assert outcomes['whole']['result'] == ('memmap', str(path), 66.0)
+    # Views are not whole files, so they are pickled as before
+    assert outcomes['slice']['result'][2] == 63.0
+
+
+def test_script_functions_reach_nested_loky_workers(tmp_path):
+    # train.py runs as a script: its job and fold functions live in __main__ / __mp_main__
+    script = tmp_path / 'train_like.py'
+    script.write_text(
+        "import sys\n"
+        f"sys.path.insert(0, {str(Path(__file__).resolve().parent.parent)!r})\n"
+        "from joblib import Parallel, delayed\n"
+        "from app.scheduler import JobScheduler\n\n"
+        "def square(x):\n    return x * x\n\n"
+        "def job(n, threads):\n    return Parallel(n_jobs=2)(delayed(square)(i) for i in range(n))\n\n"
+        "if __name__ == '__main__':\n"
+        "    print(JobScheduler(cores=2, parallel=1).run({'job': (job, (4,))})['job'])\n"
+    )
+    output = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=120).stdout
+    assert "'status': 'ok'" in output and '[0, 1, 4, 9]' in output
@@ -0,0 +1,50 @@
+"""Offline catalog scoring end to end: CSV in, scored CSV out through the worker pool"""
+
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from app.features import BASE_FEATURES, compute_features
+from app.model_store import METADATA_FILE, MODEL_FILE, SCALER_FILE, write_manifest
+from app.score_catalog import OUTPUT_COLUMNS, score_catalog
+
+FEATURES = ['period', 'prad', 'teq', 'planet_density', 'log_period']
+
+
+def test_csv_catalog_is_scored_in_order(tmp_path):
+    rng = np.random.default_rng(0)
+    base = rng.uniform(0.5, 5.0, size=(50, len(BASE_FEATURES))) * [10, 1, 300, 1, 300, 30, 1500, 1, 1]
+    X = compute_features(base, FEATURES)
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression().fit(scaler.transform(X), (base[:, 3] > 2.5).astype(int))
+
+    model_dir = tmp_path / 'model'
+    model_dir.mkdir()
+    joblib.dump(model, model_dir / MODEL_FILE)
+    joblib.dump(scaler, model_dir / SCALER_FILE)
+    (model_dir / METADATA_FILE).write_text(json.dumps({'feature_names': FEATURES, 'decision_threshold': 0.5}))
+    write_manifest(model_dir)
+
+    catalog = pd.DataFrame(base, columns=BASE_FEATURES)
+    catalog.insert(0, 'object_id', [f'obj-{i}' for i in range(len(catalog))])
+    catalog.loc[7, 'depth'] = np.nan  # missing input -> left unscored
+    catalog.to_csv(tmp_path / 'catalog.csv', index=False)
+
+    summary = score_catalog(tmp_path / 'catalog.csv', tmp_path / 'scores.csv', model_dir, workers=2, chunk_size=8)
+    assert (summary['rows'], summary['scored'], summary['skipped']) == (50, 49, 1)
+    assert summary['model_version'] is not None
+
+    scores = pd.read_csv(tmp_path / 'scores.csv')
+    assert list(scores.columns) == OUTPUT_COLUMNS
+    assert scores['row'].tolist() == list(range(50))
+    assert scores['object_id'].tolist() == catalog['object_id'].tolist()
+    assert scores.loc[7].isna()[['is_exoplanet', 'probability_exoplanet']].all()
+
+    valid = np.arange(50) != 7
+    expected = model.predict_proba(scaler.transform(X[valid]))[:, 1]
+    np.testing.assert_allclose(scores['probability_exoplanet'][valid], expected)
+    assert (scores['is_exoplanet'][valid].astype(bool) == (expected >= 0.5)).all()
@@ -0,0 +1,95 @@
+"""Cached out-of-fold stacking: reuse across runs and meta-model swaps, compiled-engine compatibility"""
+
+import numpy as np
+from lightgbm import LGBMClassifier
+from sklearn.datasets import make_classification
+from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.model_selection import cross_val_predict
+
+from app.compiled import PARITY_TOLERANCE, compile_model, max_parity_error
+from app.parallelism import ParallelPlan
+from app.stacking import StackingTrainer, fold_plan
+
+
+def make_trainer(cache_dir, sampler=None):
+    return StackingTrainer([
+        ('rf', RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0)),
+        ('lgbm', LGBMClassifier(n_estimators=15, num_leaves=15, verbose=-1)),
+        ('extra', ExtraTreesClassifier(n_estimators=15, max_depth=6, random_state=0)),
+    ], cache_dir=cache_dir, plan=ParallelPlan(cores=1), sampler=sampler)
+
+
+def test_oof_matches_cross_val_predict_and_is_reused(tmp_path):
+    X, y = make_classification(n_samples=300, n_features=8, random_state=0)
+    folds = fold_plan(y)
+
+    first = make_trainer(tmp_path)
+    oof = first.oof_matrix(X, y, folds)
+    rf = first.estimators[0][1]
+    expected = cross_val_predict(rf, X, y, cv=folds, method='predict_proba')[:, 1]
+    np.testing.assert_allclose(oof[:, 0], expected)
+    assert (first.hits, first.misses) == (0, 3)
+
+    # A new trainer (new run) with a different meta-model fits no base learner
+    second = make_trainer(tmp_path)
+    model = second.fit(X, y, RandomForestClassifier(n_estimators=10, random_state=0), folds)
+    scores = second.cross_validate(X, y, GradientBoostingClassifier(n_estimators=10), folds)
+    assert (second.hits, second.misses) == (3, 0)
+    assert len(scores) == len(folds)
+    assert type(model.final_estimator_).__name__ == 'RandomForestClassifier'
+
+
+def test_fitted_stack_compiles(tmp_path):
+    X, y = make_classification(n_samples=300, n_features=8, random_state=1)
+    model = make_trainer(tmp_path).fit(X, y, GradientBoostingClassifier(n_estimators=10, random_state=0), fold_plan(y))
+    assert model.stack_method_ == ['predict_proba'] * 3
+    compiled = compile_model(model)
+    assert max_parity_error(model, compiled, X) < PARITY_TOLERANCE
+
+
+def test_fold_resampling_is_cached_separately(tmp_path):
+    from imblearn.under_sampling import RandomUnderSampler
+
+    X, y = make_classification(n_samples=300, n_features=8, weights=[0.8], random_state=2)
+    folds = fold_plan(y)
+    plain = make_trainer(tmp_path)
+    balanced = make_trainer(tmp_path, sampler=RandomUnderSampler(random_state=0))
+
+    oof_plain = plain.oof_matrix(X, y, folds)
+    oof_balanced = balanced.oof_matrix(X, y, folds)
+    assert balanced.misses == 3  # no reuse of the unresampled entries
+    assert oof_balanced.shape == oof_plain.shape  # every original row still gets an OOF score
+    # Undersampled learners see balanced classes, so they score the positives higher on average
+    assert oof_balanced[y == 1].mean() > oof_plain[y == 1].mean()
+    assert balanced.resample_seconds > 0
+
+
+class CountingForest(RandomForestClassifier):
+    """Random forest that counts predict_proba calls made in this process"""
+
+    calls = 0
+
+    def predict_proba(self, X):
+        CountingForest.calls += 1
+        return super().predict_proba(X)
+
+
+def test_fit_reuses_oof_matrix_without_rescoring(tmp_path):
+    X, y = make_classification(n_samples=300, n_features=8, random_state=3)
+    folds = fold_plan(y)
+    trainer = StackingTrainer([('rf', CountingForest(n_estimators=10, random_state=0)),
+                               ('extra', ExtraTreesClassifier(n_estimators=10, random_state=0))],
+                              cache_dir=tmp_path, plan=ParallelPlan(cores=1))
+    trainer.oof_matrix(X, y, folds)
+
+    CountingForest.calls = 0
+    model = trainer.fit(X, y, GradientBoostingClassifier(n_estimators=10, random_state=0), folds)
+    assert CountingForest.calls == 0
+
+    # Same model as sklearn's prefit path with the meta-model fitted on the OOF matrix
+    meta = GradientBoostingClassifier(n_estimators=10, random_state=0).fit(trainer.oof_matrix(X, y, folds), y)
+    learners = trainer.fitted_learners(X, y, folds)
+    expected = meta.predict_proba(np.column_stack([est.predict_proba(X)[:, 1] for est in learners]))
+    np.testing.assert_allclose(model.predict_proba(X), expected)
+    np.testing.assert_array_equal(model.predict(X), model.classes_[expected.argmax(axis=1)])
+    assert list(model.named_estimators_) == ['rf', 'extra']
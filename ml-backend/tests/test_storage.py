@@ -0,0 +1,45 @@
+"""Typed Parquet storage: dtypes, footer metadata and column projection survive a round trip"""
+
+import numpy as np
+import pandas as pd
+
+from app.storage import csv_path, read_metadata, read_table, write_table
+
+
+def frame():
+    return pd.DataFrame({
+        'period': [1.5, 2.5, np.nan],
+        'prad': [1.0, 2.0, 3.0],
+        'is_exoplanet': [1, 0, 1],
+        'source': ['Kepler', 'TESS', 'Kepler'],
+        'disposition': ['CONFIRMED', 'FALSE POSITIVE', 'CANDIDATE'],
+    })
+
+
+def test_round_trip_keeps_storage_dtypes(tmp_path):
+    path = write_table(frame(), tmp_path / 'unified.csv', float_dtype='float32', metadata={'rows': 3})
+    assert path.suffix == '.parquet'
+    assert read_metadata(path) == {'rows': 3}
+
+    df = read_table(tmp_path / 'unified.csv')
+    assert df['period'].dtype == np.float32 and df['prad'].dtype == np.float32
+    assert df['is_exoplanet'].dtype == np.int8
+    assert isinstance(df['source'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['disposition'].dtype, pd.CategoricalDtype)
+    assert np.isnan(df['period'].iloc[2])
+    # Values come back unchanged, only the storage types differ
+    original = frame()
+    np.testing.assert_array_equal(df['prad'], original['prad'])
+    assert df['is_exoplanet'].tolist() == original['is_exoplanet'].tolist()
+    assert df['source'].tolist() == original['source'].tolist()
+
+
+def test_projection_skips_missing_columns_and_falls_back_to_csv(tmp_path):
+    write_table(frame(), tmp_path / 'unified.csv', export_csv=True)
+    df = read_table(tmp_path / 'unified.csv', columns=['prad', 'is_exoplanet', 'not_a_column'])
+    assert list(df.columns) == ['prad', 'is_exoplanet']
+
+    (tmp_path / 'unified.parquet').unlink()
+    assert csv_path(tmp_path / 'unified.parquet').exists()
+    assert list(read_table(tmp_path / 'unified.parquet', columns=['prad']).columns) == ['prad']
+    assert read_metadata(tmp_path / 'unified.csv') == {}
@@ -0,0 +1,104 @@
+"""Model-zoo evaluation in train.py: shared out-of-fold fits, the single best-model refit and halving"""
+
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import cross_val_predict
+from sklearn.tree import DecisionTreeClassifier
+
+from app.train import (
+    fit_and_score_oof, get_best_model, make_folds, refit_best, successive_halving, train_and_evaluate_all
+)
+
+
+def split():
+    X, y = make_classification(n_samples=300, n_features=6, random_state=0)
+    return X[:240], y[:240], X[240:], y[240:]
+
+
+def test_oof_metrics_come_from_the_shared_folds():
+    X_train, y_train, X_test, y_test = split()
+    folds = make_folds(y_train)
+    assert [val.tolist() for _, val in folds] == [val.tolist() for _, val in make_folds(y_train)]
+
+    model = LogisticRegression()
+    result = fit_and_score_oof('lr', model, X_train, y_train, X_test, y_test, folds, None, threads=1)
+
+    oof = cross_val_predict(LogisticRegression(), X_train, y_train, cv=folds, method='predict_proba')[:, 1]
+    cv = [accuracy_score(y_train[val], oof[val] >= 0.5) for _, val in folds]
+    assert np.isclose(result['CV Mean'], np.mean(cv)) and np.isclose(result['CV Std'], np.std(cv))
+
+    test_proba = np.mean([LogisticRegression().fit(X_train[train], y_train[train]).predict_proba(X_test)[:, 1]
+                          for train, _ in folds], axis=0)
+    assert np.isclose(result['F1 Score'], f1_score(y_test, test_proba >= 0.5))
+    # Fold fits are clones; the zoo's own instance stays unfitted
+    assert result['model_object'] is None and not hasattr(model, 'coef_')
+
+
+def test_scheduled_zoo_matches_direct_evaluation_and_refits_only_the_winner():
+    X_train, y_train, X_test, y_test = split()
+    models = {'lr': LogisticRegression(), 'tree': DecisionTreeClassifier(max_depth=3, random_state=0)}
+
+    results = train_and_evaluate_all(X_train, y_train, X_test, y_test, models, cores=2, parallel=2)
+    folds = make_folds(y_train)
+    for result in results:
+        direct = fit_and_score_oof(result['Model'], models[result['Model']], X_train, y_train, X_test, y_test,
+                                   folds, None, threads=1)
+        for metric in ('Accuracy', 'F1 Score', 'ROC-AUC', 'CV Mean', 'CV Std'):
+            assert np.isclose(result[metric], direct[metric]), (result['Model'], metric)
+    assert all(result['model_object'] is None for result in results)
+
+    best = get_best_model(results)
+    refit, rounds = refit_best(models[best['Model']], X_train, y_train, threads=1)
+    assert refit is models[best['Model']] and rounds is None
+    loser = next(name for name in models if name != best['Model'])
+    assert not hasattr(models[loser], 'classes_')
+    assert hasattr(refit, 'classes_')
+
+
+class Noisy(BaseEstimator, ClassifierMixin):
+    """Reads the label from column 0, wrong on every `flip`-th row; useless until fit on `min_fit` rows"""
+
+    def __init__(self, flip=0, min_fit=0, fail=False):
+        self.flip = flip
+        self.min_fit = min_fit
+        self.fail = fail
+
+    def fit(self, X, y):
+        if self.fail:
+            raise RuntimeError("cannot fit")
+        self.classes_ = np.array([0, 1])
+        self.fitted_rows_ = len(y)
+        return self
+
+    def predict(self, X):
+        labels = X[:, 0].astype(int)
+        if self.fitted_rows_ < self.min_fit:
+            return np.zeros_like(labels)
+        if self.flip:
+            labels[::self.flip] = 1 - labels[::self.flip]
+        return labels
+
+
+def test_halving_keeps_the_best_1_over_eta_per_rung():
+    y = np.tile([0, 1], 200)
+    X = np.column_stack([y, np.arange(len(y))]).astype(float)
+    models = {
+        'perfect': Noisy(), 'good': Noisy(flip=10), 'fair': Noisy(flip=5), 'poor': Noisy(flip=3),
+        'late': Noisy(min_fit=150), 'broken': Noisy(fail=True),
+    }
+
+    survivors, history = successive_halving(models, X, y, eta=2, min_survivors=2, min_rows=100,
+                                            cores=6, parallel=6)
+
+    # 6 -> 3 -> 2 models: two rungs on 320 racing rows, sized 320 // 4 (raised to min_rows) and 320 // 2
+    assert survivors == ['perfect', 'good']
+    assert [size for size, *_ in history['perfect']['rungs']] == [100, 160]
+    assert {name: h['eliminated_at'] for name, h in history.items()} == {
+        'perfect': None, 'good': None, 'fair': 2, 'poor': 1, 'late': 1, 'broken': 1,
+    }
+    # The slow starter was judged on too few rows; a failed fit scores nothing
+    assert history['late']['rungs'][0][1] == 0.0
+    assert history['broken']['rungs'][0][1] is None
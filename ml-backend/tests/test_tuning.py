@@ -0,0 +1,72 @@
+"""Resumable optuna tuning: stored trials count towards the budget"""
+
+import numpy as np
+from sklearn.datasets import make_classification
+
+from app.parallelism import ParallelPlan
+from app.tuning import tune_xgboost
+
+
+def test_study_resumes_from_sqlite(tmp_path):
+    X, y = make_classification(n_samples=300, n_features=8, random_state=0)
+    storage = tmp_path / 'tuning.db'
+    fixed = {'n_estimators': 20}
+
+    _, study = tune_xgboost(X, y, n_trials=4, n_splits=3, plan=ParallelPlan(cores=1), fixed=fixed, storage=storage)
+    assert len(study.trials) == 4
+
+    # Same data and fixed params reopen the same study and only run the remainder
+    params, resumed = tune_xgboost(X, y, n_trials=6, n_splits=3, plan=ParallelPlan(cores=1), fixed=fixed, storage=storage)
+    assert resumed.study_name == study.study_name
+    assert len(resumed.trials) == 6
+    assert params == {**resumed.best_params, 'n_estimators': 20}
+
+
+def test_early_stopping_happens_inside_each_trial(tmp_path):
+    X, y = make_classification(n_samples=300, n_features=8, random_state=1)
+    params, study = tune_xgboost(X, y, n_trials=3, n_splits=3, plan=ParallelPlan(cores=1),
+                                storage=tmp_path / 'tuning.db', early_stopping=5)
+
+    assert 'n_estimators' not in study.best_params  # a cap, not searched
+    rounds = [trial.user_attrs['rounds'] for trial in study.trials]
+    assert all(0 < r < 1000 for r in rounds)
+    # The best trial's own stopping round is the tuned budget
+    assert params['n_estimators'] == study.best_trial.user_attrs['rounds']
+
+
+def test_fixed_class_weight_reaches_trials_and_best_params(tmp_path):
+    X, y = make_classification(n_samples=300, n_features=8, weights=[0.8], random_state=2)
+    storage = tmp_path / 'tuning.db'
+    fixed = {'n_estimators': 20, 'scale_pos_weight': 4.0}
+
+    params, study = tune_xgboost(X, y, n_trials=2, n_splits=3, plan=ParallelPlan(cores=1), fixed=fixed, storage=storage)
+    assert 'scale_pos_weight' not in study.best_params
+    assert params['scale_pos_weight'] == 4.0
+    # An unweighted run is a different study, not a resume of the weighted one
+    _, unweighted = tune_xgboost(X, y, n_trials=1, n_splits=3, plan=ParallelPlan(cores=1),
+                                 fixed={'n_estimators': 20}, storage=storage)
+    assert unweighted.study_name != study.study_name
+
+
+def test_folds_are_resampled_once_for_all_trials(tmp_path):
+    from imblearn.under_sampling import RandomUnderSampler
+
+    resampled = []
+
+    class RecordingSampler(RandomUnderSampler):
+        def fit_resample(self, X, y):
+            X_out, y_out = super().fit_resample(X, y)
+            resampled.append(np.bincount(y_out).tolist())
+            return X_out, y_out
+
+    X, y = make_classification(n_samples=300, n_features=8, weights=[0.85], random_state=3)
+    storage = tmp_path / 'tuning.db'
+    common = dict(n_trials=3, n_splits=3, plan=ParallelPlan(cores=1), storage=storage, early_stopping=5)
+
+    _, plain = tune_xgboost(X, y, **common)
+    _, balanced = tune_xgboost(X, y, sampler=RecordingSampler(random_state=0), **common)
+    # One resample per fold shared by every trial, each a balanced training set
+    assert len(resampled) == 3 and all(neg == pos for neg, pos in resampled)
+    # Resampled trials are their own study, never a resume of the unresampled one
+    assert balanced.study_name != plain.study_name
+    assert all(0 < trial.user_attrs['rounds'] < 1000 for trial in balanced.trials)